@@ -0,0 +1,393 @@
+"""
+Benchmark Chocobarcode dengan katalog sintetis.
+
+    python benchmarks/benchmark.py                    # bandingkan dengan baseline
+    python benchmarks/benchmark.py --full             # + katalog 100k baris
+    python benchmarks/benchmark.py --update-baseline  # simpan hasil sebagai baseline baru
+
+Mengukur fungsi inti (checksum, validasi, generate barcode unik pada set
+yang hampir penuh, render gambar) dan proses end-to-end untuk katalog
+1k/10k(/100k) baris, plus waktu import saat start (GUI dan pipeline) dengan
+rincian per paket. Setiap hasil berisi waktu dan memori puncak; exit
+code 1 jika ada hasil yang lebih buruk dari baseline melebihi margin.
+Tidak butuh jaringan maupun display.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Engine dan openpyxl sengaja diimpor di dalam fungsi. Memori puncak proses
+# anak (ru_maxrss) ikut mewarisi puncak proses induk saat fork/exec, jadi
+# proses induk harus tetap kecil sampai semua benchmark end-to-end selesai.
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SIZES = (1000, 10000)
+FULL_SIZES = (1000, 10000, 100000)
+DEFAULT_MAX_REGRESSION = 0.25
+# Memori puncak di bawah batas ini tidak dibandingkan; selisih kecil hanya noise.
+MEMORY_NOISE_BYTES = 4 * 1024 * 1024
+# Modul yang diukur waktu import-nya: GUI sampai jendela bisa tampil, dan
+# pipeline (dimuat di latar belakang / saat generate dimulai).
+STARTUP_MODULES = {
+    'startup_import_gui': 'chocobarcode',
+    'startup_import_pipeline': 'chocobarcode_engine.pipeline',
+}
+STARTUP_REPEAT = 5
+STARTUP_BREAKDOWN_SIZE = 8
+
+# Campuran barcode di katalog sintetis (jumlahnya = 1).
+CATALOG_MIX = (
+    ('valid', 0.40),
+    ('12-digit', 0.15),
+    ('bad-checksum', 0.15),
+    ('duplicate', 0.10),
+    ('garbage', 0.10),
+    ('empty', 0.10),
+)
+
+
+def _random_ean13(rng):
+    from chocobarcode_engine import calculate_ean13_checksum
+
+    first12 = str(rng.randint(10**11, 10**12 - 1))
+    return first12 + str(calculate_ean13_checksum(first12))
+
+
+def synthetic_barcodes(count, seed=0):
+    """Daftar nilai barcode input dengan campuran sesuai CATALOG_MIX."""
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in CATALOG_MIX]
+    weights = [weight for _, weight in CATALOG_MIX]
+    values = []
+    valid = []
+    for kind in rng.choices(kinds, weights, k=count):
+        if kind == 'duplicate' and valid:
+            values.append(rng.choice(valid))
+            continue
+        barcode = _random_ean13(rng)
+        if kind in ('valid', 'duplicate'):
+            valid.append(barcode)
+            values.append(barcode)
+        elif kind == '12-digit':
+            values.append(barcode[:12])
+        elif kind == 'bad-checksum':
+            values.append(barcode[:12] + str((int(barcode[12]) + 1) % 10))
+        elif kind == 'garbage':
+            values.append(rng.choice(('ABC123', '12345', barcode + '99', 'n/a', '8991-2345')))
+        else:
+            values.append(None)
+    return values
+
+
+def make_catalog(path, rows, seed=0):
+    """Menulis workbook input sintetis dengan `rows` baris produk."""
+    from openpyxl import Workbook
+
+    from chocobarcode_engine import BARCODE_COLUMN_NAME, PRODUCT_NAME_COLUMN_NAME
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append([PRODUCT_NAME_COLUMN_NAME, BARCODE_COLUMN_NAME])
+    for index, barcode in enumerate(synthetic_barcodes(rows, seed), start=1):
+        ws.append([f"Produk Sintetis {index:06d}", barcode])
+    wb.save(path)
+
+
+def _in_subprocess(func, *args):
+    # Proses baru (spawn) per pemanggilan: memori puncaknya milik satu tugas saja.
+    context = multiprocessing.get_context('spawn')
+    result_queue = context.Queue()
+    process = context.Process(target=_call_and_put, args=(result_queue, func) + args)
+    process.start()
+    result = result_queue.get()
+    process.join()
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def _call_and_put(result_queue, func, *args):
+    try:
+        result_queue.put(func(*args))
+    except Exception as e:
+        result_queue.put(e)
+        raise
+
+
+def catalog_path(workdir, rows):
+    path = os.path.join(workdir, f'catalog_{rows}.xlsx')
+    if not os.path.exists(path):
+        _in_subprocess(make_catalog, path, rows)
+    return path
+
+
+class _OccupiedSpace:
+    # Meniru set barcode yang terisi `occupancy` bagian: kandidat dianggap
+    # terpakai berdasarkan hash-nya, jadi rata-rata percobaan per barcode
+    # baru = 1 / (1 - occupancy). Ruang EAN-13 terlalu besar untuk diisi sungguhan.
+    def __init__(self, real_set, occupancy):
+        self.real_set = real_set
+        self.threshold = int(occupancy * 1000)
+
+    def __contains__(self, barcode):
+        return int(barcode[3:12]) % 1000 < self.threshold or barcode in self.real_set
+
+
+def _measure(func, repeat):
+    """Waktu terbaik dari `repeat` kali, lalu satu kali lagi di bawah tracemalloc untuk memori puncak."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': round(best, 4), 'peak_bytes': peak}
+
+
+def micro_benchmarks():
+    from chocobarcode_engine import (
+        calculate_ean13_checksum,
+        generate_ean13_image_buffer,
+        generate_new_unique_ean13,
+        generate_valid_ean13_string,
+    )
+    from chocobarcode_engine.render import render_ean13_png
+
+    rng = random.Random(1)
+    first12s = [str(rng.randint(10**11, 10**12 - 1)) for _ in range(100000)]
+    inputs = synthetic_barcodes(100000, seed=2)
+    taken = {_random_ean13(rng) for _ in range(200000)}
+    occupied = _OccupiedSpace(taken, 0.9)
+    render_codes = [_random_ean13(rng) for _ in range(200)]
+
+    def checksum():
+        for first12 in first12s:
+            calculate_ean13_checksum(first12)
+
+    def validate():
+        for value in inputs:
+            if value is not None:
+                generate_valid_ean13_string(value)
+
+    def unique():
+        new_rng = random.Random(3)
+        for _ in range(2000):
+            generate_new_unique_ean13(occupied, rng=new_rng)
+
+    def image_pil():
+        for code in render_codes:
+            generate_ean13_image_buffer(code)
+
+    def image_fast():
+        for code in render_codes:
+            render_ean13_png(code, 'fast')
+
+    def image_compact():
+        for code in render_codes:
+            render_ean13_png(code, 'compact')
+
+    return {
+        'checksum_100k': _measure(checksum, 5),
+        'validate_string_100k': _measure(validate, 5),
+        'unique_ean13_2k_at_90pct': _measure(unique, 5),
+        'image_buffer_pil_200': _measure(image_pil, 3),
+        'image_fast_200': _measure(image_fast, 3),
+        'image_compact_200': _measure(image_compact, 3),
+    }
+
+
+def _parse_importtime(stderr):
+    """Baris `-X importtime` -> list (nama modul, detik sendiri, detik kumulatif)."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return entries
+
+
+def import_time(module, repeat=STARTUP_REPEAT):
+    """
+    Waktu import `module` di interpreter baru (terbaik dari `repeat` kali),
+    dengan rincian waktu sendiri per paket teratas (numpy, openpyxl, ...).
+    """
+    best = None
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+        entries = _parse_importtime(completed.stderr)
+        total = next(cumulative for name, _, cumulative in reversed(entries) if name == module)
+        if best is None or total < best[0]:
+            best = (total, entries)
+    total, entries = best
+    by_package = {}
+    for name, self_seconds, _ in entries:
+        package = name.split('.')[0]
+        by_package[package] = by_package.get(package, 0.0) + self_seconds
+    top = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:STARTUP_BREAKDOWN_SIZE]
+    return {
+        'seconds': round(total, 4),
+        'peak_bytes': None,
+        'breakdown': {package: round(seconds, 4) for package, seconds in top},
+    }
+
+
+def startup_benchmarks(log=print):
+    results = {}
+    for name, module in STARTUP_MODULES.items():
+        results[name] = import_time(module)
+        breakdown = ', '.join(f"{package} {seconds * 1000:.0f}ms"
+                              for package, seconds in results[name]['breakdown'].items())
+        log(f"  {name}: {results[name]['seconds'] * 1000:.0f}ms (import {module}; {breakdown})")
+    return results
+
+
+def _run_end_to_end(input_file, output_file):
+    from chocobarcode_engine import GenerateOptions, generate_barcode_workbook
+
+    return generate_barcode_workbook(input_file, output_file, GenerateOptions(seed=1))['performance']
+
+
+def end_to_end_benchmark(workdir, rows):
+    input_file = catalog_path(workdir, rows)
+    output_file = os.path.join(workdir, f'output_{rows}.xlsx')
+    performance = _in_subprocess(_run_end_to_end, input_file, output_file)
+    return {
+        'seconds': performance['elapsed_seconds'],
+        'peak_bytes': performance['peak_rss_bytes'],
+        'rows_per_second': performance['rows_per_second'],
+        'stages': performance['stages'],
+        'output_bytes': performance['output_bytes'],
+    }
+
+
+def run_benchmarks(sizes, workdir, log=print):
+    log("Waktu import saat start...")
+    results = startup_benchmarks(log)
+    for rows in sizes:
+        name = f'end_to_end_{rows}'
+        log(f"End-to-end {rows} baris...")
+        results[name] = end_to_end_benchmark(workdir, rows)
+        log(f"  {name}: {results[name]['seconds']:.2f}s ({results[name]['rows_per_second']:,.0f} baris/detik), "
+            f"memori puncak {(results[name]['peak_bytes'] or 0) / (1024 * 1024):.0f} MB")
+    log("Benchmark fungsi inti...")
+    for name, result in micro_benchmarks().items():
+        results[name] = result
+        log(f"  {name}: {result['seconds']:.4f}s, memori puncak {result['peak_bytes'] / 1024:.0f} KB")
+    return results
+
+
+def compare_with_baseline(results, baseline, max_regression):
+    """Daftar pesan regresi: waktu atau memori yang melebihi baseline * (1 + max_regression)."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            current, previous = result.get(metric), reference.get(metric)
+            if not current or not previous:
+                continue
+            if metric == 'peak_bytes' and current - previous < MEMORY_NOISE_BYTES:
+                continue
+            if current > previous * (1 + max_regression):
+                regressions.append(
+                    f"{name}: {metric} {current} > baseline {previous} (+{(current / previous - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Benchmark Chocobarcode dengan katalog sintetis.')
+    parser.add_argument('--full', action='store_true', help='Sertakan katalog 100k baris')
+    parser.add_argument('--sizes', type=lambda value: tuple(int(size) for size in value.split(',')),
+                        help='Ukuran katalog end-to-end, dipisah koma (default: 1000,10000)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='File baseline JSON')
+    parser.add_argument('--update-baseline', action='store_true', help='Simpan hasil run ini sebagai baseline')
+    parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION,
+                        help='Batas kenaikan relatif terhadap baseline sebelum dianggap regresi (default: %(default)s)')
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'chocobarcode-benchmark'),
+                        help='Folder katalog sintetis dan output (katalog dipakai ulang antar run)')
+    parser.add_argument('--startup', action='store_true',
+                        help='Hanya ukur waktu import saat start (cepat, tanpa katalog)')
+    parser.add_argument('--json', metavar='FILE', help='Simpan hasil sebagai JSON')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    sizes = args.sizes or (FULL_SIZES if args.full else DEFAULT_SIZES)
+    os.makedirs(args.workdir, exist_ok=True)
+
+    if args.startup:
+        results = startup_benchmarks()
+    else:
+        results = run_benchmarks(sizes, args.workdir)
+    report = {'machine': _machine_info(), 'results': results}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {'machine': _machine_info(), 'results': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        # Hasil lama untuk ukuran yang tidak dijalankan sekarang tetap disimpan.
+        baseline['machine'] = _machine_info()
+        baseline['results'].update(
+            {name: {'seconds': result['seconds'], 'peak_bytes': result['peak_bytes']} for name, result in results.items()}
+        )
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline disimpan di '{args.baseline}'.")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Baseline '{args.baseline}' belum ada; jalankan dengan --update-baseline.")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('machine') != _machine_info():
+        print("Peringatan: baseline dibuat di mesin/Python lain; perbandingan waktu mungkin tidak adil.")
+    regressions = compare_with_baseline(results, baseline['results'], args.max_regression)
+    if regressions:
+        print("Regresi terhadap baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"Tidak ada regresi (margin {args.max_regression:.0%}).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,117 +1,61 @@
-import pandas as pd
-from barcode.ean import EAN13
-from barcode.writer import ImageWriter
-from openpyxl import Workbook
-from openpyxl.drawing.image import Image as OpenpyxlImage
-from io import BytesIO
+import multiprocessing
 import os
-import random
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import threading
-import time
-
-# --- Konfigurasi Awal (Bisa disesuaikan di GUI nanti) ---
-DEFAULT_INPUT_FILE = 'produk_barcode_lengkap.xlsx'
-OUTPUT_FILE_NAME = 'barcode_list_chocobarcode.xlsx' 
-BARCODE_COLUMN_NAME = 'Barcode (EAN-13)'
-PRODUCT_NAME_COLUMN_NAME = 'Nama Produk'
-OUTPUT_BARCODE_IMAGE_COLUMN_HEADER = 'Gambar Barcode'
-
-IMAGE_WIDTH_PIXELS = 250
-IMAGE_HEIGHT_PIXELS = 180
-
-# --- Fungsi Logika Barcode ---
-
-def calculate_ean13_checksum(first12digits):
-    """
-    Menghitung digit checksum untuk 12 digit pertama barcode EAN-13.
-    """
-    sum_odd = 0
-    sum_even = 0
-    for i, digit in enumerate(first12digits):
-        if (i + 1) % 2 == 1:
-            sum_odd += int(digit)
-        else:
-            sum_even += int(digit)
-    total = sum_odd * 1 + sum_even * 3
-    checksum = (10 - (total % 10)) % 10
-    return checksum
-
-def generate_valid_ean13_string(barcode_number):
-    """
-    Memvalidasi dan mengoreksi barcode agar menjadi 13 digit EAN-13 yang valid secara checksum.
-    Fungsi ini akan mengembalikan string 13 digit atau None jika input tidak valid.
-    """
-    barcode_str = str(barcode_number).strip()
-    
-    # Periksa apakah input hanya terdiri dari digit
-    if not barcode_str.isdigit():
-        return None # Mengembalikan None jika bukan angka
-
-    if len(barcode_str) == 13:
-        first12 = barcode_str[:-1]
-        input_checksum = int(barcode_str[-1])
-        correct_checksum = calculate_ean13_checksum(first12)
-        if input_checksum == correct_checksum:
-            return barcode_str
-        else:
-            # Jika checksum tidak cocok, koreksi barcode dengan checksum yang benar
-            corrected_barcode = first12 + str(correct_checksum)
-            return corrected_barcode
-    
-    elif len(barcode_str) == 12:
-        # Jika 12 digit, hitung dan tambahkan checksum
-        checksum = calculate_ean13_checksum(barcode_str)
-        valid_barcode = barcode_str + str(checksum)
-        return valid_barcode
-    
-    else: 
-        # Untuk kasus lain (kurang dari 12 atau lebih dari 13)
-        return None 
-
-def generate_new_unique_ean13(existing_barcodes_set, log_callback=None):
-    """
-    Menghasilkan barcode EAN-13 baru yang unik dan valid,
-    memastikan tidak ada di dalam set existing_barcodes_set.
-    """
-    while True:
-        # Hasilkan 12 digit angka acak. EAN-13 dimulai dengan 12 digit + 1 digit checksum.
-        random_12_digits = str(random.randint(10**11, 10**12 - 1))
-        
-        # Hitung checksum untuk 12 digit acak ini
-        checksum = calculate_ean13_checksum(random_12_digits)
-        new_ean13 = random_12_digits + str(checksum)
-        
-        # Periksa apakah barcode yang baru dihasilkan ini unik
-        if new_ean13 not in existing_barcodes_set:
-            if log_callback:
-                log_callback(f"    Info: Barcode baru yang unik dihasilkan: '{new_ean13}'.")
-            return new_ean13
-        else:
-            if log_callback:
-                log_callback(f"    Peringatan: Barcode acak '{new_ean13}' sudah ada, mencoba lagi...")
-
-
-def generate_ean13_image_buffer(barcode_number_str):
-    """
-    Membuat gambar barcode dan mengembalikannya sebagai buffer memori.
-    """
-    ean = EAN13(barcode_number_str, writer=ImageWriter()) 
-    buffer = BytesIO()
-    ean.write(buffer, {
-        'module_width': 0.25,
-        'module_height': 12,
-        'quiet_zone': 6,
-        'text_distance': 5.0,
-        'font_size': 12,
-        'background': 'white',
-        'foreground': 'black',
-        'write_text': True,
-        'text': barcode_number_str
-    })
-    buffer.seek(0)
-    return buffer
+
+# Logika barcode dan pipeline generate ada di paket chocobarcode_engine;
+# file ini hanya GUI Tkinter di atasnya. Di sini hanya modul ringan yang
+# diimpor: pipeline (openpyxl, NumPy, PIL, python-barcode) dimuat di thread
+# latar belakang setelah jendela tampil, dan paling lambat saat generate
+# dimulai, supaya jendela langsung muncul.
+from chocobarcode_engine.checkpoint import DEFAULT_CHECKPOINT_ROWS, journal_path
+from chocobarcode_engine.config import (
+    BARCODE_COLUMN_NAME,
+    DEFAULT_INPUT_FILE,
+    LOG_FILE_NAME,
+    OUTPUT_FILE_NAME,
+    OUTPUT_FORMATS,
+    PRODUCT_NAME_COLUMN_NAME,
+    REPORT_FILE_NAME,
+)
+from chocobarcode_engine.errors import InputFileError
+from chocobarcode_engine.logsink import DETAIL, ERROR, INFO, LogFile, QueueLogSink
+from chocobarcode_engine.runstats import format_report, write_run_report
+
+# Nama lama yang dulu didefinisikan di file ini; tetap bisa diimpor dengan
+# `from chocobarcode import ...` dan baru dimuat saat dipakai.
+_ENGINE_EXPORTS = (
+    'IMAGE_HEIGHT_PIXELS',
+    'IMAGE_WIDTH_PIXELS',
+    'OUTPUT_BARCODE_IMAGE_COLUMN_HEADER',
+    'GenerateOptions',
+    'calculate_ean13_checksum',
+    'generate_barcode_workbook',
+    'generate_ean13_image_buffer',
+    'generate_new_unique_ean13',
+    'generate_valid_ean13_string',
+)
+
+
+def __getattr__(name):
+    if name not in _ENGINE_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import chocobarcode_engine
+    return getattr(chocobarcode_engine, name)
+
+
+def _warm_up_engine():
+    # Import pertama kali yang paling mahal; hasilnya tersimpan di sys.modules.
+    import chocobarcode_engine.pipeline  # noqa: F401
+
+
+# Log dari thread worker masuk ke antrean dan ditampilkan per batch oleh
+# timer di thread Tk; widget log hanya menyimpan baris-baris terakhir.
+LOG_POLL_INTERVAL_MS = 100
+MAX_LOG_LINES = 2000
+# Jeda sebelum library berat dimuat di latar belakang, agar jendela sempat tampil dulu.
+WARM_UP_DELAY_MS = 300
 
 # --- Kelas Aplikasi GUI ---
 
@@ -147,6 +91,41 @@ class BarcodeApp:
         self.process_frame = ttk.LabelFrame(self.main_frame, text="Kontrol Proses", padding="10")
         self.process_frame.pack(fill=tk.X, pady=10)
 
+        format_row = ttk.Frame(self.process_frame)
+        format_row.pack(anchor=tk.W)
+        ttk.Label(format_row, text="Format output:").pack(side=tk.LEFT)
+        # xlsx = workbook dengan gambar; pdf = lembar label; svg/png = ZIP satu file per barcode.
+        self.format_var = tk.StringVar(value=OUTPUT_FORMATS[0])
+        ttk.Combobox(
+            format_row, textvariable=self.format_var, values=OUTPUT_FORMATS, state='readonly', width=8,
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.process_frame,
+            text="Inkremental: pertahankan barcode dari output sebelumnya, proses hanya baris yang berubah",
+            variable=self.incremental_var,
+        ).pack(anchor=tk.W)
+
+        self.compact_images_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.process_frame,
+            text="Gambar ringkas: PNG hitam-putih tepat 250x180 (file output jauh lebih kecil)",
+            variable=self.compact_images_var,
+        ).pack(anchor=tk.W)
+
+        self.row_details_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.process_frame, text="Tampilkan detail per baris di log", variable=self.row_details_var,
+        ).pack(anchor=tk.W)
+
+        self.log_file_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.process_frame,
+            text=f"Simpan log lengkap ke file ({LOG_FILE_NAME} di folder output)",
+            variable=self.log_file_var,
+        ).pack(anchor=tk.W)
+
         self.start_button = ttk.Button(self.process_frame, text="Mulai Generate Barcode", command=self.start_generation_thread)
         self.start_button.pack(pady=10)
 
@@ -171,16 +150,42 @@ class BarcodeApp:
         self.credit_label = ttk.Label(self.main_frame, text="Credit by Steven Gunawan", foreground="gray", font=('Helvetica', 9, 'italic'))
         self.credit_label.pack(side=tk.BOTTOM, pady=5)
 
-    def log_message(self, message):
-        self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
-        self.root.update_idletasks()
+        self.log_sink = QueueLogSink()
+        self.root.after(LOG_POLL_INTERVAL_MS, self._drain_log_queue)
+        self.root.after(WARM_UP_DELAY_MS, self._start_warm_up)
+
+    def _start_warm_up(self):
+        threading.Thread(target=_warm_up_engine, daemon=True).start()
+
+    def log_message(self, message, level=INFO):
+        # Aman dipanggil dari thread mana pun; ditampilkan oleh _drain_log_queue.
+        self.log_sink(message, level)
+
+    def _drain_log_queue(self):
+        events = self.log_sink.drain()
+        if events:
+            # Baris yang lebih lama dari MAX_LOG_LINES akan langsung terbuang
+            # dari widget, jadi tidak perlu dimasukkan sama sekali.
+            text = "\n".join(message for _, message in events[-MAX_LOG_LINES:]) + "\n"
+            self.log_text.config(state='normal')
+            self.log_text.insert(tk.END, text)
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > MAX_LOG_LINES:
+                self.log_text.delete('1.0', f'{line_count - MAX_LOG_LINES + 1}.0')
+            self.log_text.see(tk.END)
+            self.log_text.config(state='disabled')
+
+        progress = self.log_sink.take_progress()
+        if progress is not None:
+            done, total = progress
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate', maximum=max(total, 1), value=done)
+
+        self.root.after(LOG_POLL_INTERVAL_MS, self._drain_log_queue)
 
     def browse_input_file(self):
         file_path = filedialog.askopenfilename(
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("All files", "*.*")]
         )
         if file_path:
             self.input_file_entry.delete(0, tk.END)
@@ -208,6 +213,7 @@ class BarcodeApp:
             self.progress_bar['mode'] = 'indeterminate'
             self.progress_bar.start()
         else:
+            self.log_sink.take_progress()
             self.progress_bar.stop()
             self.progress_bar.config(value=0)
             self.status_label.config(text="Status: Siap")
@@ -216,7 +222,7 @@ class BarcodeApp:
         input_file = self.input_file_entry.get()
         output_folder = self.output_folder_entry.get()
         
-        output_file = os.path.join(output_folder, OUTPUT_FILE_NAME)
+        output_format = self.format_var.get()
 
         if not input_file or not output_folder:
             messagebox.showerror("Error", "Harap pilih file input dan folder output.")
@@ -234,135 +240,84 @@ class BarcodeApp:
                 messagebox.showerror("Error", f"Gagal membuat folder output '{output_folder}': {e}")
                 return
 
-        self._set_gui_processing_state(True)
-        threading.Thread(target=self._generate_barcodes_process, args=(input_file, output_file)).start()
-
-    def _generate_barcodes_process(self, input_file, output_file):
-        self.log_message("Memulai proses pembuatan barcode Excel...")
-        self.log_message("PENTING: Barcode yang valid (13 digit, checksum benar) dari file input akan dipertahankan.")
-        self.log_message(f"File output akan disimpan sebagai: {output_file}")
+        # Run xlsx selalu menyimpan checkpoint; jika run sebelumnya terputus
+        # (jendela ditutup, komputer mati), tawarkan untuk melanjutkannya.
+        resume = False
+        if output_format == 'xlsx' and os.path.exists(journal_path(os.path.join(output_folder, OUTPUT_FILE_NAME))):
+            resume = messagebox.askyesno(
+                "Lanjutkan Proses",
+                "Proses sebelumnya untuk folder output ini terhenti sebelum selesai.\n"
+                "Lanjutkan dari checkpoint terakhir? (Pilih 'No' untuk mulai dari awal.)",
+            )
 
+        self._set_gui_processing_state(True)
+        self.log_sink.level = DETAIL if self.row_details_var.get() else INFO
+        if self.log_file_var.get():
+            self.log_sink.log_file = LogFile(os.path.join(output_folder, LOG_FILE_NAME))
+        threading.Thread(
+            target=self._generate_barcodes_process,
+            args=(input_file, output_folder, output_format, self.incremental_var.get(), resume,
+                  self.compact_images_var.get()),
+        ).start()
+
+    def _generate_barcodes_process(self, input_file, output_folder, output_format, incremental, resume=False,
+                                   compact_images=False):
         try:
-            df = pd.read_excel(input_file, dtype={BARCODE_COLUMN_NAME: str})
-            total_rows = len(df)
-            self.log_message(f"Berhasil membaca {total_rows} baris dari '{input_file}'.")
-
-            self.root.after(100, lambda: self.progress_bar.stop())
-            self.root.after(100, lambda: self.progress_bar.config(mode='determinate', maximum=total_rows))
-
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Produk Barcode"
-
-            headers = [PRODUCT_NAME_COLUMN_NAME, BARCODE_COLUMN_NAME, OUTPUT_BARCODE_IMAGE_COLUMN_HEADER]
-            ws.append(headers)
-
-            ws.column_dimensions['A'].width = 25
-            ws.column_dimensions['B'].width = 20
-            ws.column_dimensions['C'].width = IMAGE_WIDTH_PIXELS / 7 
-
-            # Mengumpulkan barcode yang sudah ada untuk memeriksa duplikasi.
-            # Menggunakan set untuk pencarian yang efisien.
-            processed_barcodes = set()
-            generated_new_barcode_count = 0
-            failed_processing_count = 0
-            successful_processing_count = 0
-            
-            # --- START: Perbaikan logika pemrosesan barcode ---
-            
-            # Pra-proses semua barcode dari input untuk mengidentifikasi duplikat awal
-            existing_barcodes = df[BARCODE_COLUMN_NAME].astype(str).tolist()
-            
-            for index, row in df.iterrows():
-                product_name = str(row[PRODUCT_NAME_COLUMN_NAME]).strip()
-                original_barcode = str(row[BARCODE_COLUMN_NAME]).strip()
-                
-                self.log_message(f"\nMemproses: '{product_name}' - Barcode Asli: '{original_barcode}'")
-
-                final_barcode_for_excel = None
-                try:
-                    # Coba validasi barcode asli dari input Excel
-                    validated_barcode = generate_valid_ean13_string(original_barcode)
-
-                    if validated_barcode: # Barcode asli valid atau sudah dikoreksi checksum
-                        if validated_barcode in processed_barcodes:
-                            self.log_message(f"    Peringatan: Barcode EAN-13 yang divalidasi '{validated_barcode}' adalah duplikat. Menghasilkan barcode baru.")
-                            final_barcode_for_excel = generate_new_unique_ean13(processed_barcodes, self.log_message)
-                            generated_new_barcode_count += 1
-                        else:
-                            # Jika valid dan belum diproses, gunakan barcode ini
-                            final_barcode_for_excel = validated_barcode
-                            self.log_message(f"    Info: Barcode awal divalidasi dan digunakan: '{final_barcode_for_excel}'.")
-                    else:
-                        # Jika barcode asli tidak valid
-                        self.log_message(f"    Peringatan: Barcode asli '{original_barcode}' tidak valid atau terlalu pendek/panjang. Menghasilkan barcode baru.")
-                        final_barcode_for_excel = generate_new_unique_ean13(processed_barcodes, self.log_message)
-                        generated_new_barcode_count += 1
-
-                    if final_barcode_for_excel:
-                        processed_barcodes.add(final_barcode_for_excel) # Tambahkan ke set barcode yang sudah diproses
-
-                        buffer = generate_ean13_image_buffer(final_barcode_for_excel)
-                        
-                        current_row_in_excel = ws.max_row + 1
-                        ws.append([product_name, final_barcode_for_excel, ''])
-
-                        img = OpenpyxlImage(buffer)
-                        img.width = IMAGE_WIDTH_PIXELS
-                        img.height = IMAGE_HEIGHT_PIXELS
-
-                        cell_ref = f'C{current_row_in_excel}'
-                        ws.add_image(img, cell_ref)
-                        
-                        ws.row_dimensions[current_row_in_excel].height = IMAGE_HEIGHT_PIXELS * 0.7
-
-                        self.log_message(f"    Berhasil dibuat: Barcode EAN-13 '{final_barcode_for_excel}' dan gambar disisipkan di baris {current_row_in_excel}.")
-                        successful_processing_count += 1
-                    else:
-                        self.log_message(f"    Gagal memproses barcode '{original_barcode}': Barcode final tidak dapat ditentukan.")
-                        ws.append([product_name, original_barcode, "GAGAL GENERATE BARCODE"])
-                        failed_processing_count += 1
-
-                except Exception as e:
-                    self.log_message(f"    Gagal memproses barcode '{original_barcode}': {str(e)}")
-                    ws.append([product_name, original_barcode, "GAGAL GENERATE BARCODE"])
-                    failed_processing_count += 1
-                
-                self.root.after(0, lambda idx=index: self.progress_bar.config(value=idx + 1))
-            
-            # --- END: Perbaikan logika pemrosesan barcode ---
-
-            wb.save(output_file)
-            
-            self.log_message(f"\nProses selesai! File Excel '{output_file}' telah berhasil dibuat.")
-            self.log_message(f"Jumlah produk yang berhasil diproses: {successful_processing_count}")
-            self.log_message(f"Jumlah barcode baru yang dihasilkan: {generated_new_barcode_count}")
-            self.log_message(f"Jumlah barcode yang gagal diproses: {failed_processing_count}")
+            # Biasanya sudah dimuat oleh _warm_up_engine; jika belum, ditunggu di thread ini, bukan di thread Tk.
+            from chocobarcode_engine.cache import default_cache_path
+            from chocobarcode_engine.pipeline import GenerateOptions, generate_barcode_workbook
+            from chocobarcode_engine.render import DEFAULT_RENDERER
+            from chocobarcode_engine.writer import output_file_name
+
+            output_file = os.path.join(output_folder, output_file_name(OUTPUT_FILE_NAME, output_format))
+            options = GenerateOptions(cache_path=default_cache_path(), incremental=incremental,
+                                      output_format=output_format, resume=resume,
+                                      renderer='compact' if compact_images else DEFAULT_RENDERER,
+                                      checkpoint_rows=DEFAULT_CHECKPOINT_ROWS if output_format == 'xlsx' else None)
+            summary = generate_barcode_workbook(
+                input_file,
+                output_file,
+                options,
+                log_callback=self.log_sink,
+                progress_callback=self.log_sink.report_progress,
+            )
 
             final_message = f"Proses selesai!\n" \
-                            f"Total berhasil: {successful_processing_count}\n" \
-                            f"Baru digenerate: {generated_new_barcode_count}\n" \
-                            f"Gagal: {failed_processing_count}"
-            
-            self.status_label.config(text="Status: Selesai!")
-            self.results_label.config(text=final_message)
-            messagebox.showinfo("Proses Selesai", "Pembuatan barcode berhasil!\nLihat log untuk detail.")
+                            f"Total berhasil: {summary['successful']}\n" \
+                            f"Baru digenerate: {summary['generated_new']}\n" \
+                            f"Gagal: {summary['failed']}\n"
+            # Output PDF/SVG tidak merender PNG, jadi tidak memakai cache render.
+            if summary['render_cache'] is not None:
+                final_message += f"Dari cache: {summary['render_cache']['hits']}\n"
+            final_message += "\n".join(format_report(summary['performance']))
+
+            # Laporan lengkap (waktu per tahap, memori puncak) disimpan di samping output.
+            report_file = os.path.join(os.path.dirname(os.path.abspath(output_file)), REPORT_FILE_NAME)
+            try:
+                write_run_report(summary, report_file)
+                self.log_message(f"Laporan run disimpan di '{report_file}'.")
+            except OSError as e:
+                self.log_message(f"Peringatan: Gagal menyimpan laporan run '{report_file}': {e}")
 
-        except FileNotFoundError:
-            self.log_message(f"Error: File input '{input_file}' tidak ditemukan.")
-            messagebox.showerror("Error", f"File input '{input_file}' tidak ditemukan.")
-        except pd.errors.EmptyDataError:
-            self.log_message(f"Error: File Excel '{input_file}' kosong atau tidak memiliki data.")
-            messagebox.showerror("Error", f"File Excel '{input_file}' kosong atau tidak memiliki data.")
-        except KeyError as e:
-            self.log_message(f"Error: Kolom yang dibutuhkan tidak ditemukan di Excel. Pastikan ada kolom '{BARCODE_COLUMN_NAME}' dan '{PRODUCT_NAME_COLUMN_NAME}'. Detail: {e}")
-            messagebox.showerror("Error", f"Kolom yang dibutuhkan tidak ditemukan di Excel. Pastikan ada kolom '{BARCODE_COLUMN_NAME}' dan '{PRODUCT_NAME_COLUMN_NAME}'.")
+            self.root.after(0, lambda: self._show_generation_result(final_message))
+
+        except InputFileError as e:
+            error_message = str(e)
+            self.log_message(f"Error: {error_message}", ERROR)
+            self.root.after(0, lambda: messagebox.showerror("Error", error_message))
         except Exception as e:
-            self.log_message(f"\nTerjadi kesalahan utama selama proses: {str(e)}")
-            messagebox.showerror("Error", f"Terjadi kesalahan: {str(e)}")
+            error_message = str(e)
+            self.log_message(f"\nTerjadi kesalahan utama selama proses: {error_message}", ERROR)
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Terjadi kesalahan: {error_message}"))
         finally:
+            self.log_sink.close_log_file()
             self.root.after(0, lambda: self._set_gui_processing_state(False))
 
+    def _show_generation_result(self, final_message):
+        self.status_label.config(text="Status: Selesai!")
+        self.results_label.config(text=final_message)
+        messagebox.showinfo("Proses Selesai", "Pembuatan barcode berhasil!\nLihat log untuk detail.")
+
     def export_empty_format_thread(self):
         file_path = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
@@ -381,6 +336,8 @@ class BarcodeApp:
 
     def _export_empty_format_process(self, output_file_path): 
         try:
+            from openpyxl import Workbook
+
             wb = Workbook()
             ws = wb.active
             ws.title = "Format Barcode Produk"
@@ -393,16 +350,21 @@ class BarcodeApp:
 
             wb.save(output_file_path)
             self.log_message(f"Format Excel kosong berhasil diekspor ke: '{output_file_path}'")
-            messagebox.showinfo("Export Berhasil", f"File format Excel kosong berhasil diekspor ke:\n{output_file_path}")
+            self.root.after(0, lambda: messagebox.showinfo(
+                "Export Berhasil", f"File format Excel kosong berhasil diekspor ke:\n{output_file_path}"))
         except Exception as e:
-            self.log_message(f"Error saat mengekspor format Excel kosong: {str(e)}")
-            messagebox.showerror("Export Gagal", f"Gagal mengekspor format Excel kosong: {str(e)}")
+            error_message = str(e)
+            self.log_message(f"Error saat mengekspor format Excel kosong: {error_message}", ERROR)
+            self.root.after(0, lambda: messagebox.showerror(
+                "Export Gagal", f"Gagal mengekspor format Excel kosong: {error_message}"))
         finally:
             self.root.after(0, lambda: self._set_gui_processing_state(False))
 
 
 # --- Main Application ---
 if __name__ == "__main__":
+    # Wajib untuk render paralel di bundle PyInstaller (Windows memakai spawn).
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = BarcodeApp(root)
     root.mainloop()
@@ -5,12 +5,15 @@ a = Analysis(
     ['chocobarcode.py'],
     pathex=[],
     binaries=[],
-datas=[('C:/Users/Steven/AppData/Local/Programs/Python/Python313/Lib/site-packages/barcode/fonts/DejaVuSansMono.ttf', 'barcode/fonts')],
+    datas=[],
     hiddenimports=[],
-    hookspath=[],
+    # Font python-barcode dan plugin PNG PIL diambil oleh pyinstaller_hooks/hook-barcode.py.
+    hookspath=['pyinstaller_hooks'],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # pandas tidak dipakai lagi (input dibaca lewat openpyxl/csv), tetapi bisa
+    # ikut terbawa lewat import opsional openpyxl jika terpasang.
+    excludes=['pandas'],
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,57 @@
+"""
+Engine Chocobarcode: pipeline generate barcode EAN-13 yang bisa dipakai
+tanpa GUI (lihat `python -m chocobarcode_engine --help`).
+
+Nama-nama di bawah dimuat saat pertama kali dipakai (PEP 562): mengimpor
+paket ini (atau config/logsink saja) tidak ikut memuat openpyxl, NumPy,
+PIL dan python-barcode, sehingga GUI bisa tampil tanpa menunggu library
+berat itu.
+"""
+import importlib
+
+from .config import (
+    BARCODE_COLUMN_NAME,
+    DEFAULT_INPUT_FILE,
+    IMAGE_HEIGHT_PIXELS,
+    IMAGE_WIDTH_PIXELS,
+    OUTPUT_BARCODE_IMAGE_COLUMN_HEADER,
+    OUTPUT_FILE_NAME,
+    PRODUCT_NAME_COLUMN_NAME,
+)
+from .errors import ChocobarcodeError, InputFileError
+from .logsink import DETAIL, LogFile, QueueLogSink
+
+# Nama publik -> submodul tempat nama itu didefinisikan.
+_LAZY_EXPORTS = {
+    'calculate_ean13_checksum': 'ean13',
+    'generate_new_unique_ean13': 'ean13',
+    'generate_valid_ean13_string': 'ean13',
+    'PrefixAllocator': 'allocator',
+    'RandomAllocator': 'allocator',
+    'create_allocator': 'allocator',
+    'RenderCache': 'cache',
+    'default_cache_path': 'cache',
+    'CheckpointError': 'checkpoint',
+    'GenerateOptions': 'pipeline',
+    'generate_barcode_workbook': 'pipeline',
+    'open_input': 'reader',
+    'read_input_rows': 'reader',
+    'AllocationError': 'registry',
+    'BarcodeRegistry': 'registry',
+    'generate_ean13_image_buffer': 'render',
+    'ColumnValidation': 'validate',
+    'validate_ean13_column': 'validate',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -0,0 +1,198 @@
+"""
+Pengalokasi barcode baru untuk baris yang barcode-nya tidak valid atau duplikat.
+
+- RandomAllocator: perilaku lama (12 digit acak, ulangi sampai unik). Jika
+  diberi registry, keunikan juga dicek terhadap semua barcode dari run lain.
+- PrefixAllocator: mengambil barcode dari rentang prefix yang dikonfigurasi
+  lewat kursor di registry, tanpa percobaan acak sama sekali.
+
+Keduanya dipakai dengan pola yang sama: prepare(jumlah, barcode_terpakai)
+sekali di awal, lalu allocate(barcode_terpakai) per baris, lalu close().
+stats() mengembalikan jumlah barcode yang dialokasikan dan jumlah percobaan
+ulang (kandidat yang ternyata sudah terpakai).
+
+Untuk checkpoint (lihat checkpoint.py), state() mengembalikan keadaan yang
+bisa di-dump ke JSON; daftar barcode di dalamnya hanya yang baru sejak
+state() sebelumnya. restore(daftar_state) memulihkan allocator dari semua
+state checkpoint secara berurutan, sebagai pengganti cadangan di prepare().
+"""
+from collections import deque
+
+from .ean13 import generate_new_unique_ean13
+from .registry import AllocationError, BarcodeRegistry, PrefixSpace
+
+
+class _TakenBarcodes:
+    # Gabungan set barcode file ini dan registry (opsional), cukup untuk
+    # operator `in` yang dipakai generate_new_unique_ean13. Jumlah pengecekan
+    # dihitung: setiap pengecekan lebih dari satu adalah percobaan ulang.
+    def __init__(self, taken_barcodes, registry=None):
+        self.taken_barcodes = taken_barcodes
+        self.registry = registry
+        self.lookups = 0
+
+    def __contains__(self, barcode):
+        self.lookups += 1
+        return barcode in self.taken_barcodes or (self.registry is not None and barcode in self.registry)
+
+
+class RandomAllocator:
+    """
+    Barcode acak. Biasanya barcode baru didaftarkan ke registry sekaligus
+    saat close(); dengan claim_each=True (registry dipakai bersama run lain
+    yang berjalan bersamaan, mis. job server) setiap barcode langsung
+    diklaim di registry saat dikeluarkan, supaya dua run tidak pernah
+    mengeluarkan barcode yang sama.
+    """
+
+    def __init__(self, registry=None, rng=None, log_callback=None, claim_each=False):
+        self.registry = registry
+        self.rng = rng
+        self.log = log_callback
+        self.claim_each = claim_each and registry is not None
+        self.allocated = 0
+        self.retries = 0
+        self._issued = []
+        self._issued_mark = 0
+
+    def prepare(self, count, taken_barcodes):
+        pass
+
+    def allocate(self, taken_barcodes):
+        while True:
+            taken = _TakenBarcodes(taken_barcodes, self.registry)
+            barcode = generate_new_unique_ean13(taken, self.log, self.rng)
+            self.retries += taken.lookups - 1
+            if not self.claim_each or self.registry.claim(barcode):
+                break
+            # Diklaim run lain di antara pengecekan dan klaim.
+            self.retries += 1
+        self.allocated += 1
+        if self.registry is not None and not self.claim_each:
+            self._issued.append(barcode)
+        return barcode
+
+    def stats(self):
+        return {'allocated': self.allocated, 'retries': self.retries}
+
+    def state(self):
+        # Membutuhkan rng sendiri (random.Random), bukan modul random global.
+        version, internal, gauss_next = self.rng.getstate()
+        issued = self._issued[self._issued_mark:]
+        self._issued_mark = len(self._issued)
+        return {'rng': [version, list(internal), gauss_next], 'issued': issued,
+                'allocated': self.allocated, 'retries': self.retries}
+
+    def restore(self, states):
+        version, internal, gauss_next = states[-1]['rng']
+        self.rng.setstate((version, tuple(internal), gauss_next))
+        self.allocated = states[-1]['allocated']
+        self.retries = states[-1]['retries']
+        # Barcode yang terbit sebelum checkpoint tetap didaftarkan ke registry saat close().
+        self._issued = [barcode for state in states for barcode in state['issued']]
+        self._issued_mark = len(self._issued)
+
+    def close(self):
+        if self.registry is not None and self._issued:
+            self.registry.register(self._issued)
+            self._issued = []
+
+
+class PrefixAllocator:
+    """
+    Alokasi dari satu atau lebih prefix secara berurutan: prefix berikutnya
+    dipakai setelah rentang prefix sebelumnya habis.
+    """
+
+    def __init__(self, registry, prefixes, mode='sequential', log_callback=None):
+        if not prefixes:
+            raise AllocationError("Minimal satu prefix harus diberikan untuk alokasi berbasis prefix.")
+        self.registry = registry
+        self.spaces = [PrefixSpace(prefix, mode) for prefix in prefixes]
+        self.mode = mode
+        self.log = log_callback
+        self.allocated = 0
+        self.retries = 0
+        self._reserved = deque()
+        # Untuk checkpoint: jumlah barcode yang sudah diambil dari antrean
+        # cadangan dan cadangan baru sejak state() sebelumnya.
+        self._taken_count = 0
+        self._new_reserved = []
+
+    def prepare(self, count, taken_barcodes):
+        # Barcode input yang jatuh di rentang kita dicatat dulu, supaya kursor
+        # melewatinya dan run berikutnya juga tahu barcode itu sudah dipakai.
+        in_range = [barcode for barcode in taken_barcodes
+                    if any(space.contains(barcode) for space in self.spaces)]
+        if in_range:
+            self.registry.register(in_range, source='input')
+        if count:
+            self._add_reserved(self.reserve(count))
+
+    def _add_reserved(self, barcodes):
+        self._reserved.extend(barcodes)
+        self._new_reserved.extend(barcodes)
+
+    def reserve(self, count):
+        """Mengeluarkan tepat `count` barcode baru (bulk), atau AllocationError jika semua rentang habis."""
+        issued = []
+        for space in self.spaces:
+            if len(issued) == count:
+                break
+            issued.extend(self.registry.reserve(space.prefix, count - len(issued), self.mode))
+        if len(issued) < count:
+            prefixes = ', '.join(space.prefix for space in self.spaces)
+            raise AllocationError(
+                f"Rentang barcode untuk prefix {prefixes} sudah habis "
+                f"(butuh {count}, tersedia {len(issued)})."
+            )
+        return issued
+
+    def allocate(self, taken_barcodes):
+        while True:
+            if not self._reserved:
+                self._add_reserved(self.reserve(1))
+            barcode = self._reserved.popleft()
+            self._taken_count += 1
+            # Registry sudah menjamin keunikan lintas run; cek ini hanya
+            # berjaga-jaga untuk barcode yang ditambahkan setelah prepare().
+            if barcode not in taken_barcodes:
+                break
+            self.retries += 1
+        self.allocated += 1
+        if self.log:
+            self.log(f"    Info: Barcode baru yang unik dihasilkan: '{barcode}'.")
+        return barcode
+
+    def stats(self):
+        return {'allocated': self.allocated, 'retries': self.retries}
+
+    def state(self):
+        reserved, self._new_reserved = self._new_reserved, []
+        return {'reserved': reserved, 'taken': self._taken_count,
+                'allocated': self.allocated, 'retries': self.retries}
+
+    def restore(self, states):
+        # Cadangan dari registry sudah tercatat di sana; yang belum terpakai diambil lagi sesuai urutan.
+        reserved = [barcode for state in states for barcode in state['reserved']]
+        self._taken_count = states[-1]['taken']
+        self._reserved = deque(reserved[self._taken_count:])
+        self.allocated = states[-1]['allocated']
+        self.retries = states[-1]['retries']
+
+    def close(self):
+        pass
+
+
+def create_allocator(prefixes=(), mode='sequential', registry=None, rng=None, log_callback=None, shared_registry=False):
+    """
+    Memilih allocator sesuai opsi. Tanpa prefix: RandomAllocator (perilaku
+    lama). Dengan prefix tanpa registry: registry sementara di memori.
+    `shared_registry`: registry juga dipakai run lain yang berjalan
+    bersamaan (prefix sudah aman karena reserve() atomik).
+    """
+    if not prefixes:
+        return RandomAllocator(registry, rng, log_callback, claim_each=shared_registry)
+    if registry is None:
+        registry = BarcodeRegistry()
+    return PrefixAllocator(registry, prefixes, mode, log_callback)
@@ -0,0 +1,171 @@
+"""
+Cache render gambar barcode di disk (SQLite).
+
+Kunci setiap gambar adalah hash SHA-256 dari semua yang menentukan isi PNG:
+barcode, opsi writer, nama renderer, versi renderer dan versi library
+render. Selama tidak ada yang berubah, barcode yang sama tidak perlu
+dirender ulang di run berikutnya. Ukuran total dibatasi; jika melewati
+batas, gambar yang paling lama tidak dipakai (LRU) dibuang lebih dulu.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from .config import BARCODE_WRITER_OPTIONS
+
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+_IN_QUERY_BATCH = 500
+# Setelah melewati batas, cache dipangkas sampai fraksi ini supaya eviksi
+# tidak terjadi di setiap chunk.
+_EVICT_TARGET_RATIO = 0.9
+# Waktu pakai terakhir hanya diperbarui jika sudah lebih lama dari ini; urutan
+# LRU tidak perlu presisi detik dan run ulang jadi tidak menulis ke cache.
+_TOUCH_INTERVAL_SECONDS = 3600
+
+
+def default_cache_path():
+    """Lokasi cache bawaan per user (LOCALAPPDATA di Windows, XDG_CACHE_HOME/~/.cache di tempat lain)."""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') \
+        or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'chocobarcode', 'render-cache.sqlite')
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def render_namespace(renderer, renderer_version, writer_options=BARCODE_WRITER_OPTIONS):
+    """Bagian kunci cache yang sama untuk semua barcode dalam satu run."""
+    # Diimpor di sini agar default_cache_path (dipakai GUI saat start) tetap ringan.
+    import barcode
+    import PIL
+
+    description = json.dumps({
+        'renderer': renderer,
+        'renderer_version': renderer_version,
+        'writer_options': writer_options,
+        'python-barcode': barcode.version,
+        'pillow': PIL.__version__,
+    }, sort_keys=True)
+    return hashlib.sha256(description.encode('utf-8')).digest()
+
+
+class RenderCache:
+    """
+    Penyimpanan PNG hasil render, dengan penghitung hit/miss untuk ringkasan.
+    Aman dipakai beberapa proses sekaligus (WAL + BEGIN IMMEDIATE).
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL' if path != ':memory:' else 'PRAGMA journal_mode=MEMORY')
+        # Isi cache selalu bisa dibuat ulang, jadi tidak perlu fsync di setiap commit.
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS images (
+                key BLOB PRIMARY KEY,
+                png BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS images_last_used ON images (last_used);
+        """)
+        self._total_bytes = self._stored_bytes()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _stored_bytes(self):
+        return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM images').fetchone()[0]
+
+    @staticmethod
+    def key(namespace, barcode_number_str):
+        return hashlib.sha256(namespace + barcode_number_str.encode('ascii')).digest()
+
+    def get_many(self, namespace, barcodes):
+        """Mengembalikan {barcode: png_bytes} untuk barcode yang ada di cache."""
+        keys = {self.key(namespace, code): code for code in barcodes}
+        found = {}
+        stale = []
+        now = time.time()
+        for batch in _chunks(list(keys), _IN_QUERY_BATCH):
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(f'SELECT key, png, last_used FROM images WHERE key IN ({placeholders})', batch)
+            for key, png, last_used in rows:
+                found[keys[key]] = png
+                if now - last_used > _TOUCH_INTERVAL_SECONDS:
+                    stale.append((now, key))
+        if stale:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany('UPDATE images SET last_used = ? WHERE key = ?', stale)
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, namespace, items):
+        """Menyimpan pasangan (barcode, png_bytes), lalu memangkas cache jika melewati batas."""
+        now = time.time()
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            for code, png in items:
+                cursor = self._conn.execute(
+                    'INSERT OR IGNORE INTO images (key, png, size, last_used) VALUES (?, ?, ?, ?)',
+                    (self.key(namespace, code), png, len(png), now),
+                )
+                if cursor.rowcount:
+                    self._total_bytes += len(png)
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Dihitung ulang karena proses lain mungkin ikut mengisi cache.
+            total = self._stored_bytes()
+            target = int(self.max_bytes * _EVICT_TARGET_RATIO)
+            victims = []
+            for key, size in self._conn.execute('SELECT key, size FROM images ORDER BY last_used'):
+                if total <= target:
+                    break
+                victims.append((key,))
+                total -= size
+            self._conn.executemany('DELETE FROM images WHERE key = ?', victims)
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._total_bytes = total
+        self.evicted += len(victims)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evicted': self.evicted,
+            'size_bytes': self._total_bytes,
+        }
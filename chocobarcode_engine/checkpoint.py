@@ -0,0 +1,167 @@
+"""
+Checkpoint dan resume untuk run generate yang panjang.
+
+Dengan checkpoint aktif, workbook output streaming menyimpan semua file
+kerjanya (arsip `<output>.part`, central directory zip, spool XML sheet dan
+drawing, spool manifest) sebagai file bernama di samping output, bukan file
+temporer. Setiap `checkpoint_rows` baris, file-file itu di-flush ke disk lalu
+satu baris JSON ditambahkan ke journal `<output>.journal`: indeks baris
+berikutnya, barcode final baris-baris sejak checkpoint sebelumnya, keadaan
+allocator (state RNG atau barcode yang sudah dicadangkan dari prefix),
+hitungan hasil dan ukuran setiap file kerja.
+
+Saat resume, file kerja dipotong kembali ke ukuran checkpoint terakhir,
+baris sebelum checkpoint tidak dialokasikan maupun dirender ulang
+(barcode-nya diambil dari journal), dan proses berlanjut dari baris
+checkpoint dengan keadaan allocator yang sama. Hasil akhirnya sama persis,
+byte demi byte, dengan run yang tidak terputus.
+"""
+import json
+import os
+
+from .errors import ChocobarcodeError
+
+JOURNAL_SUFFIX = '.journal'
+JOURNAL_VERSION = 1
+DEFAULT_CHECKPOINT_ROWS = 5000
+
+
+class CheckpointError(ChocobarcodeError):
+    """Journal checkpoint tidak bisa dipakai untuk melanjutkan run ini."""
+
+
+def journal_path(output_file):
+    return output_file + JOURNAL_SUFFIX
+
+
+def open_spool(path, size=None):
+    """
+    File kerja bernama: dibuat baru (size=None) atau, saat resume, dibuka
+    lagi dan dipotong ke `size` byte sesuai checkpoint.
+    """
+    if size is None:
+        return open(path, 'w+b')
+    try:
+        spool = open(path, 'r+b')
+    except FileNotFoundError:
+        raise CheckpointError(f"File kerja '{path}' dari run sebelumnya tidak ditemukan; run tidak bisa dilanjutkan.") from None
+    if os.fstat(spool.fileno()).st_size < size:
+        spool.close()
+        raise CheckpointError(f"File kerja '{path}' lebih pendek dari checkpoint terakhir; run tidak bisa dilanjutkan.")
+    spool.truncate(size)
+    spool.seek(size)
+    return spool
+
+
+def sync_spool(spool):
+    """Menulis isi spool sampai ke disk dan mengembalikan ukurannya untuk checkpoint."""
+    spool.flush()
+    os.fsync(spool.fileno())
+    return spool.tell()
+
+
+def remove_spool(spool):
+    spool.close()
+    if os.path.exists(spool.name):
+        os.remove(spool.name)
+
+
+def input_fingerprint(input_file):
+    stat = os.stat(input_file)
+    return {'path': os.path.abspath(input_file), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class RunJournal:
+    """
+    Journal checkpoint untuk satu file output.
+
+    `fingerprint` (dict yang bisa di-dump ke JSON) mengidentifikasi input dan
+    opsi yang memengaruhi hasil; resume ditolak jika berbeda. Setelah dibuat,
+    `start_row` adalah baris pertama yang masih harus diproses (0 untuk run
+    baru), `barcodes` barcode final baris-baris sebelumnya, `plan_states`
+    keadaan allocator di setiap checkpoint (berurutan) dan `state` baris
+    checkpoint terakhir (None jika belum ada).
+    """
+
+    def __init__(self, output_file, fingerprint, checkpoint_rows=DEFAULT_CHECKPOINT_ROWS, resume=False):
+        self.path = journal_path(output_file)
+        self.checkpoint_rows = checkpoint_rows
+        self.start_row = 0
+        self.barcodes = []
+        self.plan_states = []
+        self.state = None
+        self._rows = []
+        fingerprint = json.loads(json.dumps(fingerprint))
+        if resume and os.path.exists(self.path):
+            self._load(fingerprint)
+        else:
+            header = {'version': JOURNAL_VERSION, 'fingerprint': fingerprint}
+            with open(self.path, 'wb') as f:
+                f.write(json.dumps(header).encode('utf-8') + b'\n')
+        self._file = open(self.path, 'ab')
+
+    def _load(self, fingerprint):
+        with open(self.path, 'r+b') as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or header.get('version') != JOURNAL_VERSION:
+                raise CheckpointError(f"Journal '{self.path}' tidak dikenali; hapus file itu untuk memulai dari awal.")
+            if header.get('fingerprint') != fingerprint:
+                raise CheckpointError(
+                    f"File input atau opsi berbeda dari run yang terputus (journal '{self.path}'); "
+                    "jalankan tanpa resume untuk memulai dari awal."
+                )
+            end = f.tell()
+            # Baris terakhir bisa terpotong jika proses mati saat menulisnya; checkpoint itu diabaikan.
+            while True:
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self.barcodes.extend(entry.pop('barcodes'))
+                self.plan_states.append(entry['plan'])
+                self.state = entry
+                end = f.tell()
+            f.truncate(end)
+        if self.state is not None:
+            self.start_row = self.state['row']
+
+    def due(self, index):
+        """True jika keadaan sebelum baris `index` harus dijadikan checkpoint."""
+        return index > self.start_row and index % self.checkpoint_rows == 0
+
+    def record(self, barcode):
+        """Mencatat barcode final (None jika gagal) satu baris yang sudah ditulis."""
+        self._rows.append(barcode)
+
+    def commit(self, row, plan, writer_state, manifest_state, counters):
+        """
+        Menambahkan checkpoint: semua baris sebelum `row` sudah ditulis dan
+        file kerjanya sudah di-flush (writer_state/manifest_state).
+        """
+        entry = {
+            'row': row,
+            'barcodes': self._rows,
+            'plan': plan,
+            'writer': writer_state,
+            'manifest': manifest_state,
+            'successful': counters['successful'],
+            'failed': counters['failed'],
+        }
+        self._file.write(json.dumps(entry, separators=(',', ':')).encode('utf-8') + b'\n')
+        sync_spool(self._file)
+        self._rows = []
+
+    def close(self):
+        self._file.close()
+
+    def remove(self):
+        """Menghapus journal setelah output tersimpan utuh."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
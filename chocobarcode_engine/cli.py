@@ -0,0 +1,218 @@
+"""
+Entry point command-line Chocobarcode, untuk build server / cron tanpa display.
+
+    python -m chocobarcode_engine produk.xlsx -o hasil.xlsx --json
+
+Exit code:
+    0  semua baris berhasil
+    1  proses selesai tetapi ada baris yang gagal
+    2  argumen tidak valid (dari argparse)
+    3  file input tidak bisa dipakai
+    4  kesalahan lain
+"""
+import argparse
+import json
+import os
+import sys
+
+from .cache import DEFAULT_CACHE_MAX_BYTES, default_cache_path
+from .checkpoint import DEFAULT_CHECKPOINT_ROWS
+from .config import BARCODE_COLUMN_NAME, OUTPUT_FILE_NAME, PRODUCT_NAME_COLUMN_NAME
+from .errors import InputFileError
+from .labels import DEFAULT_PAGE_SIZE, PAGE_SIZES, parse_label_grid
+from .logsink import INFO, LogFile
+from .pipeline import GenerateOptions, generate_barcode_workbook
+from .reader import INPUT_FORMATS
+from .registry import ALLOCATION_MODES
+from .render import DEFAULT_RENDER_CHUNK_SIZE, DEFAULT_RENDERER, RENDERERS
+from .runstats import format_report, write_run_report
+from .writer import DEFAULT_OUTPUT_FORMAT, DEFAULT_OUTPUT_WRITER, OUTPUT_FORMATS, OUTPUT_WRITERS, output_file_name
+
+EXIT_OK = 0
+EXIT_ROW_FAILURES = 1
+EXIT_INPUT_ERROR = 3
+EXIT_ERROR = 4
+
+
+def _positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"harus bilangan bulat positif, diterima '{text}'")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='chocobarcode',
+        description='Generate barcode EAN-13 dari file Excel tanpa GUI.',
+    )
+    parser.add_argument('input_file', help='File input (.xlsx, .csv atau .parquet)')
+    parser.add_argument('-o', '--output', default=None,
+                        help=f"File output (default: {OUTPUT_FILE_NAME} di folder kerja, "
+                             "dengan ekstensi sesuai --format)")
+    parser.add_argument('--input-format', choices=INPUT_FORMATS, default=None,
+                        help='Format file input (default: ditebak dari ekstensi)')
+    parser.add_argument('--product-column', default=PRODUCT_NAME_COLUMN_NAME,
+                        help=f"Nama kolom produk (default: '{PRODUCT_NAME_COLUMN_NAME}')")
+    parser.add_argument('--barcode-column', default=BARCODE_COLUMN_NAME,
+                        help=f"Nama kolom barcode (default: '{BARCODE_COLUMN_NAME}')")
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Seed untuk barcode acak agar hasil bisa direproduksi')
+    parser.add_argument('--prefix', dest='prefixes', action='append', default=[],
+                        help='Prefix barcode baru (mis. GS1 company prefix); bisa diulang')
+    parser.add_argument('--allocation', choices=ALLOCATION_MODES, default='sequential',
+                        help='Urutan barcode baru di dalam rentang prefix (default: sequential)')
+    parser.add_argument('--registry',
+                        help='File SQLite berisi semua barcode yang pernah dikeluarkan (unik lintas run)')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='Jumlah proses render gambar (default: 1, 0 = semua core CPU)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_RENDER_CHUNK_SIZE,
+                        help=f'Jumlah barcode per tugas render paralel (default: {DEFAULT_RENDER_CHUNK_SIZE})')
+    parser.add_argument('--renderer', choices=RENDERERS, default=DEFAULT_RENDERER,
+                        help=f"Cara render gambar (default: {DEFAULT_RENDERER}; 'pil' = ImageWriter python-barcode, "
+                             "'compact' = PNG 1-bit tepat 250x180, file jauh lebih kecil)")
+    parser.add_argument('--cache', nargs='?', const=default_cache_path(), default=None, metavar='FILE',
+                        help=f'Simpan gambar hasil render di cache SQLite agar run berikutnya tidak merender ulang '
+                             f'(tanpa FILE: {default_cache_path()})')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024), metavar='MB',
+                        help='Batas ukuran cache render dalam MB (default: %(default)s)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Pakai ulang barcode dan gambar dari output sebelumnya (file -o yang sama); '
+                             'hanya baris yang berubah yang diproses')
+    parser.add_argument('--format', dest='output_format', choices=OUTPUT_FORMATS, default=DEFAULT_OUTPUT_FORMAT,
+                        help="Format output: workbook Excel, lembar label PDF, atau ZIP berisi SVG/PNG per barcode "
+                             "(default: %(default)s)")
+    parser.add_argument('--label-grid', type=parse_label_grid, default='3x8', metavar='KOLOMxBARIS',
+                        help='Jumlah label per halaman PDF (default: %(default)s)')
+    parser.add_argument('--page-size', choices=tuple(PAGE_SIZES), default=DEFAULT_PAGE_SIZE,
+                        help='Ukuran halaman PDF (default: %(default)s)')
+    shard_group = parser.add_mutually_exclusive_group()
+    shard_group.add_argument('--shard-rows', type=_positive_int, metavar='N',
+                             help='Pecah output menjadi workbook berisi N baris; shard dibuat paralel (-j) dan -o '
+                                  'menjadi workbook indeks berisi daftar shard')
+    shard_group.add_argument('--shard-by', metavar='KOLOM',
+                             help='Pecah output menjadi satu workbook per nilai kolom input KOLOM (seperti --shard-rows)')
+    parser.add_argument('--checkpoint', type=_positive_int, nargs='?', const=DEFAULT_CHECKPOINT_ROWS, default=None,
+                        metavar='N',
+                        help=f'Simpan checkpoint ke journal <output>.journal setiap N baris (tanpa N: '
+                             f'{DEFAULT_CHECKPOINT_ROWS}) agar run yang terputus bisa dilanjutkan dengan --resume')
+    parser.add_argument('--resume', action='store_true',
+                        help='Lanjutkan run yang terputus dari checkpoint terakhir di journal output; hasilnya sama '
+                             'persis dengan run yang tidak terputus (tanpa journal: mulai dari awal)')
+    parser.add_argument('--writer', choices=OUTPUT_WRITERS, default=DEFAULT_OUTPUT_WRITER,
+                        help=f"Cara menulis workbook output (default: {DEFAULT_OUTPUT_WRITER}; "
+                             "'openpyxl' = workbook utuh di memori)")
+    parser.add_argument('--json', action='store_true',
+                        help='Cetak ringkasan sebagai JSON ke stdout')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Tampilkan log per baris ke stderr')
+    parser.add_argument('--log-file', metavar='FILE',
+                        help='Tambahkan log lengkap (termasuk detail per baris) ke file ini')
+    parser.add_argument('--report', metavar='FILE',
+                        help='Simpan ringkasan run (termasuk waktu per tahap dan memori puncak) sebagai JSON')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='Jalankan di bawah cProfile dan simpan statistiknya ke FILE (buka dengan pstats)')
+    return parser
+
+
+def options_from_args(args):
+    return GenerateOptions(
+        product_column=args.product_column,
+        barcode_column=args.barcode_column,
+        input_format=args.input_format,
+        seed=args.seed,
+        prefixes=args.prefixes,
+        allocation=args.allocation,
+        registry_path=args.registry,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        renderer=args.renderer,
+        output_writer=args.writer,
+        cache_path=args.cache,
+        cache_max_bytes=args.cache_size * 1024 * 1024,
+        incremental=args.incremental,
+        profile_path=args.profile,
+        output_format=args.output_format,
+        label_grid=args.label_grid,
+        page_size=args.page_size,
+        shard_rows=args.shard_rows,
+        shard_column=args.shard_by,
+        checkpoint_rows=args.checkpoint,
+        resume=args.resume,
+    )
+
+
+def _print_summary(summary, as_json):
+    if as_json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return
+    if summary['status'] != 'ok':
+        return
+    print(f"Proses selesai! File output: {summary['output_file']}")
+    print(f"Total berhasil: {summary['successful']}")
+    print(f"Baru digenerate: {summary['generated_new']}")
+    print(f"Gagal: {summary['failed']}")
+    if summary['resumed_from_row']:
+        print(f"Dilanjutkan dari checkpoint: {summary['resumed_from_row']} baris sudah selesai sebelumnya")
+    if summary['shards']:
+        print(f"Shard: {len(summary['shards'])} file")
+    if summary['incremental']:
+        print(f"Dipakai ulang dari output sebelumnya: {summary['incremental']['reused_barcodes']}")
+    if summary['render_cache']:
+        print(f"Cache render: {summary['render_cache']['hits']} hit, {summary['render_cache']['misses']} miss")
+    for line in format_report(summary['performance']):
+        print(line)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if (args.shard_rows or args.shard_by) and args.output_format != 'xlsx':
+        parser.error('--shard-rows/--shard-by hanya bisa dipakai dengan --format xlsx')
+    if (args.checkpoint or args.resume) and (args.output_format != 'xlsx' or args.writer != 'streaming'
+                                             or args.shard_rows or args.shard_by):
+        parser.error('--checkpoint/--resume hanya bisa dipakai untuk --format xlsx dengan --writer streaming '
+                     'tanpa shard')
+    if args.output is None:
+        args.output = output_file_name(OUTPUT_FILE_NAME, args.output_format)
+
+    log_file = LogFile(args.log_file) if args.log_file else None
+
+    def log(message, level=INFO):
+        if args.verbose:
+            print(message, file=sys.stderr)
+        if log_file is not None:
+            log_file.write(message, level)
+
+    output_folder = os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(output_folder, exist_ok=True)
+
+    try:
+        summary = generate_barcode_workbook(
+            args.input_file,
+            args.output,
+            options_from_args(args),
+            log_callback=log if args.verbose or log_file is not None else None,
+        )
+        summary['status'] = 'ok'
+        exit_code = EXIT_ROW_FAILURES if summary['failed'] else EXIT_OK
+    except InputFileError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        summary = {'status': 'input_error', 'error': str(e)}
+        exit_code = EXIT_INPUT_ERROR
+    except Exception as e:
+        print(f"Terjadi kesalahan utama selama proses: {e}", file=sys.stderr)
+        summary = {'status': 'error', 'error': str(e)}
+        exit_code = EXIT_ERROR
+    finally:
+        if log_file is not None:
+            log_file.close()
+
+    summary['exit_code'] = exit_code
+    if args.report:
+        write_run_report(summary, args.report)
+    _print_summary(summary, args.json)
+    return exit_code
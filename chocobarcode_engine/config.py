@@ -0,0 +1,33 @@
+# --- Konfigurasi bersama engine dan GUI ---
+
+DEFAULT_INPUT_FILE = 'produk_barcode_lengkap.xlsx'
+OUTPUT_FILE_NAME = 'barcode_list_chocobarcode.xlsx'
+LOG_FILE_NAME = 'chocobarcode_log.txt'
+REPORT_FILE_NAME = 'chocobarcode_report.json'
+BARCODE_COLUMN_NAME = 'Barcode (EAN-13)'
+PRODUCT_NAME_COLUMN_NAME = 'Nama Produk'
+OUTPUT_BARCODE_IMAGE_COLUMN_HEADER = 'Gambar Barcode'
+OUTPUT_SHEET_TITLE = 'Produk Barcode'
+SHARD_INDEX_SHEET_TITLE = 'Daftar Shard'
+FAILED_BARCODE_MARKER = 'GAGAL GENERATE BARCODE'
+
+# Format output dan ekstensi nama file bawaannya.
+OUTPUT_FORMATS = ('xlsx', 'pdf', 'svg', 'png')
+DEFAULT_OUTPUT_FORMAT = 'xlsx'
+OUTPUT_FORMAT_EXTENSIONS = {'xlsx': '.xlsx', 'pdf': '.pdf', 'svg': '.svg.zip', 'png': '.png.zip'}
+
+IMAGE_WIDTH_PIXELS = 250
+IMAGE_HEIGHT_PIXELS = 180
+
+# Opsi ImageWriter python-barcode yang dipakai untuk semua gambar.
+# Kunci 'text' diisi per barcode saat render.
+BARCODE_WRITER_OPTIONS = {
+    'module_width': 0.25,
+    'module_height': 12,
+    'quiet_zone': 6,
+    'text_distance': 5.0,
+    'font_size': 12,
+    'background': 'white',
+    'foreground': 'black',
+    'write_text': True,
+}
@@ -0,0 +1,74 @@
+import random
+
+# --- Fungsi Logika Barcode ---
+
+def calculate_ean13_checksum(first12digits):
+    """
+    Menghitung digit checksum untuk 12 digit pertama barcode EAN-13.
+    """
+    sum_odd = 0
+    sum_even = 0
+    for i, digit in enumerate(first12digits):
+        if (i + 1) % 2 == 1:
+            sum_odd += int(digit)
+        else:
+            sum_even += int(digit)
+    total = sum_odd * 1 + sum_even * 3
+    checksum = (10 - (total % 10)) % 10
+    return checksum
+
+def generate_valid_ean13_string(barcode_number):
+    """
+    Memvalidasi dan mengoreksi barcode agar menjadi 13 digit EAN-13 yang valid secara checksum.
+    Fungsi ini akan mengembalikan string 13 digit atau None jika input tidak valid.
+    """
+    barcode_str = str(barcode_number).strip()
+
+    # Periksa apakah input hanya terdiri dari digit
+    if not barcode_str.isdigit():
+        return None # Mengembalikan None jika bukan angka
+
+    if len(barcode_str) == 13:
+        first12 = barcode_str[:-1]
+        input_checksum = int(barcode_str[-1])
+        correct_checksum = calculate_ean13_checksum(first12)
+        if input_checksum == correct_checksum:
+            return barcode_str
+        else:
+            # Jika checksum tidak cocok, koreksi barcode dengan checksum yang benar
+            corrected_barcode = first12 + str(correct_checksum)
+            return corrected_barcode
+
+    elif len(barcode_str) == 12:
+        # Jika 12 digit, hitung dan tambahkan checksum
+        checksum = calculate_ean13_checksum(barcode_str)
+        valid_barcode = barcode_str + str(checksum)
+        return valid_barcode
+
+    else:
+        # Untuk kasus lain (kurang dari 12 atau lebih dari 13)
+        return None
+
+def generate_new_unique_ean13(existing_barcodes_set, log_callback=None, rng=None):
+    """
+    Menghasilkan barcode EAN-13 baru yang unik dan valid,
+    memastikan tidak ada di dalam set existing_barcodes_set.
+    `rng` opsional (random.Random) agar hasil bisa direproduksi dengan seed.
+    """
+    rng = rng or random
+    while True:
+        # Hasilkan 12 digit angka acak. EAN-13 dimulai dengan 12 digit + 1 digit checksum.
+        random_12_digits = str(rng.randint(10**11, 10**12 - 1))
+
+        # Hitung checksum untuk 12 digit acak ini
+        checksum = calculate_ean13_checksum(random_12_digits)
+        new_ean13 = random_12_digits + str(checksum)
+
+        # Periksa apakah barcode yang baru dihasilkan ini unik
+        if new_ean13 not in existing_barcodes_set:
+            if log_callback:
+                log_callback(f"    Info: Barcode baru yang unik dihasilkan: '{new_ean13}'.")
+            return new_ean13
+        else:
+            if log_callback:
+                log_callback(f"    Peringatan: Barcode acak '{new_ean13}' sudah ada, mencoba lagi...")
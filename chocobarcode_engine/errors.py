@@ -0,0 +1,6 @@
+class ChocobarcodeError(Exception):
+    """Kesalahan dasar engine Chocobarcode. Pesannya siap ditampilkan ke pengguna."""
+
+
+class InputFileError(ChocobarcodeError):
+    """File input tidak ditemukan, kosong, atau kolom wajibnya tidak ada."""
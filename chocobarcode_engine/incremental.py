@@ -0,0 +1,283 @@
+"""
+Regenerasi inkremental terhadap output sebelumnya.
+
+Setiap run menulis manifest di samping workbook output
+(`<output>.manifest.jsonl`): satu baris JSON per baris input berisi nama
+produk, barcode asli dan barcode final. Pada mode inkremental, baris input
+yang (nama produk, barcode asli)-nya sama dengan run sebelumnya memakai lagi
+barcode final yang lama, termasuk barcode acak hasil generate, dan gambar
+PNG-nya disalin langsung dari workbook lama tanpa render ulang. Hanya baris
+yang berubah yang dialokasikan dan dirender.
+
+Tanpa manifest (mis. output dari versi lama), workbook sebelumnya dibaca
+langsung: barcode dipakai ulang per nama produk, gambarnya dirender ulang.
+Untuk output selain workbook (PDF, ZIP) hanya barcode dari manifest yang
+dipakai ulang.
+"""
+import json
+import os
+import posixpath
+import re
+import tempfile
+import zipfile
+from collections import defaultdict, deque
+from xml.etree import ElementTree
+
+from openpyxl import load_workbook
+
+from .checkpoint import open_spool, remove_spool, sync_spool
+from .config import FAILED_BARCODE_MARKER
+from .errors import InputFileError
+from .reader import _cell_to_text
+from .zipstream import ZippedBytes, decompress_member, read_raw_member
+
+MANIFEST_SUFFIX = '.manifest.jsonl'
+MANIFEST_VERSION = 1
+
+_NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_ANCHOR_RE = re.compile(rb'<(\w+:|)(oneCellAnchor|twoCellAnchor)\b.*?</\1\2>', re.S)
+_ANCHOR_ROW_RE = re.compile(rb'<(?:\w+:)?row>(\d+)</')
+_ANCHOR_EMBED_RE = re.compile(rb'\bembed="([^"]+)"')
+_DRAWING_READ_SIZE = 1024 * 1024
+_FIRST_DATA_ROW = 2
+
+
+def manifest_path(output_file):
+    return output_file + MANIFEST_SUFFIX
+
+
+def _output_fingerprint(output_file):
+    stat = os.stat(output_file)
+    return {'output_size': stat.st_size, 'output_mtime_ns': stat.st_mtime_ns}
+
+
+class ManifestWriter:
+    """
+    Mengumpulkan baris manifest selama proses lalu menuliskannya setelah
+    output tersimpan. Dengan resumable=True baris ditampung di file bernama
+    `<manifest>.rows` yang bisa dilanjutkan dari `state` hasil checkpoint().
+    """
+
+    def __init__(self, output_file, render_namespace, resumable=False, state=None):
+        self.output_file = output_file
+        self.render_namespace = render_namespace
+        self.resumable = resumable or state is not None
+        if self.resumable:
+            self._rows = open_spool(manifest_path(output_file) + '.rows', state and state['size'])
+        else:
+            self._rows = tempfile.TemporaryFile()
+        self._row_count = state['rows'] if state else 0
+
+    def add(self, product_name, original_barcode, barcode):
+        line = json.dumps([product_name, original_barcode, barcode], ensure_ascii=False)
+        self._rows.write(line.encode('utf-8') + b'\n')
+        self._row_count += 1
+
+    def save(self):
+        header = {
+            'version': MANIFEST_VERSION,
+            'render_namespace': self.render_namespace.hex(),
+            'rows': self._row_count,
+        }
+        header.update(_output_fingerprint(self.output_file))
+        path = manifest_path(self.output_file)
+        with open(path + '.part', 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            self._rows.seek(0)
+            for line in self._rows:
+                f.write(line)
+        os.replace(path + '.part', path)
+        if self.resumable:
+            remove_spool(self._rows)
+        self.close()
+
+    def checkpoint(self):
+        return {'size': sync_spool(self._rows), 'rows': self._row_count}
+
+    def close(self):
+        self._rows.close()
+
+
+def _read_rels(archive, rels_name, base_dir):
+    targets = {}
+    for relationship in ElementTree.fromstring(archive.read(rels_name)).iter(_NS_PKG_REL + 'Relationship'):
+        target = relationship.get('Target')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(base_dir, target))
+        targets[relationship.get('Id')] = (relationship.get('Type', ''), target)
+    return targets
+
+
+def _image_anchors(archive):
+    """Mengembalikan {nomor_baris_excel: path_media} dari drawing sheet pertama."""
+    try:
+        sheet_rels = _read_rels(archive, 'xl/worksheets/_rels/sheet1.xml.rels', 'xl/worksheets')
+    except KeyError:
+        return {}
+    drawings = [target for kind, target in sheet_rels.values() if kind.endswith('/drawing')]
+    if not drawings:
+        return {}
+    drawing = drawings[0]
+    drawing_dir, drawing_name = posixpath.split(drawing)
+    media = _read_rels(archive, posixpath.join(drawing_dir, '_rels', drawing_name + '.rels'), drawing_dir)
+
+    # Drawing berisi satu anchor per gambar (bisa ratusan ribu); cukup baris
+    # awal dan r:embed-nya, jadi dipindai dengan regex per blok, bukan parser XML.
+    anchors = {}
+    buffer = b''
+    with archive.open(drawing) as f:
+        while True:
+            block = f.read(_DRAWING_READ_SIZE)
+            buffer += block
+            consumed = 0
+            for match in _ANCHOR_RE.finditer(buffer):
+                row = _ANCHOR_ROW_RE.search(match.group(0))
+                embed = _ANCHOR_EMBED_RE.search(match.group(0))
+                if row and embed and embed.group(1).decode() in media:
+                    anchors[int(row.group(1)) + 1] = media[embed.group(1).decode()][1]
+                consumed = match.end()
+            buffer = buffer[consumed:]
+            if not block:
+                break
+    return anchors
+
+
+class PreviousOutput:
+    """
+    Hasil run sebelumnya untuk satu file output: barcode final yang boleh
+    dipakai ulang dan (jika render-nya sama) gambar PNG-nya. `images=False`
+    untuk output yang bukan workbook: gambar dan workbook lama tidak dibaca.
+    """
+
+    def __init__(self, output_file, render_namespace, images=True):
+        self.output_file = output_file
+        self.row_count = 0
+        self.from_manifest = False
+        # 'manifest', 'workbook', atau None jika belum ada output sebelumnya.
+        self.source = None
+        self.reused_images = 0
+        # (nama_produk, barcode_asli) -> antrean barcode final, sesuai urutan baris.
+        self._by_row_key = defaultdict(deque)
+        # Hanya tanpa manifest: nama_produk -> antrean barcode final.
+        self._by_product = defaultdict(deque)
+        # barcode -> (offset header, ukuran terkompresi, metode, crc) gambar di workbook lama.
+        self._images = {}
+        self._archive = None
+
+        path = manifest_path(output_file)
+        if os.path.exists(path):
+            self._load_manifest(path, render_namespace, images)
+        elif images and os.path.exists(output_file):
+            self._load_workbook()
+
+    def _load_manifest(self, path, render_namespace, images):
+        with open(path, encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get('version') != MANIFEST_VERSION:
+                raise InputFileError(f"Versi manifest '{path}' tidak didukung.")
+            barcode_by_row = []
+            for line in f:
+                product_name, original_barcode, barcode = json.loads(line)
+                barcode_by_row.append(barcode)
+                if barcode:
+                    self._by_row_key[(product_name, original_barcode)].append(barcode)
+        self.row_count = len(barcode_by_row)
+        self.from_manifest = True
+        self.source = 'manifest'
+
+        # Gambar hanya dipakai ulang jika workbook belum diubah sejak manifest
+        # ditulis dan opsi render-nya sama persis.
+        if not images or not os.path.exists(self.output_file):
+            return
+        fingerprint = _output_fingerprint(self.output_file)
+        if any(header.get(key) != value for key, value in fingerprint.items()):
+            return
+        if header.get('render_namespace') != render_namespace.hex():
+            return
+        with zipfile.ZipFile(self.output_file) as archive:
+            for excel_row, media_path in _image_anchors(archive).items():
+                index = excel_row - _FIRST_DATA_ROW
+                if 0 <= index < len(barcode_by_row) and barcode_by_row[index]:
+                    info = archive.getinfo(media_path)
+                    self._images[barcode_by_row[index]] = (
+                        info.header_offset, info.compress_size, info.compress_type, info.CRC,
+                    )
+        self._archive = open(self.output_file, 'rb')
+
+    def _load_workbook(self):
+        self.source = 'workbook'
+        wb = load_workbook(self.output_file, read_only=True, data_only=True)
+        try:
+            rows = wb.worksheets[0].iter_rows(min_row=_FIRST_DATA_ROW, max_col=3, values_only=True)
+            for row in rows:
+                product_name, barcode, marker = (tuple(row) + (None, None, None))[:3]
+                self.row_count += 1
+                product_name, barcode = _cell_to_text(product_name), _cell_to_text(barcode)
+                if not barcode or marker == FAILED_BARCODE_MARKER:
+                    continue
+                self._by_row_key[(product_name, barcode)].append(barcode)
+                self._by_product[product_name].append(barcode)
+        finally:
+            wb.close()
+
+    def all_barcodes(self):
+        """Semua barcode final run sebelumnya; barcode baru harus menghindarinya."""
+        barcodes = set()
+        for queue in self._by_row_key.values():
+            barcodes.update(queue)
+        return barcodes
+
+    def take(self, product_name, original_barcode, validated_barcode):
+        """
+        Barcode final lama untuk baris ini, atau None jika baris ini baru /
+        berubah. Setiap barcode lama hanya diberikan sekali.
+        """
+        queue = self._by_row_key.get((product_name, original_barcode))
+        if not queue and not self.from_manifest and not validated_barcode:
+            # Output tanpa manifest tidak menyimpan barcode asli; barcode
+            # input yang tidak valid dicocokkan lewat nama produk saja.
+            queue = self._by_product.get(product_name)
+        if not queue:
+            return None
+        barcode = queue.popleft()
+        if not self.from_manifest:
+            # Barcode yang sama ada di dua antrean; keluarkan juga dari antrean
+            # yang lain agar tidak diberikan dua kali.
+            for other in (self._by_product.get(product_name), self._by_row_key.get((product_name, barcode))):
+                if other and other is not queue and barcode in other:
+                    other.remove(barcode)
+        return barcode
+
+    def get_many(self, barcodes):
+        """Bytes PNG dari workbook lama untuk barcode yang gambarnya bisa dipakai ulang."""
+        if self._archive is None:
+            return {}
+        found = {}
+        for barcode in barcodes:
+            entry = self._images.get(barcode)
+            if entry is None:
+                continue
+            header_offset, compress_size, method, crc = entry
+            payload = read_raw_member(self._archive, header_offset, compress_size)
+            # Bentuk terkompresinya ikut dibawa; penulis streaming menyalinnya
+            # langsung ke output baru tanpa kompresi ulang.
+            png = ZippedBytes(decompress_member(method, payload))
+            png.zip_entry = (method, crc, payload)
+            found[barcode] = png
+        self.reused_images += len(found)
+        return found
+
+    def close(self):
+        # Harus ditutup sebelum output baru menimpa file lama (wajib di Windows).
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def stats(self):
+        return {
+            'previous_rows': self.row_count,
+            'source': self.source,
+            'reused_images': self.reused_images,
+        }
@@ -0,0 +1,282 @@
+"""
+Output selain workbook Excel, untuk percetakan label.
+
+- PdfLabelSheetWriter: lembar label PDF multi-halaman (grid kolom x baris
+  per halaman). Barcode digambar sebagai vektor, setiap halaman ditulis ke
+  file begitu penuh, jadi memori tidak bergantung pada jumlah label.
+- SvgZipWriter: ZIP berisi satu file SVG per barcode (`<barcode>.svg`).
+- PngZipWriter: ZIP berisi satu file PNG per barcode (`<barcode>.png`).
+
+Ketiganya punya antarmuka yang sama dengan penulis workbook
+(write_barcode_row / write_failed_row / save / abort) dan menulis ke
+`<output>.part` sampai save(). Arsip ZIP juga berisi index.csv (nama produk,
+barcode, nama file); baris gagal hanya muncul di index.csv. SVG dan PDF
+tidak butuh gambar PNG sama sekali (needs_png = False).
+"""
+import abc
+import csv
+import io
+import os
+import tempfile
+import zlib
+
+from .config import BARCODE_COLUMN_NAME, FAILED_BARCODE_MARKER, PRODUCT_NAME_COLUMN_NAME
+from .vector import MM_PER_PT, EAN13Geometry, normalize_ean13, svg_document
+from .zipstream import ZipStreamWriter
+
+INDEX_FILE_NAME = 'index.csv'
+INDEX_FILE_COLUMN_HEADER = 'File'
+DEFAULT_LABEL_GRID = (3, 8)
+# Ukuran halaman dalam point (1/72 inci).
+PAGE_SIZES = {'a4': (595.28, 841.89), 'letter': (612.0, 792.0)}
+DEFAULT_PAGE_SIZE = 'a4'
+
+_SPOOL_READ_SIZE = 1024 * 1024
+_PAGE_MARGIN_MM = 10.0
+_LABEL_PADDING_MM = 2.0
+_NAME_FONT_SIZE = 7.0
+# Lebar digit Helvetica (semua digit sama) dan perkiraan lebar rata-rata huruf, per 1 pt ukuran font.
+_HELVETICA_DIGIT_WIDTH = 0.556
+_HELVETICA_AVERAGE_WIDTH = 0.52
+
+
+def parse_label_grid(value):
+    """'3x8' -> (3, 8): jumlah kolom dan baris label per halaman."""
+    try:
+        columns, rows = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise ValueError(f"Grid label '{value}' tidak valid; gunakan format KOLOMxBARIS, mis. 3x8.")
+    if columns < 1 or rows < 1:
+        raise ValueError(f"Grid label '{value}' tidak valid; kolom dan baris minimal 1.")
+    return columns, rows
+
+
+class _ArchiveWriter(abc.ABC):
+    """Dasar SvgZipWriter / PngZipWriter: satu file per barcode plus index.csv."""
+
+    extension = ''
+    needs_png = False
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self._part_file = output_file + '.part'
+        self._zip = ZipStreamWriter(self._part_file)
+        self._index = tempfile.TemporaryFile()
+        self._row_count = 0
+        # BOM agar Excel membuka index.csv sebagai UTF-8.
+        self._index.write('\ufeff'.encode('utf-8'))
+        self._write_index_row((PRODUCT_NAME_COLUMN_NAME, BARCODE_COLUMN_NAME, INDEX_FILE_COLUMN_HEADER))
+
+    def _write_index_row(self, values):
+        line = io.StringIO()
+        csv.writer(line).writerow(['' if value is None else value for value in values])
+        self._index.write(line.getvalue().encode('utf-8'))
+        self._row_count += 1
+        return self._row_count
+
+    @abc.abstractmethod
+    def _write_member(self, name, barcode, png_bytes):
+        """Menulis file `name` untuk satu barcode ke arsip."""
+
+    def write_barcode_row(self, product_name, barcode, png_bytes):
+        """Menambahkan file barcode ke arsip. Mengembalikan nomor baris di index.csv."""
+        name = barcode + self.extension
+        self._write_member(name, barcode, png_bytes)
+        return self._write_index_row((product_name, barcode, name))
+
+    def write_failed_row(self, product_name, original_barcode):
+        return self._write_index_row((product_name, original_barcode, FAILED_BARCODE_MARKER))
+
+    def save(self):
+        self._index.seek(0)
+        self._zip.write_stream(INDEX_FILE_NAME, iter(lambda: self._index.read(_SPOOL_READ_SIZE), b''))
+        self._zip.close()
+        self._index.close()
+        os.replace(self._part_file, self.output_file)
+
+    def abort(self):
+        self._zip.close()
+        self._index.close()
+        if os.path.exists(self._part_file):
+            os.remove(self._part_file)
+
+
+class SvgZipWriter(_ArchiveWriter):
+    extension = '.svg'
+
+    def __init__(self, output_file):
+        super().__init__(output_file)
+        self._geometry = EAN13Geometry()
+
+    def _write_member(self, name, barcode, png_bytes):
+        self._zip.write(name, svg_document(self._geometry, barcode))
+
+
+class PngZipWriter(_ArchiveWriter):
+    extension = '.png'
+    needs_png = True
+
+    def _write_member(self, name, barcode, png_bytes):
+        # PNG sudah terkompresi; disimpan apa adanya.
+        self._zip.write(name, png_bytes, 0)
+
+
+def _pdf_number(value):
+    return f'{value:.3f}'.rstrip('0').rstrip('.')
+
+
+def _pdf_text(value):
+    # Font standar PDF memakai WinAnsiEncoding (cp1252); karakter lain jadi '?'.
+    raw = str(value).encode('cp1252', errors='replace')
+    return raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)').replace(b'\r', b'').replace(b'\n', b' ')
+
+
+class PdfLabelSheetWriter:
+    """
+    Lembar label PDF: `grid` = (kolom, baris) label per halaman. Setiap label
+    berisi nama produk dan barcode vektor berukuran asli (diperkecil hanya
+    jika tidak muat di sel). Baris yang gagal tidak dicetak.
+    """
+
+    needs_png = False
+
+    def __init__(self, output_file, grid=DEFAULT_LABEL_GRID, page_size=DEFAULT_PAGE_SIZE):
+        if page_size not in PAGE_SIZES:
+            raise ValueError(f"Ukuran halaman '{page_size}' tidak dikenal. Pilihan: {', '.join(PAGE_SIZES)}")
+        self.output_file = output_file
+        self.columns, self.rows = grid
+        self.page_width, self.page_height = PAGE_SIZES[page_size]
+        self._part_file = output_file + '.part'
+        self._file = open(self._part_file, 'wb')
+        self._geometry = EAN13Geometry()
+        self._bar_ops = {}
+
+        margin = _PAGE_MARGIN_MM / MM_PER_PT
+        self._margin = margin
+        self._cell_width = (self.page_width - 2 * margin) / self.columns
+        self._cell_height = (self.page_height - 2 * margin) / self.rows
+        padding = _LABEL_PADDING_MM / MM_PER_PT
+        self._padding = padding
+        name_height = _NAME_FONT_SIZE * 1.4
+        self._name_height = name_height
+        # Skala barcode (pt per mm): ukuran asli, kecuali sel terlalu kecil.
+        fit_width = (self._cell_width - 2 * padding) / self._geometry.width
+        fit_height = (self._cell_height - 2 * padding - name_height) / self._geometry.height
+        self._scale = min(1 / MM_PER_PT, fit_width, fit_height)
+        self._max_name_chars = max(1, int((self._cell_width - 2 * padding)
+                                          / (_NAME_FONT_SIZE * _HELVETICA_AVERAGE_WIDTH)))
+
+        # Objek 1 = katalog, 2 = pohon halaman, 3 = font; ditulis saat save()
+        # kecuali font. Offset setiap objek dicatat untuk tabel xref.
+        self._offsets = {}
+        self._next_object = 4
+        self._page_objects = []
+        self._page_ops = []
+        self._labels_on_page = 0
+        self._label_count = 0
+        self._file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._write_object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+
+    def _write_object(self, number, body):
+        self._offsets[number] = self._file.tell()
+        self._file.write(f'{number} 0 obj\n'.encode('ascii') + body + b'\nendobj\n')
+
+    def _allocate_object(self):
+        number = self._next_object
+        self._next_object += 1
+        return number
+
+    def _label_ops(self, slot, product_name, barcode):
+        column, row = slot % self.columns, slot // self.columns
+        left = self._margin + column * self._cell_width
+        top = self.page_height - self._margin - row * self._cell_height
+        padding, scale, geometry = self._padding, self._scale, self._geometry
+
+        ops = []
+        name = str(product_name or '')
+        if len(name) > self._max_name_chars:
+            name = name[:self._max_name_chars - 1] + '\u2026'
+        ops.append(b'BT /F1 %s Tf %s %s Td (%s) Tj ET' % (
+            _pdf_number(_NAME_FONT_SIZE).encode(), _pdf_number(left + padding).encode(),
+            _pdf_number(top - padding - _NAME_FONT_SIZE).encode(), _pdf_text(name),
+        ))
+
+        origin_x = left + (self._cell_width - geometry.width * scale) / 2
+        origin_y = top - padding - self._name_height
+        bar_y = origin_y - (geometry.bar_top + geometry.module_height) * scale
+        # Batang digambar dalam satuan mm lewat matriks transformasi, jadi
+        # operator setiap batang sama di semua label dan bisa di-cache.
+        ops.append(b'q %s 0 0 %s %s %s cm' % (
+            _pdf_number(scale).encode(), _pdf_number(scale).encode(),
+            _pdf_number(origin_x).encode(), _pdf_number(bar_y).encode(),
+        ))
+        for run in geometry.bar_runs(barcode):
+            op = self._bar_ops.get(run)
+            if op is None:
+                x, width = geometry.bar_rect(*run)
+                op = self._bar_ops[run] = f'{x:.4g} 0 {width:.4g} {geometry.module_height:.4g} re'.encode()
+            ops.append(op)
+        ops.append(b'f Q')
+
+        if geometry.write_text:
+            text = normalize_ean13(barcode)
+            font_size = geometry.font_size_mm * scale
+            text_width = len(text) * _HELVETICA_DIGIT_WIDTH * font_size
+            ops.append(b'BT /F1 %s Tf %s %s Td (%s) Tj ET' % (
+                _pdf_number(font_size).encode(),
+                _pdf_number(origin_x + geometry.text_x * scale - text_width / 2).encode(),
+                _pdf_number(origin_y - geometry.text_y * scale + font_size * 0.2).encode(),
+                text.encode('ascii'),
+            ))
+        return ops
+
+    def _flush_page(self):
+        content = zlib.compress(b'\n'.join(self._page_ops), 6)
+        content_object = self._allocate_object()
+        self._write_object(
+            content_object,
+            b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(content) + content + b'\nendstream',
+        )
+        page_object = self._allocate_object()
+        self._write_object(page_object, (
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_pdf_number(self.page_width)} '
+            f'{_pdf_number(self.page_height)}] /Resources << /Font << /F1 3 0 R >> >> '
+            f'/Contents {content_object} 0 R >>'
+        ).encode('ascii'))
+        self._page_objects.append(page_object)
+        self._page_ops = []
+        self._labels_on_page = 0
+
+    def write_barcode_row(self, product_name, barcode, png_bytes):
+        """Menambahkan satu label. Mengembalikan nomor label (mulai dari 1)."""
+        self._page_ops.extend(self._label_ops(self._labels_on_page, product_name, barcode))
+        self._labels_on_page += 1
+        self._label_count += 1
+        if self._labels_on_page == self.columns * self.rows:
+            self._flush_page()
+        return self._label_count
+
+    def write_failed_row(self, product_name, original_barcode):
+        return None
+
+    def save(self):
+        if self._labels_on_page or not self._page_objects:
+            self._flush_page()
+        kids = ' '.join(f'{number} 0 R' for number in self._page_objects)
+        self._write_object(2, f'<< /Type /Pages /Kids [{kids}] /Count {len(self._page_objects)} >>'.encode('ascii'))
+        self._write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+        xref_offset = self._file.tell()
+        object_count = self._next_object
+        lines = [f'xref\n0 {object_count}\n'.encode('ascii'), b'0000000000 65535 f \n']
+        lines.extend(b'%010d 00000 n \n' % self._offsets[number] for number in range(1, object_count))
+        self._file.write(b''.join(lines))
+        self._file.write(
+            f'trailer\n<< /Size {object_count} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n'.encode('ascii')
+        )
+        self._file.close()
+        os.replace(self._part_file, self.output_file)
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self._part_file):
+            os.remove(self._part_file)
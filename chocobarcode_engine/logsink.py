@@ -0,0 +1,95 @@
+"""
+Level log dan sink log untuk pipeline.
+
+Pipeline memanggil `log_callback(pesan, level)`. Pesan per baris memakai
+level DETAIL; ringkasan memakai INFO. Callback boleh punya method
+`is_enabled(level)`; jika DETAIL tidak aktif, pipeline tidak mengirim
+pesan per baris sama sekali.
+
+QueueLogSink dipakai GUI: thread worker hanya memasukkan event ke antrean
+(tanpa menyentuh Tk), UI mengambilnya per batch lewat timer. Progress
+cukup disimpan nilai terakhirnya, jadi update per baris otomatis digabung.
+"""
+import logging
+import queue
+import threading
+import time
+
+DETAIL = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+LEVEL_NAMES = {DETAIL: 'DETAIL', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+
+
+def is_level_enabled(log_callback, level):
+    if log_callback is None:
+        return False
+    is_enabled = getattr(log_callback, 'is_enabled', None)
+    return is_enabled is None or is_enabled(level)
+
+
+class LogFile:
+    """File log lengkap (append), aman dipanggil dari beberapa thread."""
+
+    def __init__(self, path, level=DETAIL):
+        self.path = path
+        self.level = level
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def write(self, message, level=INFO):
+        if level < self.level:
+            return
+        stamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        line = f"{stamp} {LEVEL_NAMES.get(level, level)} {message.strip()}\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class QueueLogSink:
+    """
+    Sink log thread-safe untuk GUI. `level` = level minimum yang masuk ke
+    antrean UI; `log_file` (opsional, LogFile) menerima log lengkap.
+    """
+
+    def __init__(self, level=INFO, log_file=None):
+        self.level = level
+        self.log_file = log_file
+        self._queue = queue.SimpleQueue()
+        self._progress = None
+
+    def is_enabled(self, level):
+        return level >= self.level or (self.log_file is not None and level >= self.log_file.level)
+
+    def __call__(self, message, level=INFO):
+        if self.log_file is not None:
+            self.log_file.write(message, level)
+        if level >= self.level:
+            self._queue.put((level, message))
+
+    def report_progress(self, done, total):
+        # Hanya nilai terakhir yang disimpan; UI membacanya di setiap tick.
+        self._progress = (done, total)
+
+    def take_progress(self):
+        progress, self._progress = self._progress, None
+        return progress
+
+    def drain(self):
+        """Mengambil semua event yang sudah masuk sebagai list (level, pesan)."""
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close_log_file(self):
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
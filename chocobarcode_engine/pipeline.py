@@ -0,0 +1,606 @@
+import copy
+import cProfile
+import functools
+import os
+import random
+from collections import deque
+
+from .config import BARCODE_COLUMN_NAME, PRODUCT_NAME_COLUMN_NAME
+from .allocator import create_allocator
+from .cache import DEFAULT_CACHE_MAX_BYTES, RenderCache, render_namespace
+from .checkpoint import DEFAULT_CHECKPOINT_ROWS, RunJournal, input_fingerprint
+from .incremental import ManifestWriter, PreviousOutput
+from .labels import DEFAULT_LABEL_GRID, DEFAULT_PAGE_SIZE
+from .logsink import DETAIL, WARNING, is_level_enabled
+from .reader import DEFAULT_READ_CHUNK_SIZE, RowSpool, open_input
+from .registry import BarcodeRegistry
+from .render import DEFAULT_RENDER_CHUNK_SIZE, DEFAULT_RENDERER, RENDERER_VERSION, BarcodeRenderer, resolve_worker_count
+from .runstats import STAGES, RunStats, format_report
+from .shards import ShardSet, read_shard_rows
+from .validate import scan_ean13_chunks, validate_ean13_column
+from .writer import DEFAULT_OUTPUT_FORMAT, DEFAULT_OUTPUT_WRITER, StreamingExcelBarcodeWriter, create_writer
+
+# Opsi yang menentukan isi output; run hanya dilanjutkan dari checkpoint jika semuanya sama.
+_RESUME_OPTIONS = ('product_column', 'barcode_column', 'input_format', 'csv_delimiter', 'seed', 'prefixes',
+                   'allocation', 'registry_path', 'renderer', 'incremental')
+
+
+class GenerateOptions:
+    """
+    Opsi untuk satu kali proses generate. Semua nilai punya default yang
+    sama dengan perilaku GUI, jadi GenerateOptions() saja sudah cukup.
+    """
+
+    def __init__(self, product_column=PRODUCT_NAME_COLUMN_NAME, barcode_column=BARCODE_COLUMN_NAME,
+                 seed=None, workers=1, chunk_size=DEFAULT_RENDER_CHUNK_SIZE, renderer=DEFAULT_RENDERER,
+                 prefixes=(), allocation='sequential', registry_path=None,
+                 input_format=None, read_chunk_size=DEFAULT_READ_CHUNK_SIZE, output_writer=DEFAULT_OUTPUT_WRITER,
+                 cache_path=None, cache_max_bytes=DEFAULT_CACHE_MAX_BYTES, incremental=False, profile_path=None,
+                 output_format=DEFAULT_OUTPUT_FORMAT, label_grid=DEFAULT_LABEL_GRID, page_size=DEFAULT_PAGE_SIZE,
+                 shard_rows=None, shard_column=None, checkpoint_rows=None, resume=False, csv_delimiter=None):
+        self.product_column = product_column
+        self.barcode_column = barcode_column
+        # Seed untuk barcode acak; None berarti acak penuh seperti sebelumnya.
+        self.seed = seed
+        # Jumlah proses render gambar (1 = serial, 0 = semua core) dan
+        # jumlah barcode per tugas yang dikirim ke satu proses.
+        self.workers = workers
+        self.chunk_size = chunk_size
+        # 'fast' (tile NumPy) atau 'pil' (ImageWriter python-barcode).
+        self.renderer = renderer
+        # Prefix (mis. GS1 company prefix) untuk barcode baru. Kosong berarti
+        # barcode acak seperti sebelumnya. `allocation` = 'sequential' atau
+        # 'permuted'. `registry_path` = file SQLite berisi semua barcode yang
+        # pernah dikeluarkan, agar unik lintas run.
+        self.prefixes = tuple(prefixes)
+        self.allocation = allocation
+        self.registry_path = registry_path
+        # Format input ('excel', 'csv', 'parquet'; None = dari ekstensi) dan
+        # jumlah baris per chunk yang dibaca sekaligus.
+        self.input_format = input_format
+        self.read_chunk_size = read_chunk_size
+        # Pemisah CSV tetap; None = ditebak dari baris header.
+        self.csv_delimiter = csv_delimiter
+        # 'streaming' (memori datar, ditulis sambil jalan) atau 'openpyxl'
+        # (workbook utuh di memori sampai disimpan).
+        self.output_writer = output_writer
+        # 'xlsx', 'pdf' (lembar label, grid = (kolom, baris) per halaman
+        # `page_size`), 'svg' atau 'png' (ZIP berisi satu file per barcode).
+        self.output_format = output_format
+        self.label_grid = tuple(label_grid)
+        self.page_size = page_size
+        # File SQLite cache render PNG (None = tanpa cache) dan batas ukurannya.
+        self.cache_path = cache_path
+        self.cache_max_bytes = cache_max_bytes
+        # Pakai ulang barcode (dan gambar) dari output sebelumnya di path
+        # output yang sama; hanya baris yang berubah yang diproses ulang.
+        self.incremental = incremental
+        # Jika diisi, seluruh run dijalankan di bawah cProfile dan statistiknya
+        # disimpan ke file ini (buka dengan pstats / snakeviz).
+        self.profile_path = profile_path
+        # Output dipecah menjadi beberapa workbook: setiap `shard_rows` baris
+        # atau per nilai kolom `shard_column`. Setiap shard dirender dan
+        # disimpan oleh proses worker sendiri (sebanyak `workers`); file output
+        # utama menjadi workbook indeks berisi daftar shard.
+        self.shard_rows = shard_rows
+        self.shard_column = shard_column
+        # Setiap `checkpoint_rows` baris, progres disimpan ke journal
+        # `<output>.journal` (None = tanpa checkpoint). `resume` melanjutkan
+        # run yang terputus dari checkpoint terakhirnya (default interval
+        # DEFAULT_CHECKPOINT_ROWS). Hanya untuk xlsx dengan penulis streaming.
+        self.checkpoint_rows = checkpoint_rows
+        self.resume = resume
+
+
+class PlannedRow:
+    """Satu baris input beserta barcode final yang akan dirender (None jika gagal)."""
+
+    __slots__ = ('index', 'product_name', 'original_barcode', 'barcode', 'error', 'group', 'checkpoint')
+
+    def __init__(self, index, product_name, original_barcode, barcode=None, error=None, group=None):
+        self.index = index
+        self.product_name = product_name
+        self.original_barcode = original_barcode
+        self.barcode = barcode
+        self.error = error
+        # Nilai kolom grup (hanya jika output dipecah per grup).
+        self.group = group
+        # Keadaan alokasi sebelum baris ini, jika checkpoint diambil di sini.
+        self.checkpoint = None
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+class _NoImages:
+    """Pengganti BarcodeRenderer untuk output vektor: tidak ada PNG yang dirender."""
+
+    rendered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def render_many(self, barcodes):
+        for _ in barcodes:
+            yield None, None
+
+
+class _NoManifest:
+    """Pengganti ManifestWriter di worker shard; manifest ditulis oleh proses utama."""
+
+    def add(self, product_name, original_barcode, barcode):
+        pass
+
+
+def _spooled(chunks, spool):
+    for chunk in chunks:
+        spool.append(chunk)
+        yield chunk
+
+
+def _plan_rows(chunks, taken_barcodes, new_barcode_count, allocator, log, counters, stats, previous=None,
+               journal=None):
+    """
+    Tahap validasi + alokasi: menentukan barcode final setiap baris secara
+    berurutan. Validasi dilakukan per chunk sekaligus (NumPy); semua barcode
+    valid dari input (`taken_barcodes`, hasil lintasan pertama) sudah
+    dicadangkan sehingga barcode baru tidak akan bentrok dengan barcode
+    valid yang muncul belakangan di file.
+
+    Dengan `previous` (mode inkremental), baris yang tidak berubah memakai
+    barcode final dari output sebelumnya dan tidak dialokasikan ulang.
+
+    Dengan `journal` (RunJournal), keadaan alokasi dicatat di baris
+    checkpoint (PlannedRow.checkpoint). Pada run yang dilanjutkan, baris
+    sebelum checkpoint terakhir tidak dihasilkan lagi: barcode-nya dari
+    journal hanya dipakai untuk membangun ulang himpunan barcode terpakai.
+    """
+    input_barcodes = None
+    if previous is not None:
+        input_barcodes = set(taken_barcodes)
+        taken_barcodes.update(previous.all_barcodes())
+        # Berapa baris yang masih butuh barcode baru baru ketahuan saat
+        # diproses; allocator mencadangkan sesuai kebutuhan.
+        new_barcode_count = 0
+    start_row = 0
+    if journal is not None and journal.state is not None:
+        allocator.prepare(0, taken_barcodes)
+        allocator.restore([plan['allocator'] for plan in journal.plan_states])
+        start_row = journal.start_row
+    else:
+        allocator.prepare(new_barcode_count, taken_barcodes)
+    # Barcode input yang sudah dipakai baris sebelumnya; kemunculan berikutnya duplikat.
+    used_barcodes = set()
+    index = 0
+
+    for chunk in chunks:
+        with stats.stage('validate'):
+            validated = validate_ean13_column([row[1] for row in chunk]).barcodes
+        for row, validated_barcode in zip(chunk, validated):
+            product_name, original_barcode = row[0], row[1]
+            if index < start_row:
+                # Barcode baru tidak pernah sama dengan barcode valid input
+                # maupun barcode output sebelumnya, jadi semua barcode dari
+                # journal boleh masuk used_barcodes.
+                barcode = journal.barcodes[index]
+                if previous:
+                    previous.take(product_name, original_barcode, validated_barcode)
+                if barcode:
+                    used_barcodes.add(barcode)
+                    taken_barcodes.add(barcode)
+                index += 1
+                continue
+            log(f"\nMemproses: '{product_name}' - Barcode Asli: '{original_barcode}'")
+            planned = PlannedRow(index, product_name, original_barcode, group=row[2] if len(row) > 2 else None)
+            if journal is not None and journal.due(index):
+                planned.checkpoint = {'allocator': allocator.state(), 'generated_new': counters['generated_new'],
+                                      'reused': counters['reused']}
+            index += 1
+            try:
+                reused = previous.take(product_name, original_barcode, validated_barcode) if previous else None
+                # Barcode lama tidak dipakai jika sekarang menjadi barcode valid milik baris input lain.
+                if reused and reused not in used_barcodes and (reused == validated_barcode or reused not in input_barcodes):
+                    planned.barcode = reused
+                    used_barcodes.add(reused)
+                    counters['reused'] += 1
+                    log(f"    Info: Barcode dari output sebelumnya dipakai ulang: '{reused}'.")
+                elif validated_barcode: # Barcode asli valid atau sudah dikoreksi checksum
+                    if validated_barcode in used_barcodes:
+                        log(f"    Peringatan: Barcode EAN-13 yang divalidasi '{validated_barcode}' adalah duplikat. Menghasilkan barcode baru.")
+                        planned.barcode = allocator.allocate(taken_barcodes)
+                        counters['generated_new'] += 1
+                    else:
+                        # Jika valid dan belum diproses, gunakan barcode ini
+                        planned.barcode = validated_barcode
+                        used_barcodes.add(validated_barcode)
+                        log(f"    Info: Barcode awal divalidasi dan digunakan: '{validated_barcode}'.")
+                else:
+                    # Jika barcode asli tidak valid
+                    log(f"    Peringatan: Barcode asli '{original_barcode}' tidak valid atau terlalu pendek/panjang. Menghasilkan barcode baru.")
+                    planned.barcode = allocator.allocate(taken_barcodes)
+                    counters['generated_new'] += 1
+
+                if planned.barcode:
+                    taken_barcodes.add(planned.barcode)
+                else:
+                    planned.error = "Barcode final tidak dapat ditentukan."
+            except Exception as e:
+                planned.barcode = None
+                planned.error = str(e)
+
+            yield planned
+
+
+def _render_and_write(planned_rows, writer, manifest, options, log, row_log, progress, total_rows, counters,
+                      stats, cache=None, previous=None, executor=None, journal=None):
+    """
+    Tahap render + tulis: gambar dirender (bisa paralel) lalu ditulis sesuai
+    urutan input. Checkpoint journal disimpan tepat sebelum baris yang
+    membawa PlannedRow.checkpoint ditulis.
+    """
+
+    def checkpoint(planned):
+        if planned.checkpoint is not None:
+            with stats.stage('save'):
+                journal.commit(planned.index, planned.checkpoint, writer.checkpoint(), manifest.checkpoint(), counters)
+
+    def record(planned):
+        if journal is not None:
+            journal.record(planned.barcode)
+
+    def write_failed(planned):
+        log(f"    Gagal memproses barcode '{planned.original_barcode}' ('{planned.product_name}'): {planned.error}",
+            WARNING)
+        checkpoint(planned)
+        with stats.stage('embed'):
+            writer.write_failed_row(planned.product_name, planned.original_barcode)
+            manifest.add(planned.product_name, planned.original_barcode, None)
+        record(planned)
+        counters['failed'] += 1
+        progress(planned.index + 1, total_rows)
+
+    # Baris yang sudah direncanakan tetapi belum ditulis. Renderer membaca
+    # barcode lebih dulu dari yang ditulis, jadi baris menunggu di sini
+    # sampai gambarnya kembali (selalu dalam urutan input).
+    waiting = deque()
+
+    def barcodes_to_render():
+        for planned in planned_rows:
+            waiting.append(planned)
+            if planned.barcode:
+                yield planned.barcode
+
+    if writer.needs_png:
+        renderer = BarcodeRenderer(options.workers, options.chunk_size, options.renderer, cache, previous, executor)
+    else:
+        renderer = _NoImages()
+    with renderer:
+        for png_bytes, render_error in stats.timed_iter('render', renderer.render_many(barcodes_to_render())):
+            while not waiting[0].barcode:
+                write_failed(waiting.popleft())
+            planned = waiting.popleft()
+
+            if render_error is not None:
+                planned.error = render_error
+                write_failed(planned)
+                continue
+
+            checkpoint(planned)
+            with stats.stage('embed'):
+                excel_row = writer.write_barcode_row(planned.product_name, planned.barcode, png_bytes)
+                manifest.add(planned.product_name, planned.original_barcode, planned.barcode)
+            record(planned)
+            row_log(f"    Berhasil dibuat: Barcode EAN-13 '{planned.barcode}' dan gambar disisipkan di baris {excel_row}.")
+            counters['successful'] += 1
+            progress(planned.index + 1, total_rows)
+
+    while waiting:
+        write_failed(waiting.popleft())
+    counters['rendered'] += renderer.rendered
+
+
+def _build_shard(shard_file, rows_file, options):
+    """
+    Worker shard: merender dan menyimpan satu workbook shard dari baris yang
+    sudah dialokasikan (lihat ShardSet). Berjalan di proses terpisah, jadi
+    hanya mengembalikan hitungan, pesan log dan waktu per tahap.
+    """
+    messages = []
+
+    def log(message, level=WARNING):
+        messages.append((message, level))
+
+    counters = {'successful': 0, 'failed': 0, 'rendered': 0}
+    stats = RunStats()
+    cache = RenderCache(options.cache_path, options.cache_max_bytes) if options.cache_path else None
+    try:
+        writer = create_writer(shard_file, options.output_writer)
+        try:
+            planned_rows = (PlannedRow(*row) for row in read_shard_rows(rows_file))
+            _render_and_write(planned_rows, writer, _NoManifest(), options, log, _noop, _noop, 0, counters, stats,
+                              cache)
+            with stats.stage('save'):
+                writer.save()
+        except BaseException:
+            writer.abort()
+            raise
+    finally:
+        if cache is not None:
+            cache.close()
+    return dict(counters, messages=messages, stages=dict(stats.stage_seconds),
+                render_cache=cache.stats() if cache is not None else None)
+
+
+def _write_shards(planned_rows, shards, manifest, log, progress, total_rows, counters, stats):
+    """
+    Tahap tulis untuk output per shard: baris diarahkan ke shard-nya di
+    proses utama, render + simpan setiap shard berjalan di worker.
+    """
+    done_rows = 0
+    shard_stages = dict.fromkeys(STAGES, 0.0)
+    cache_stats = None
+
+    def collect(finished):
+        nonlocal done_rows, cache_stats
+        for shard in finished:
+            result = shard.result
+            for message, level in result['messages']:
+                log(message, level)
+            for key in ('successful', 'failed', 'rendered'):
+                counters[key] += result[key]
+            for name, seconds in result['stages'].items():
+                shard_stages[name] += seconds
+            if result['render_cache'] is not None:
+                if cache_stats is None:
+                    cache_stats = dict.fromkeys(result['render_cache'], 0)
+                for key, value in result['render_cache'].items():
+                    # Ukuran cache adalah ukuran file bersama, bukan jumlah per shard.
+                    cache_stats[key] = max(cache_stats[key], value) if key == 'size_bytes' else cache_stats[key] + value
+            done_rows += shard.row_count
+            log(f"Shard '{os.path.basename(shard.path)}' selesai: {shard.row_count} baris.")
+            progress(done_rows, total_rows)
+
+    for planned in planned_rows:
+        # Baris gagal dicatat (dan dilaporkan) oleh worker shard-nya.
+        manifest.add(planned.product_name, planned.original_barcode, planned.barcode)
+        with stats.stage('save'):
+            shards.add(planned.index, planned.product_name, planned.original_barcode, planned.barcode, planned.error,
+                       planned.group)
+            collect(shards.completed())
+    with stats.stage('save'):
+        for shard in shards.finish():
+            collect([shard])
+    return {name: round(seconds, 3) for name, seconds in shard_stages.items()}, cache_stats
+
+
+def _run_fingerprint(input_file, output_file, options):
+    fingerprint = {
+        'input': input_fingerprint(input_file),
+        'renderer_version': RENDERER_VERSION,
+        'options': {name: getattr(options, name) for name in _RESUME_OPTIONS},
+    }
+    if options.incremental and os.path.exists(output_file):
+        fingerprint['previous_output'] = input_fingerprint(output_file)
+    return fingerprint
+
+
+def generate_barcode_workbook(input_file, output_file, options=None, log_callback=None, progress_callback=None,
+                              registry=None, executor=None):
+    """
+    Menjalankan seluruh pipeline: baca input -> validasi -> alokasi barcode baru
+    -> render gambar -> tulis workbook output.
+
+    `log_callback(pesan, level)` menerima log (lihat logsink; pesan per baris
+    ber-level DETAIL), `progress_callback(selesai, total)` dipanggil setelah
+    input terbaca (selesai=0) dan setelah setiap baris.
+    Mengembalikan dict ringkasan yang bisa langsung di-dump ke JSON; kunci
+    'performance' berisi waktu per tahap, throughput dan puncak memori.
+    Melempar InputFileError jika file input tidak bisa dipakai.
+
+    Proses yang berjalan lama (job server) bisa memberikan `registry`
+    (BarcodeRegistry yang sudah terbuka, menggantikan options.registry_path)
+    dan `executor` (process pool render yang sudah hangat); keduanya tidak
+    ditutup di sini.
+    """
+    options = options or GenerateOptions()
+    if not options.profile_path:
+        return _generate(input_file, output_file, options, log_callback, progress_callback, registry, executor)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        summary = _generate(input_file, output_file, options, log_callback, progress_callback, registry, executor)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(options.profile_path)
+    summary['performance']['profile_file'] = options.profile_path
+    return summary
+
+
+def _generate(input_file, output_file, options, log_callback, progress_callback, registry=None, executor=None):
+    log = log_callback or _noop
+    # Pesan per baris hanya dibuat jika ada yang mau menerimanya.
+    if is_level_enabled(log_callback, DETAIL):
+        def row_log(message):
+            log_callback(message, DETAIL)
+    else:
+        row_log = _noop
+    progress = progress_callback or _noop
+    rng = random.Random(options.seed) if options.seed is not None else None
+    stats = RunStats()
+    sharded = bool(options.shard_rows or options.shard_column)
+    if sharded and options.output_format != 'xlsx':
+        raise ValueError("Output per shard hanya tersedia untuk format xlsx.")
+    checkpointing = bool(options.checkpoint_rows or options.resume)
+    if checkpointing and (sharded or options.output_format != 'xlsx' or options.output_writer != 'streaming'):
+        raise ValueError("Checkpoint dan resume hanya tersedia untuk output xlsx dengan penulis streaming tanpa shard.")
+    if checkpointing and rng is None:
+        # Keadaan RNG disimpan di journal, jadi butuh instance sendiri, bukan modul random.
+        rng = random.Random()
+
+    log("Memulai proses pembuatan barcode Excel...")
+    log("PENTING: Barcode yang valid (13 digit, checksum benar) dari file input akan dipertahankan.")
+    log(f"File output akan disimpan sebagai: {output_file}")
+
+    # Lintasan pertama menghitung baris dan mengumpulkan barcode valid sambil
+    # menyimpan chunk ke spool; lintasan kedua membaca ulang dari spool.
+    spool = RowSpool()
+    try:
+        with stats.stage('read'):
+            source = open_input(input_file, options.product_column, options.barcode_column, options.input_format,
+                                options.shard_column, options.csv_delimiter)
+        with stats.stage('validate'):
+            total_rows, reserved_barcodes, validation_counts = scan_ean13_chunks(
+                [row[1] for row in chunk]
+                for chunk in stats.timed_iter('read', _spooled(source.iter_chunks(options.read_chunk_size), spool))
+            )
+    except BaseException:
+        spool.close()
+        raise
+    log(f"Berhasil membaca {total_rows} baris dari '{input_file}'.")
+    progress(0, total_rows)
+
+    log(f"Validasi: {validation_counts['kept']} valid, {validation_counts['checksum-corrected']} checksum dikoreksi, "
+        f"{validation_counts['padded-from-12']} dilengkapi dari 12 digit, {validation_counts['invalid']} tidak valid, "
+        f"{validation_counts['duplicate']} duplikat.")
+
+    namespace = render_namespace(options.renderer, RENDERER_VERSION)
+    previous = None
+    if options.incremental:
+        # File output per shard hanyalah indeks; barcode lama diambil dari manifest saja.
+        previous = PreviousOutput(output_file, namespace, images=options.output_format == 'xlsx' and not sharded)
+        log(f"Mode inkremental: {previous.row_count} baris dari output sebelumnya dibandingkan dengan input.")
+
+    owns_registry = registry is None and bool(options.registry_path)
+    if owns_registry:
+        registry = BarcodeRegistry(options.registry_path)
+    cache = None
+    shards = None
+    journal = None
+    shard_stages = shard_cache_stats = None
+    try:
+        # Registry dari pemanggil (job server) dipakai bersama job lain yang berjalan bersamaan.
+        allocator = create_allocator(options.prefixes, options.allocation, registry, rng, row_log,
+                                     shared_registry=registry is not None and not owns_registry)
+        if checkpointing:
+            journal = RunJournal(output_file, _run_fingerprint(input_file, output_file, options),
+                                 options.checkpoint_rows or DEFAULT_CHECKPOINT_ROWS, options.resume)
+            checkpoint = journal.state or {}
+            if journal.start_row:
+                log(f"Melanjutkan run yang terputus dari checkpoint: {journal.start_row} dari {total_rows} baris "
+                    "sudah selesai.")
+            elif options.resume:
+                log("Tidak ada checkpoint yang bisa dilanjutkan; proses dimulai dari awal.")
+            writer = StreamingExcelBarcodeWriter(output_file, resumable=True, state=checkpoint.get('writer'))
+            manifest = ManifestWriter(output_file, namespace, resumable=True, state=checkpoint.get('manifest'))
+        elif sharded:
+            # Worker shard merender serial; paralelismenya ada di jumlah shard yang jalan bersamaan.
+            shard_options = copy.copy(options)
+            shard_options.workers = 1
+            shards = writer = ShardSet(output_file, functools.partial(_build_shard, options=shard_options),
+                                       resolve_worker_count(options.workers), options.shard_rows,
+                                       by_group=bool(options.shard_column))
+        else:
+            writer = create_writer(output_file, options.output_writer, options.output_format, options.label_grid,
+                                   options.page_size)
+        if journal is None:
+            manifest = ManifestWriter(output_file, namespace)
+        counters = {'successful': 0, 'generated_new': 0, 'failed': 0, 'reused': 0, 'rendered': 0}
+        if journal is not None and journal.state is not None:
+            counters.update(successful=journal.state['successful'], failed=journal.state['failed'],
+                            generated_new=journal.state['plan']['generated_new'],
+                            reused=journal.state['plan']['reused'])
+            progress(journal.start_row, total_rows)
+        try:
+            planned_rows = stats.timed_iter('allocate', _plan_rows(
+                stats.timed_iter('read', spool.iter_chunks()), reserved_barcodes,
+                validation_counts['invalid'] + validation_counts['duplicate'], allocator, row_log, counters,
+                stats, previous, journal,
+            ))
+            if shards is not None:
+                shard_stages, shard_cache_stats = _write_shards(planned_rows, shards, manifest, log, progress,
+                                                                total_rows, counters, stats)
+            else:
+                # Cache render hanya berguna jika output memang berisi gambar PNG.
+                if options.cache_path and writer.needs_png:
+                    cache = RenderCache(options.cache_path, options.cache_max_bytes)
+                _render_and_write(planned_rows, writer, manifest, options, log, row_log, progress, total_rows,
+                                  counters, stats, cache, previous, executor, journal)
+            if previous is not None:
+                previous.close()
+            with stats.stage('save'):
+                if shards is not None:
+                    shards.write_index()
+                else:
+                    writer.save()
+                manifest.save()
+                if journal is not None:
+                    journal.remove()
+        except BaseException:
+            writer.abort()
+            manifest.close()
+            raise
+        allocator.close()
+        allocation_stats = allocator.stats()
+    finally:
+        spool.close()
+        if shards is not None:
+            shards.close()
+        if previous is not None:
+            previous.close()
+        if journal is not None:
+            journal.close()
+        if owns_registry:
+            registry.close()
+        if cache is not None:
+            cache.close()
+
+    if shards is not None:
+        log(f"\nProses selesai! {len(shards.summary())} file shard dan indeks '{output_file}' telah berhasil dibuat.")
+    else:
+        log(f"\nProses selesai! File {options.output_format.upper()} '{output_file}' telah berhasil dibuat.")
+    log(f"Jumlah produk yang berhasil diproses: {counters['successful']}")
+    log(f"Jumlah barcode baru yang dihasilkan: {counters['generated_new']}")
+    log(f"Jumlah barcode yang gagal diproses: {counters['failed']}")
+    if previous is not None:
+        log(f"Barcode dipakai ulang dari output sebelumnya: {counters['reused']} "
+            f"({previous.reused_images} gambar disalin tanpa render ulang)")
+    cache_stats = cache.stats() if cache is not None else shard_cache_stats
+    if cache_stats is not None:
+        log(f"Cache render: {cache_stats['hits']} diambil dari cache, {cache_stats['misses']} dirender baru.")
+
+    # Pool dari pemanggil (job server) masih hidup: puncak memori worker-nya belum terbaca.
+    performance = stats.report(total_rows, workers_exited=executor is None)
+    performance.update(
+        allocation=allocation_stats,
+        images_rendered=counters['rendered'],
+        output_bytes=shards.output_bytes() if shards is not None else os.path.getsize(output_file),
+        profile_file=None,
+    )
+    if shard_stages is not None:
+        # Waktu per tahap di dalam worker shard (dijumlahkan; berjalan bersamaan).
+        performance['shard_stages'] = shard_stages
+    for line in format_report(performance):
+        log(line)
+
+    return {
+        'input_file': input_file,
+        'output_file': output_file,
+        'output_format': options.output_format,
+        'total_rows': total_rows,
+        'successful': counters['successful'],
+        'generated_new': counters['generated_new'],
+        'failed': counters['failed'],
+        'validation': validation_counts,
+        'allocation': options.allocation if options.prefixes else 'random',
+        'render_cache': cache_stats,
+        'incremental': dict(previous.stats(), reused_barcodes=counters['reused']) if previous is not None else None,
+        'shards': shards.summary() if shards is not None else None,
+        'resumed_from_row': journal.start_row if journal is not None and journal.start_row else None,
+        'elapsed_seconds': performance['elapsed_seconds'],
+        'performance': performance,
+    }
@@ -0,0 +1,379 @@
+"""
+Rasterizer EAN-13 cepat.
+
+ImageWriter python-barcode menggambar setiap batang sebagai rectangle PIL dan
+menulis teks huruf demi huruf untuk setiap barcode. Padahal untuk satu set
+opsi, posisi setiap modul dan setiap digit teks selalu sama; yang berubah
+hanya digitnya. Modul ini menghitung sekali (dengan PIL, agar pembulatannya
+identik) rentang kolom piksel tiap modul dan tile glyph tiap (posisi, digit),
+lalu menyusun barcode dengan slicing NumPy dan langsung meng-encode PNG.
+
+Hasilnya identik per piksel dengan ImageWriter untuk warna hitam di atas
+putih, disimpan sebagai PNG grayscale 8-bit.
+
+CompactEAN13Rasterizer (renderer 'compact') tidak meniru ImageWriter:
+gambar langsung disusun di ukuran tampilan (IMAGE_WIDTH_PIXELS x
+IMAGE_HEIGHT_PIXELS) dengan lebar modul bilangan bulat piksel dan teks yang
+di-threshold, lalu disimpan sebagai PNG 1-bit. Excel tidak perlu
+mengecilkan gambar dan ukuran tiap PNG jauh lebih kecil.
+"""
+import struct
+import zlib
+from functools import lru_cache
+
+import numpy as np
+from barcode.charsets import ean as _ean
+from barcode.writer import BaseWriter, mm2px, pt2mm
+from PIL import Image, ImageDraw, ImageFont
+
+from .vector import EAN13_MODULES, ean13_modules, normalize_ean13
+
+PNG_COMPRESS_LEVEL = 6
+# Untuk PNG 1-bit sekecil ini level 5 sudah sama kecilnya dengan level 9.
+COMPACT_PNG_COMPRESS_LEVEL = 5
+# 96 DPI = satu piksel gambar per piksel layar Excel (100%).
+COMPACT_IMAGE_DPI = 96
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_DEFAULT_DPI = 300
+# Zona sepi minimal per sisi untuk profil compact (EAN-13 butuh 11 modul di
+# kiri dan 7 di kanan; batang diletakkan di tengah gambar).
+_COMPACT_QUIET_MODULES = 11
+_TEXT_THRESHOLD = 128
+
+
+def _png_chunk(tag, data):
+    return (struct.pack('>I', len(data)) + tag + data
+            + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+
+def _filter_up(pixels):
+    # Semua baris memakai filter PNG 'Up': baris yang sama dengan baris di
+    # atasnya (badan batang, area putih) menjadi nol semua.
+    height, width = pixels.shape
+    filtered = np.empty((height, width + 1), dtype=np.uint8)
+    filtered[:, 0] = 2
+    filtered[0, 1:] = pixels[0]
+    np.subtract(pixels[1:], pixels[:-1], out=filtered[1:, 1:])
+    return filtered
+
+
+def _deflate_raw(data, compress_level, final):
+    # Z_RLE jauh lebih cepat daripada strategi default untuk blok warna
+    # seragam seperti barcode, dengan ukuran hasil yang hampir sama.
+    compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -15, 9, zlib.Z_RLE)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _png_bytes(width, height, deflate_stream, adler, bit_depth=8, extra_chunks=b''):
+    ihdr = struct.pack('>IIBBBBB', width, height, bit_depth, 0, 0, 0, 0)
+    idat = b'\x78\x01' + deflate_stream + struct.pack('>I', adler & 0xffffffff)
+    return b''.join((
+        _PNG_SIGNATURE,
+        _png_chunk(b'IHDR', ihdr),
+        extra_chunks,
+        _png_chunk(b'IDAT', idat),
+        _png_chunk(b'IEND', b''),
+    ))
+
+
+def encode_png_gray(pixels, compress_level=PNG_COMPRESS_LEVEL):
+    """Meng-encode array uint8 (tinggi, lebar) menjadi PNG grayscale 8-bit."""
+    height, width = pixels.shape
+    filtered = _filter_up(pixels)
+    return _png_bytes(width, height, _deflate_raw(filtered, compress_level, True), zlib.adler32(filtered))
+
+
+def encode_png_bilevel(white, compress_level=COMPACT_PNG_COMPRESS_LEVEL, extra_chunks=b''):
+    """Meng-encode array bool (tinggi, lebar), True = putih, menjadi PNG grayscale 1-bit."""
+    height, width = white.shape
+    # Filter 'None': baris batang yang berulang sudah menjadi referensi
+    # jarak pendek bagi deflate. Dengan filter 'Up' baris itu menjadi nol
+    # semua dan level 9 justru jauh lebih lambat tanpa hasil lebih kecil.
+    packed = np.packbits(white, axis=1)
+    filtered = np.empty((height, packed.shape[1] + 1), dtype=np.uint8)
+    filtered[:, 0] = 0
+    filtered[:, 1:] = packed
+    compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -15)
+    deflate_stream = compressor.compress(filtered) + compressor.flush()
+    return _png_bytes(width, height, deflate_stream, zlib.adler32(filtered), 1, extra_chunks)
+
+
+class _SplicedPngEncoder:
+    """
+    Encoder PNG untuk gambar yang sebagian besar barisnya (setelah filter Up)
+    sama untuk semua barcode. Rentang baris konstan dikompres sekali saja;
+    per barcode hanya baris yang berubah (tepi batang dan teks) yang
+    dikompres, lalu semua potongan deflate disambung karena setiap potongan
+    diakhiri sync flush dan tidak saling mereferensikan.
+    """
+
+    def __init__(self, template_pixels, varying_rows, compress_level=PNG_COMPRESS_LEVEL):
+        self.height, self.width = template_pixels.shape
+        self.compress_level = compress_level
+        filtered = _filter_up(template_pixels)
+
+        self._segments = []
+        start = 0
+        while start < self.height:
+            varying = start in varying_rows
+            end = start + 1
+            while end < self.height and (end in varying_rows) == varying:
+                end += 1
+            final = end == self.height
+            cached = None if varying else _deflate_raw(filtered[start:end], compress_level, final)
+            self._segments.append((start, end, cached, final))
+            start = end
+
+    def encode(self, pixels):
+        filtered = _filter_up(pixels)
+        parts = []
+        for start, end, cached, final in self._segments:
+            if cached is None:
+                cached = _deflate_raw(filtered[start:end], self.compress_level, final)
+            parts.append(cached)
+        return _png_bytes(self.width, self.height, b''.join(parts), zlib.adler32(filtered))
+
+
+class EAN13Rasterizer:
+    """
+    Menyusun gambar EAN-13 dari tile yang sudah di-cache untuk satu set opsi
+    ImageWriter (module_width, module_height, quiet_zone, font_size, dst).
+    """
+
+    def __init__(self, writer_options, dpi=_DEFAULT_DPI):
+        # BaseWriter dipakai hanya untuk default dan perhitungan ukuran,
+        # supaya geometri selalu sama dengan ImageWriter.
+        geometry = BaseWriter(None, None, None, None)
+        geometry.set_options(writer_options)
+        geometry.text = '0' * 13 if writer_options.get('write_text', True) else ''
+        if str(geometry.foreground).lower() != 'black' or str(geometry.background).lower() != 'white':
+            raise ValueError("Rasterizer cepat hanya mendukung barcode hitam di atas putih.")
+
+        self.dpi = dpi
+        width_mm, height_mm = geometry.calculate_size(EAN13_MODULES, 1)
+        self.width = int(mm2px(width_mm, dpi))
+        self.height = int(mm2px(height_mm, dpi))
+
+        self._module_columns = self._measure_module_columns(geometry)
+        self._bar_rows = self._measure_bar_rows(geometry)
+        self._blank_row = np.full(self.width, 255, dtype=np.uint8)
+
+        # Tile batang: untuk setiap slot digit (0-11) dan setiap encoding,
+        # potongan baris piksel yang sudah jadi.
+        self._guard_row = self._blank_row.copy()
+        for start in (0, 45, 92):
+            pattern = _ean.MIDDLE if start == 45 else _ean.EDGE
+            self._paint_modules(self._guard_row, start, pattern)
+        self._digit_tiles = {}
+        for slot in range(12):
+            first_module = 3 + slot * 7 + (5 if slot >= 6 else 0)
+            column_start = self._module_columns[first_module][0]
+            column_end = self._module_columns[first_module + 6][1]
+            encodings = 'C' if slot >= 6 else 'AB'
+            for encoding in encodings:
+                for digit in range(10):
+                    row = self._blank_row.copy()
+                    self._paint_modules(row, first_module, _ean.CODES[encoding][digit])
+                    self._digit_tiles[slot, encoding, digit] = (
+                        column_start, column_end, row[column_start:column_end].copy()
+                    )
+
+        self._text_tiles = self._build_text_tiles(geometry) if geometry.text and geometry.font_size else {}
+
+        # Baris yang bisa berbeda antar barcode: tepi atas/bawah batang dan
+        # seluruh area teks (ditambah satu baris sesudahnya karena filter Up).
+        varying_rows = set(self._bar_rows)
+        for top, bottom, _, _, _ in self._text_tiles.values():
+            varying_rows.update(range(top, bottom + 1))
+        self._encoder = _SplicedPngEncoder(self.render_pixels('0' * 13), varying_rows)
+
+    def _measure_module_columns(self, geometry):
+        # Rentang kolom [awal, akhir) tiap modul, diukur dengan rectangle PIL
+        # yang sama persis seperti ImageWriter._paint_module.
+        probe = Image.new('L', (self.width, 1), 255)
+        columns = []
+        for module in range(EAN13_MODULES):
+            xpos = geometry.quiet_zone + module * geometry.module_width
+            probe.paste(255, (0, 0, self.width, 1))
+            ImageDraw.Draw(probe).rectangle(
+                [(mm2px(xpos, self.dpi), 0), (mm2px(xpos + geometry.module_width, self.dpi) - 1, 0)],
+                outline=0, fill=0,
+            )
+            painted = np.flatnonzero(np.asarray(probe)[0] == 0)
+            columns.append((int(painted[0]), int(painted[-1]) + 1))
+        return columns
+
+    def _measure_bar_rows(self, geometry):
+        probe = Image.new('L', (1, self.height), 255)
+        ImageDraw.Draw(probe).rectangle(
+            [(0, mm2px(geometry.margin_top, self.dpi)),
+             (0, mm2px(geometry.margin_top + geometry.module_height, self.dpi))],
+            outline=0, fill=0,
+        )
+        painted = np.flatnonzero(np.asarray(probe)[:, 0] == 0)
+        return int(painted[0]), int(painted[-1]) + 1
+
+    def _paint_modules(self, row, first_module, pattern):
+        for offset, bit in enumerate(pattern):
+            if bit == '1':
+                start, end = self._module_columns[first_module + offset]
+                row[start:end] = 0
+
+    def _build_text_tiles(self, geometry):
+        # Font monospace: setiap digit selalu berada di posisi pena yang sama.
+        # Digit di posisi i dirender sendirian (sisanya spasi) dengan anchor
+        # dan koordinat yang sama seperti ImageWriter._paint_text.
+        font_size = int(mm2px(pt2mm(geometry.font_size), self.dpi))
+        if font_size <= 0:
+            return {}
+        font = ImageFont.truetype(geometry.font_path, font_size)
+        bars_start = geometry.quiet_zone
+        bars_end = bars_start + EAN13_MODULES * geometry.module_width
+        xpos = bars_start + (bars_end - bars_start) / 2.0
+        ypos = geometry.margin_top + geometry.module_height + geometry.text_distance
+        position = (mm2px(xpos, self.dpi), mm2px(ypos, self.dpi))
+
+        tiles = {}
+        for index in range(13):
+            for digit in range(10):
+                text = [' '] * 13
+                text[index] = str(digit)
+                canvas = Image.new('L', (self.width, self.height), 255)
+                ImageDraw.Draw(canvas).text(position, ''.join(text), font=font, fill=0, anchor='md')
+                pixels = np.asarray(canvas)
+                rows = np.flatnonzero((pixels < 255).any(axis=1))
+                cols = np.flatnonzero((pixels < 255).any(axis=0))
+                if not len(rows):
+                    continue
+                top, bottom = int(rows[0]), int(rows[-1]) + 1
+                left, right = int(cols[0]), int(cols[-1]) + 1
+                tiles[index, digit] = (top, bottom, left, right, pixels[top:bottom, left:right].copy())
+        return tiles
+
+    def render_pixels(self, barcode_number_str):
+        """Mengembalikan array uint8 (tinggi, lebar) untuk barcode 13 digit."""
+        # Seperti EAN13 python-barcode: batang dan teks memakai checksum yang dihitung ulang.
+        encoded = normalize_ean13(barcode_number_str)
+        parity = _ean.LEFT_PATTERN[int(encoded[0])]
+
+        row = self._guard_row.copy()
+        for slot in range(12):
+            encoding = parity[slot] if slot < 6 else 'C'
+            start, end, tile = self._digit_tiles[slot, encoding, int(encoded[slot + 1])]
+            np.minimum(row[start:end], tile, out=row[start:end])
+
+        pixels = np.full((self.height, self.width), 255, dtype=np.uint8)
+        top, bottom = self._bar_rows
+        pixels[top:bottom] = row
+
+        for index, digit in enumerate(encoded):
+            tile = self._text_tiles.get((index, int(digit)))
+            if tile is None:
+                continue
+            top, bottom, left, right, glyph = tile
+            target = pixels[top:bottom, left:right]
+            np.minimum(target, glyph, out=target)
+        return pixels
+
+    def render_png(self, barcode_number_str):
+        """Mengembalikan bytes PNG grayscale untuk barcode 13 digit."""
+        return self._encoder.encode(self.render_pixels(barcode_number_str))
+
+
+class CompactEAN13Rasterizer:
+    """
+    EAN-13 di ukuran piksel tepat `width` x `height` sebagai PNG 1-bit:
+    lebar modul bilangan bulat piksel (batang tetap tajam karena tidak ada
+    skala ulang), zona sepi di kiri-kanan dan 13 digit di bawah batang.
+    """
+
+    def __init__(self, width, height, dpi=COMPACT_IMAGE_DPI):
+        self.width = width
+        self.height = height
+        self.module_width = width // (EAN13_MODULES + 2 * _COMPACT_QUIET_MODULES)
+        if self.module_width < 1:
+            raise ValueError(f"Lebar gambar {width} piksel terlalu kecil untuk EAN-13.")
+        bars_width = EAN13_MODULES * self.module_width
+        self._bars_left = (width - bars_width) // 2
+        self._bars_right = self._bars_left + bars_width
+
+        margin = max(1, height // 22)
+        gap = max(1, height // 25)
+        baseline = height - margin
+        self._text_tiles, text_top = self._build_text_tiles(baseline, self.module_width * 2, height // 5)
+        self._bar_rows = (margin, text_top - gap)
+        if self._bar_rows[1] - self._bar_rows[0] < height // 3:
+            raise ValueError(f"Tinggi gambar {height} piksel terlalu kecil untuk EAN-13.")
+
+        # pHYs: ukuran cetak gambar sama dengan ukuran tampilannya di Excel.
+        pixels_per_meter = round(dpi / 0.0254)
+        self._phys_chunk = _png_chunk(b'pHYs', struct.pack('>IIB', pixels_per_meter, pixels_per_meter, 1))
+
+    def _build_text_tiles(self, baseline, side_margin, max_font_size):
+        font_path = BaseWriter(None, None, None, None).font_path
+        font_size = max_font_size
+        while font_size > 1:
+            font = ImageFont.truetype(font_path, font_size)
+            if font.getlength('0' * 13) <= self.width - 2 * side_margin:
+                break
+            font_size -= 1
+
+        # Font monospace: digit di posisi i dirender sendirian (sisanya
+        # spasi), lalu di-threshold menjadi hitam-putih.
+        tiles = {}
+        text_top = baseline
+        for index in range(13):
+            for digit in range(10):
+                text = [' '] * 13
+                text[index] = str(digit)
+                canvas = Image.new('L', (self.width, self.height), 255)
+                ImageDraw.Draw(canvas).text((self.width / 2, baseline), ''.join(text), font=font, fill=0,
+                                            anchor='ms')
+                white = np.asarray(canvas) >= _TEXT_THRESHOLD
+                rows = np.flatnonzero(~white.all(axis=1))
+                cols = np.flatnonzero(~white.all(axis=0))
+                if not len(rows):
+                    continue
+                top, bottom = int(rows[0]), int(rows[-1]) + 1
+                left, right = int(cols[0]), int(cols[-1]) + 1
+                tiles[index, digit] = (top, bottom, left, right, white[top:bottom, left:right].copy())
+                text_top = min(text_top, top)
+        return tiles, text_top
+
+    def render_pixels(self, barcode_number_str):
+        """Mengembalikan array bool (tinggi, lebar); True = putih."""
+        encoded = normalize_ean13(barcode_number_str)
+        modules = ean13_modules(encoded)
+        bars = np.frombuffer(modules.encode('ascii'), dtype=np.uint8) == ord('0')
+
+        pixels = np.ones((self.height, self.width), dtype=bool)
+        top, bottom = self._bar_rows
+        pixels[top:bottom, self._bars_left:self._bars_right] = np.repeat(bars, self.module_width)
+        for index, digit in enumerate(encoded):
+            tile = self._text_tiles.get((index, int(digit)))
+            if tile is None:
+                continue
+            top, bottom, left, right, glyph = tile
+            pixels[top:bottom, left:right] &= glyph
+        return pixels
+
+    def render_png(self, barcode_number_str):
+        """Mengembalikan bytes PNG grayscale 1-bit untuk barcode 13 digit."""
+        return encode_png_bilevel(self.render_pixels(barcode_number_str), extra_chunks=self._phys_chunk)
+
+
+@lru_cache(maxsize=4)
+def _cached_rasterizer(option_items):
+    return EAN13Rasterizer(dict(option_items))
+
+
+def get_rasterizer(writer_options):
+    """Rasterizer per proses untuk satu set opsi; tile dibangun sekali saja."""
+    return _cached_rasterizer(tuple(sorted(writer_options.items())))
+
+
+@lru_cache(maxsize=4)
+def get_compact_rasterizer(width, height):
+    """CompactEAN13Rasterizer per proses untuk satu ukuran gambar."""
+    return CompactEAN13Rasterizer(width, height)
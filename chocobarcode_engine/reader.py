@@ -0,0 +1,253 @@
+"""
+Pembaca input streaming.
+
+Baris dibaca bertahap dalam chunk berisi tuple (nama_produk, barcode_asli)
+sehingga memori tidak bergantung pada ukuran file, dan pandas tidak perlu
+diimpor sama sekali. Format ditentukan dari ekstensi file: .xlsx/.xlsm
+(openpyxl read-only), .csv/.txt, dan .parquet/.pq (butuh pyarrow).
+
+Jika `group_column` diisi (untuk output per grup), tuple-nya berisi nilai
+kolom itu sebagai elemen ketiga.
+"""
+import csv
+import os
+import pickle
+import tempfile
+
+from openpyxl import load_workbook
+
+from .config import BARCODE_COLUMN_NAME, PRODUCT_NAME_COLUMN_NAME
+from .errors import InputFileError
+
+DEFAULT_READ_CHUNK_SIZE = 5000
+INPUT_FORMATS = ('excel', 'csv', 'parquet')
+_CSV_DELIMITERS = (',', ';', '\t', '|')
+
+_FORMAT_BY_EXTENSION = {
+    '.csv': 'csv',
+    '.txt': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+
+
+def _cell_to_text(value):
+    # Sama seperti dtype=str di pandas: angka bulat yang tersimpan sebagai
+    # float (8.991234567891E12) ditulis tanpa '.0'. Sel kosong menjadi ''.
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _missing_columns_error(product_column, barcode_column, missing):
+    return InputFileError(
+        f"Kolom yang dibutuhkan tidak ditemukan di file input. Pastikan ada kolom "
+        f"'{barcode_column}' dan '{product_column}'. Detail: {missing}"
+    )
+
+
+def _group_column_error(group_column):
+    return InputFileError(f"Kolom grup '{group_column}' tidak ditemukan di file input.")
+
+
+def _column_positions(header, product_column, barcode_column, group_column=None):
+    header = [_cell_to_text(name) for name in header]
+    missing = [col for col in (product_column, barcode_column) if col not in header]
+    if missing:
+        raise _missing_columns_error(product_column, barcode_column, missing)
+    if group_column is None:
+        return header.index(product_column), header.index(barcode_column), None
+    if group_column not in header:
+        raise _group_column_error(group_column)
+    return header.index(product_column), header.index(barcode_column), header.index(group_column)
+
+
+def _rows_to_chunks(rows, product_index, barcode_index, group_index, chunk_size):
+    chunk = []
+    for row in rows:
+        if row is None or all(value is None or value == '' for value in row):
+            continue
+        product_name = _cell_to_text(row[product_index]) if product_index < len(row) else ''
+        original_barcode = _cell_to_text(row[barcode_index]) if barcode_index < len(row) else ''
+        if group_index is None:
+            chunk.append((product_name, original_barcode))
+        else:
+            group = _cell_to_text(row[group_index]) if group_index < len(row) else ''
+            chunk.append((product_name, original_barcode, group))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ExcelInput:
+    """Sheet pertama file Excel, dibaca dengan openpyxl mode read-only."""
+
+    def __init__(self, path, product_column, barcode_column, group_column=None):
+        self.path = path
+        self.product_column = product_column
+        self.barcode_column = barcode_column
+        self.group_column = group_column
+        # Header langsung diperiksa supaya kolom yang hilang ketahuan sebelum proses dimulai.
+        for _ in self._open_rows():
+            break
+
+    def _open_rows(self):
+        wb = load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            rows = wb.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                raise InputFileError(f"File Excel '{self.path}' kosong atau tidak memiliki data.")
+            positions = _column_positions(header, self.product_column, self.barcode_column, self.group_column)
+            yield positions, rows
+        finally:
+            wb.close()
+
+    def iter_chunks(self, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+        for positions, rows in self._open_rows():
+            yield from _rows_to_chunks(rows, *positions, chunk_size)
+
+
+class CsvInput:
+    """
+    File CSV ber-header (UTF-8, BOM Excel diabaikan); pemisah ditebak dari
+    header kecuali `delimiter` diisi (mis. file yang ditulis program sendiri).
+    """
+
+    def __init__(self, path, product_column, barcode_column, group_column=None, delimiter=None):
+        self.path = path
+        self.product_column = product_column
+        self.barcode_column = barcode_column
+        self.group_column = group_column
+        self.delimiter = delimiter
+        for _ in self._open_rows():
+            break
+
+    def _open_rows(self):
+        with open(self.path, newline='', encoding='utf-8-sig') as f:
+            delimiter = self.delimiter
+            if delimiter is None:
+                # Pemisah ditebak dari baris header saja: Excel versi Indonesia
+                # menyimpan CSV dengan ';', ekspor lain biasanya ','.
+                header_line = f.readline()
+                f.seek(0)
+                delimiter = max(_CSV_DELIMITERS, key=header_line.count)
+            rows = csv.reader(f, delimiter=delimiter)
+            header = next(rows, None)
+            if header is None:
+                raise InputFileError(f"File CSV '{self.path}' kosong atau tidak memiliki data.")
+            yield _column_positions(header, self.product_column, self.barcode_column, self.group_column), rows
+
+    def iter_chunks(self, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+        for positions, rows in self._open_rows():
+            yield from _rows_to_chunks(rows, *positions, chunk_size)
+
+
+class ParquetInput:
+    """File Parquet, dibaca per record batch dan hanya kolom yang dipakai."""
+
+    def __init__(self, path, product_column, barcode_column, group_column=None):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise InputFileError("Membaca file Parquet membutuhkan paket 'pyarrow'.")
+        self.path = path
+        self.product_column = product_column
+        self.barcode_column = barcode_column
+        self.group_column = group_column
+        self._parquet_file = pq.ParquetFile(path)
+        names = self._parquet_file.schema_arrow.names
+        missing = [col for col in (product_column, barcode_column) if col not in names]
+        if missing:
+            raise _missing_columns_error(product_column, barcode_column, missing)
+        if group_column is not None and group_column not in names:
+            raise _group_column_error(group_column)
+
+    def iter_chunks(self, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+        columns = [self.product_column, self.barcode_column]
+        if self.group_column is not None:
+            columns.append(self.group_column)
+        for batch in self._parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            products = batch.column(self.product_column).to_pylist()
+            barcodes = batch.column(self.barcode_column).to_pylist()
+            if self.group_column is None:
+                yield [(_cell_to_text(p), _cell_to_text(b)) for p, b in zip(products, barcodes)]
+            else:
+                groups = batch.column(self.group_column).to_pylist()
+                yield [(_cell_to_text(p), _cell_to_text(b), _cell_to_text(g))
+                       for p, b, g in zip(products, barcodes, groups)]
+
+
+_INPUT_CLASSES = {'excel': ExcelInput, 'csv': CsvInput, 'parquet': ParquetInput}
+
+
+def detect_input_format(path):
+    return _FORMAT_BY_EXTENSION.get(os.path.splitext(path)[1].lower(), 'excel')
+
+
+def open_input(input_file, product_column=PRODUCT_NAME_COLUMN_NAME, barcode_column=BARCODE_COLUMN_NAME,
+               input_format=None, group_column=None, csv_delimiter=None):
+    """
+    Membuka file input dan memeriksa header-nya. Hasilnya punya
+    iter_chunks(chunk_size) yang bisa dipanggil berkali-kali (setiap
+    panggilan membaca ulang file dari awal). `csv_delimiter` memaksa
+    pemisah CSV (None = ditebak dari header).
+    """
+    input_format = input_format or detect_input_format(input_file)
+    if input_format not in _INPUT_CLASSES:
+        raise InputFileError(f"Format input '{input_format}' tidak dikenal. Pilihan: {', '.join(INPUT_FORMATS)}")
+    if not os.path.exists(input_file):
+        raise InputFileError(f"File input '{input_file}' tidak ditemukan.")
+    if input_format == 'csv':
+        return CsvInput(input_file, product_column, barcode_column, group_column, csv_delimiter)
+    return _INPUT_CLASSES[input_format](input_file, product_column, barcode_column, group_column)
+
+
+class RowSpool:
+    """
+    Salinan sementara chunk input di file temporer (pickle per chunk).
+
+    Pipeline butuh dua lintasan (semua barcode valid harus dicadangkan dulu
+    sebelum alokasi). Parsing xlsx adalah bagian paling lambat, jadi lintasan
+    pertama menyimpan chunk yang sudah diparsing di sini dan lintasan kedua
+    cukup membacanya kembali; memori tetap sebatas satu chunk.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._chunk_count = 0
+
+    def append(self, chunk):
+        pickle.dump(chunk, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._chunk_count += 1
+
+    def iter_chunks(self):
+        self._file.seek(0)
+        for _ in range(self._chunk_count):
+            yield pickle.load(self._file)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_input_rows(input_file, product_column=PRODUCT_NAME_COLUMN_NAME, barcode_column=BARCODE_COLUMN_NAME,
+                    input_format=None):
+    """
+    Membaca seluruh file input menjadi list (nama_produk, barcode_asli).
+    Untuk file besar gunakan open_input(...).iter_chunks() agar memori tetap kecil.
+    """
+    source = open_input(input_file, product_column, barcode_column, input_format)
+    rows = []
+    for chunk in source.iter_chunks():
+        rows.extend(chunk)
+    return rows
@@ -0,0 +1,201 @@
+"""
+Registry barcode persisten (SQLite).
+
+Menyimpan setiap barcode yang pernah dikeluarkan (dan barcode input yang
+berada di dalam rentang prefix kita) supaya keunikan berlaku lintas run,
+bukan hanya per file. Kolom `code` adalah INTEGER PRIMARY KEY sehingga
+pengecekan keanggotaan selalu lewat indeks B-tree.
+"""
+import sqlite3
+import threading
+import time
+from math import gcd
+
+from .ean13 import calculate_ean13_checksum
+from .errors import ChocobarcodeError
+
+ALLOCATION_MODES = ('sequential', 'permuted')
+_IN_QUERY_BATCH = 500
+
+
+class AllocationError(ChocobarcodeError):
+    """Prefix tidak valid atau rentang barcode-nya sudah habis."""
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class BarcodeRegistry:
+    """Daftar barcode yang sudah terpakai, disimpan di file SQLite (atau ':memory:')."""
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        # isolation_level=None: transaksi diatur manual dengan BEGIN IMMEDIATE
+        # agar dua proses yang memakai registry yang sama tidak membagikan
+        # barcode yang sama.
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        # Satu koneksi boleh dipakai beberapa thread (mis. job server); setiap
+        # method menjalankan transaksinya sendiri di bawah lock ini. RLock
+        # karena reserve() memanggil existing().
+        self._lock = threading.RLock()
+        self._conn.execute('PRAGMA journal_mode=WAL' if path != ':memory:' else 'PRAGMA journal_mode=MEMORY')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS barcodes (
+                code INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                issued_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS prefix_cursors (
+                prefix TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (prefix, mode)
+            );
+        """)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM barcodes').fetchone()[0]
+
+    def __contains__(self, barcode):
+        with self._lock:
+            row = self._conn.execute('SELECT 1 FROM barcodes WHERE code = ?', (int(barcode),)).fetchone()
+            return row is not None
+
+    def existing(self, barcodes):
+        """Mengembalikan subset `barcodes` (string) yang sudah ada di registry."""
+        with self._lock:
+            found = set()
+            codes = [int(barcode) for barcode in barcodes]
+            for batch in _chunks(codes, _IN_QUERY_BATCH):
+                placeholders = ','.join('?' * len(batch))
+                rows = self._conn.execute(f'SELECT code FROM barcodes WHERE code IN ({placeholders})', batch)
+                found.update(str(code).zfill(13) for (code,) in rows)
+            return found
+
+    def register(self, barcodes, source='generated'):
+        """Mencatat barcode sebagai terpakai (yang sudah ada diabaikan)."""
+        with self._lock:
+            now = time.time()
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO barcodes (code, source, issued_at) VALUES (?, ?, ?)',
+                    ((int(barcode), source, now) for barcode in barcodes),
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def claim(self, barcode, source='generated'):
+        """
+        Mencatat satu barcode dalam transaksinya sendiri. False jika barcode
+        itu ternyata sudah tercatat (mis. baru saja diklaim job lain).
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                cursor = self._conn.execute(
+                    'INSERT OR IGNORE INTO barcodes (code, source, issued_at) VALUES (?, ?, ?)',
+                    (int(barcode), source, time.time()),
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            return cursor.rowcount == 1
+
+    def reserve(self, prefix, count, mode='sequential'):
+        """
+        Mengeluarkan sampai `count` barcode baru dari rentang `prefix` dalam satu
+        transaksi dan mencatatnya. Setiap posisi di rentang hanya dikunjungi
+        sekali sepanjang umur registry (kursor disimpan), jadi biayanya tetap
+        datar walaupun rentang sudah hampir penuh. Bisa mengembalikan kurang
+        dari `count` jika rentang habis.
+        """
+        with self._lock:
+            space = PrefixSpace(prefix, mode)
+            issued = []
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    'SELECT position FROM prefix_cursors WHERE prefix = ? AND mode = ?', (prefix, mode)
+                ).fetchone()
+                position = row[0] if row else 0
+
+                while len(issued) < count and position < space.capacity:
+                    # Sedikit lebih banyak dari yang dibutuhkan, untuk menutup
+                    # posisi yang ternyata sudah dipakai barcode input.
+                    end = min(space.capacity, position + (count - len(issued)) + 16)
+                    candidates = [space.barcode_at(p) for p in range(position, end)]
+                    already_used = self.existing(candidates)
+                    for candidate in candidates:
+                        position += 1
+                        if candidate not in already_used:
+                            issued.append(candidate)
+                            if len(issued) == count:
+                                break
+
+                now = time.time()
+                self._conn.executemany(
+                    'INSERT INTO barcodes (code, source, issued_at) VALUES (?, ?, ?)',
+                    ((int(barcode), 'generated', now) for barcode in issued),
+                )
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO prefix_cursors (prefix, mode, position) VALUES (?, ?, ?)',
+                    (prefix, mode, position),
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            return issued
+
+
+class PrefixSpace:
+    """
+    Rentang barcode untuk satu prefix (mis. GS1 company prefix). Posisi ke-i
+    dipetakan ke item reference: apa adanya untuk 'sequential', atau lewat
+    permutasi afin (a*i + b) mod kapasitas untuk 'permuted' sehingga barcode
+    yang berurutan keluar tidak bernomor berurutan.
+    """
+
+    def __init__(self, prefix, mode='sequential'):
+        if not prefix.isdigit() or not 1 <= len(prefix) <= 11:
+            raise AllocationError(f"Prefix '{prefix}' tidak valid: harus 1-11 digit angka.")
+        if mode not in ALLOCATION_MODES:
+            raise AllocationError(f"Mode alokasi '{mode}' tidak dikenal. Pilihan: {', '.join(ALLOCATION_MODES)}")
+        self.prefix = prefix
+        self.mode = mode
+        self.item_digits = 12 - len(prefix)
+        self.capacity = 10 ** self.item_digits
+
+        # Pengali harus koprima dengan 10^k agar pemetaan tetap bijektif.
+        multiplier = int(self.capacity * 0.6180339887) | 1
+        while gcd(multiplier, self.capacity) != 1:
+            multiplier += 2
+        self._multiplier = multiplier
+        self._offset = int(prefix) % self.capacity
+
+    def barcode_at(self, position):
+        if self.mode == 'permuted':
+            item = (self._multiplier * position + self._offset) % self.capacity
+        else:
+            item = position
+        first12 = self.prefix + str(item).zfill(self.item_digits)
+        return first12 + str(calculate_ean13_checksum(first12))
+
+    def contains(self, barcode):
+        return barcode.startswith(self.prefix)
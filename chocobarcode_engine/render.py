@@ -0,0 +1,162 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from barcode.ean import EAN13
+from barcode.writer import ImageWriter
+
+from .cache import render_namespace
+from .config import BARCODE_WRITER_OPTIONS, IMAGE_HEIGHT_PIXELS, IMAGE_WIDTH_PIXELS
+from .raster import get_compact_rasterizer, get_rasterizer
+
+DEFAULT_RENDER_CHUNK_SIZE = 64
+
+# 'fast' menyusun gambar dari tile yang di-cache (lihat raster.py), 'pil'
+# memakai ImageWriter python-barcode seperti versi lama. Keduanya identik per piksel.
+# 'compact' merender langsung di ukuran tampilan 250x180 sebagai PNG 1-bit
+# (tata letak sendiri, bukan ImageWriter), beberapa kali lebih kecil.
+RENDERERS = ('fast', 'pil', 'compact')
+DEFAULT_RENDERER = 'fast'
+# Naikkan jika byte PNG yang dihasilkan berubah, agar cache render lama tidak terpakai.
+RENDERER_VERSION = 1
+
+
+def generate_ean13_image_buffer(barcode_number_str):
+    """
+    Membuat gambar barcode dan mengembalikannya sebagai buffer memori.
+    """
+    ean = EAN13(barcode_number_str, writer=ImageWriter())
+    buffer = BytesIO()
+    ean.write(buffer, dict(BARCODE_WRITER_OPTIONS, text=barcode_number_str))
+    buffer.seek(0)
+    return buffer
+
+
+def render_ean13_png(barcode_number_str, renderer=DEFAULT_RENDERER):
+    """Render satu barcode dan mengembalikan bytes PNG-nya."""
+    if renderer == 'fast':
+        return get_rasterizer(BARCODE_WRITER_OPTIONS).render_png(barcode_number_str)
+    if renderer == 'compact':
+        return get_compact_rasterizer(IMAGE_WIDTH_PIXELS, IMAGE_HEIGHT_PIXELS).render_png(barcode_number_str)
+    return generate_ean13_image_buffer(barcode_number_str).getvalue()
+
+
+def _render_chunk(barcodes, renderer):
+    # Dijalankan di proses worker. Error per barcode dikembalikan, bukan
+    # dilempar, agar satu barcode rusak tidak menggagalkan satu chunk penuh.
+    results = []
+    for barcode_number_str in barcodes:
+        try:
+            results.append((render_ean13_png(barcode_number_str, renderer), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def resolve_worker_count(workers):
+    """0 atau None berarti pakai semua core CPU."""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+class BarcodeRenderer:
+    """
+    Merender banyak barcode menjadi bytes PNG.
+
+    Dengan workers > 1, chunk barcode dirender di process pool (selesai tidak
+    berurutan) tetapi hasilnya selalu dikembalikan sesuai urutan input, jadi
+    penulis workbook tetap menerima baris dalam urutan aslinya. Jumlah chunk
+    yang sedang dikerjakan dibatasi agar memori tidak tumbuh dengan ukuran file.
+
+    Jika diberi `cache` (RenderCache), barcode yang sudah ada di cache tidak
+    dirender lagi; hanya yang belum ada yang dikirim ke worker, dan hasilnya
+    disimpan ke cache dari proses utama. `prerendered` (mis. gambar dari
+    output sebelumnya) punya get_many(barcodes) dan diperiksa lebih dulu.
+
+    `executor` (ProcessPoolExecutor yang sudah berjalan, mis. milik job
+    server) dipakai menggantikan pool baru dan tidak dimatikan oleh close().
+    """
+
+    def __init__(self, workers=1, chunk_size=DEFAULT_RENDER_CHUNK_SIZE, renderer=DEFAULT_RENDERER, cache=None,
+                 prerendered=None, executor=None):
+        if renderer not in RENDERERS:
+            raise ValueError(f"Renderer '{renderer}' tidak dikenal. Pilihan: {', '.join(RENDERERS)}")
+        self.renderer = renderer
+        self.workers = resolve_worker_count(workers)
+        self.chunk_size = max(1, chunk_size)
+        self.max_in_flight = self.workers * 2
+        self.cache = cache
+        self.prerendered = prerendered
+        self._cache_namespace = render_namespace(renderer, RENDERER_VERSION) if cache is not None else None
+        # Jumlah gambar yang benar-benar dirender (bukan dari cache / output lama).
+        self.rendered = 0
+        self._executor = executor
+        self._owns_executor = False
+
+    def __enter__(self):
+        if self._executor is None and self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._owns_executor = True
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._owns_executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._owns_executor = False
+        self._executor = None
+
+    def render_many(self, barcodes):
+        """
+        Menghasilkan (png_bytes, error) untuk setiap barcode, sesuai urutan input.
+        `barcodes` boleh berupa generator; hanya dibaca secukupnya di depan.
+        """
+        max_in_flight = self.max_in_flight if self._executor is not None else 1
+        pending = deque()
+        for chunk in _chunked(barcodes, self.chunk_size):
+            pending.append(self._submit(chunk))
+            if len(pending) >= max_in_flight:
+                yield from self._collect(*pending.popleft())
+        while pending:
+            yield from self._collect(*pending.popleft())
+
+    def _submit(self, chunk):
+        cached = self.prerendered.get_many(chunk) if self.prerendered is not None else {}
+        if self.cache is not None:
+            cached.update(self.cache.get_many(self._cache_namespace, [code for code in chunk if code not in cached]))
+        misses = [code for code in chunk if code not in cached]
+        self.rendered += len(misses)
+        if not misses:
+            rendered = []
+        elif self._executor is None:
+            rendered = _render_chunk(misses, self.renderer)
+        else:
+            rendered = self._executor.submit(_render_chunk, misses, self.renderer)
+        return chunk, cached, misses, rendered
+
+    def _collect(self, chunk, cached, misses, rendered):
+        if not isinstance(rendered, list):
+            rendered = rendered.result()
+        fresh = dict(zip(misses, rendered))
+        if self.cache is not None and fresh:
+            self.cache.put_many(
+                self._cache_namespace,
+                [(code, png) for code, (png, error) in fresh.items() if error is None],
+            )
+        for code in chunk:
+            yield (cached[code], None) if code in cached else fresh[code]
@@ -0,0 +1,164 @@
+"""
+Pengukuran waktu per tahap dan laporan run.
+
+Pipeline berjalan sebagai rantai generator, jadi tahap-tahapnya saling
+bersilangan per baris (render menarik baris dari alokasi, alokasi menarik
+chunk dari pembacaan input). RunStats mencatat waktu *eksklusif* setiap
+tahap: waktu yang dihabiskan tahap dalam (mis. baca input di dalam
+alokasi) dikurangkan dari tahap luarnya, sehingga jumlah semua tahap
+ditambah 'lainnya' sama dengan total waktu run.
+"""
+import json
+import sys
+import time
+
+# Urutan tahap sesuai alur pipeline.
+STAGES = ('read', 'validate', 'allocate', 'render', 'embed', 'save')
+STAGE_LABELS = {
+    'read': 'baca input',
+    'validate': 'validasi',
+    'allocate': 'alokasi',
+    'render': 'render gambar',
+    'embed': 'sisip gambar',
+    'save': 'simpan',
+    'other': 'lainnya',
+}
+
+
+class _Stage:
+    __slots__ = ('stats', 'name', 'started', 'child_seconds')
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.child_seconds = 0.0
+        self.stats._stack.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        stack = self.stats._stack
+        stack.pop()
+        self.stats.stage_seconds[self.name] += elapsed - self.child_seconds
+        if stack:
+            stack[-1].child_seconds += elapsed
+
+
+class RunStats:
+    """Timer per tahap untuk satu run. Hanya dipakai dari satu thread."""
+
+    def __init__(self):
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self._stack = []
+        self.started = time.perf_counter()
+
+    def stage(self, name):
+        """Context manager yang menambahkan waktu blok ini ke tahap `name`."""
+        return _Stage(self, name)
+
+    def timed_iter(self, name, iterable):
+        """Membungkus iterable; waktu untuk menghasilkan setiap item dicatat ke tahap `name`."""
+        iterator = iter(iterable)
+        stage = _Stage(self, name)
+        while True:
+            with stage:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def report(self, rows, workers_exited=True):
+        """
+        Dict laporan waktu: detik per tahap, throughput dan puncak memori.
+
+        'peak_rss_workers_bytes' hanya mencakup proses anak yang sudah
+        selesai, dan merupakan puncak sepanjang umur proses ini (termasuk
+        run sebelumnya). Jika worker run ini masih hidup setelah run selesai
+        (`workers_exited=False`, mis. pool milik job server), nilainya tidak
+        menggambarkan run ini dan kuncinya tidak disertakan.
+        """
+        elapsed = self.elapsed()
+        stages = {name: round(seconds, 3) for name, seconds in self.stage_seconds.items()}
+        stages['other'] = round(max(0.0, elapsed - sum(self.stage_seconds.values())), 3)
+        report = {
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(rows / elapsed, 1) if elapsed > 0 else None,
+            'stages': stages,
+            'peak_rss_bytes': peak_rss_bytes(),
+        }
+        if workers_exited:
+            report['peak_rss_workers_bytes'] = peak_rss_bytes(children=True)
+        return report
+
+
+def _windows_peak_rss():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    try:
+        ok = ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb,
+        )
+    except (AttributeError, OSError):
+        return None
+    return counters.PeakWorkingSetSize if ok else None
+
+
+def peak_rss_bytes(children=False):
+    """
+    Puncak memori (RSS) proses ini sejak dijalankan, dalam byte. Dengan
+    children=True: puncak proses anak yang sudah selesai dan sudah di-wait
+    (worker render yang pool-nya sudah ditutup), hanya tersedia di Unix.
+    Worker yang masih hidup tidak terhitung. None jika tidak bisa dibaca.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None if children else _windows_peak_rss()
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss dalam KB di Linux, dalam byte di macOS.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def format_report(performance):
+    """Ringkasan laporan waktu dalam beberapa baris teks untuk log / GUI."""
+    stages = ', '.join(
+        f"{STAGE_LABELS[name]} {seconds:.2f}s" for name, seconds in performance['stages'].items() if seconds >= 0.005
+    )
+    lines = [f"Waktu total {performance['elapsed_seconds']:.2f}s ({performance['rows_per_second'] or 0:,.0f} baris/detik)"]
+    if stages:
+        lines.append(f"Per tahap: {stages}")
+    if performance['peak_rss_bytes']:
+        lines.append(f"Memori puncak: {performance['peak_rss_bytes'] / (1024 * 1024):.0f} MB")
+    return lines
+
+
+def write_run_report(summary, path):
+    """Menyimpan ringkasan run (termasuk laporan waktu) sebagai file JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+        f.write('\n')
@@ -0,0 +1,608 @@
+"""
+Job server lokal (HTTP) untuk tool lain yang butuh barcode sesuai permintaan.
+
+    python -m chocobarcode_engine.server --port 8765 -j 2 --registry barcode.sqlite
+
+Server menyimpan process pool render yang sudah hangat dan registry barcode
+tetap terbuka, jadi setiap job tidak lagi membayar import, start proses
+worker dan pembukaan registry. Barcode baru unik lintas semua job (registry
+di memori jika --registry tidak diisi).
+
+Endpoint (JSON kecuali hasil dan gambar):
+
+    POST   /jobs                 isi body: file .xlsx/.csv/.parquet (Content-Type
+                                 sesuai, opsi lewat query ?format=pdf&seed=1) atau
+                                 JSON {"rows": [{"product": .., "barcode": ..}], "format": ..}
+    GET    /jobs                 daftar job
+    GET    /jobs/<id>            status, progress dan ringkasan
+    GET    /jobs/<id>/result     file output (setelah status 'done')
+    DELETE /jobs/<id>            hapus job yang sudah selesai beserta filenya
+    GET    /barcode/<kode>.png   satu gambar barcode (.svg untuk vektor)
+    GET    /health
+
+Antrean job dibatasi (--max-queued); jika penuh, POST /jobs dijawab 503
+dengan Retry-After. Hanya --max-running job yang diproses bersamaan dan
+upload ditulis langsung ke disk, jadi lonjakan permintaan tidak menumpuk
+di memori.
+"""
+import argparse
+import copy
+import csv
+import json
+import os
+import queue
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .cache import DEFAULT_CACHE_MAX_BYTES, default_cache_path
+from .config import BARCODE_COLUMN_NAME, OUTPUT_FILE_NAME, OUTPUT_FORMATS, PRODUCT_NAME_COLUMN_NAME
+from .ean13 import generate_valid_ean13_string
+from .errors import ChocobarcodeError
+from .pipeline import GenerateOptions, generate_barcode_workbook
+from .registry import ALLOCATION_MODES, BarcodeRegistry
+from .render import DEFAULT_RENDER_CHUNK_SIZE, DEFAULT_RENDERER, RENDERERS, render_ean13_png, resolve_worker_count
+from .vector import EAN13Geometry, svg_document
+from .writer import output_file_name
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_QUEUED_JOBS = 16
+DEFAULT_MAX_RUNNING_JOBS = 1
+DEFAULT_MAX_UPLOADS = 4
+DEFAULT_MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+# Job selesai yang disimpan (beserta file hasilnya); yang paling lama dihapus lebih dulu.
+DEFAULT_MAX_FINISHED_JOBS = 100
+RETRY_AFTER_SECONDS = 5
+_COPY_BUFFER_SIZE = 64 * 1024
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed', 'cancelled')
+_FINISHED_STATUSES = ('done', 'failed', 'cancelled')
+
+_INPUT_FORMAT_BY_CONTENT_TYPE = {
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': 'excel',
+    'text/csv': 'csv',
+    'application/vnd.apache.parquet': 'parquet',
+    'application/x-parquet': 'parquet',
+}
+_INPUT_EXTENSIONS = {'excel': '.xlsx', 'csv': '.csv', 'parquet': '.parquet'}
+_RESULT_CONTENT_TYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'pdf': 'application/pdf',
+    'svg': 'application/zip',
+    'png': 'application/zip',
+}
+
+
+class JobRejected(ChocobarcodeError):
+    """Permintaan job ditolak; `status` adalah kode HTTP jawabannya."""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+class Job:
+    """Satu permintaan generate beserta status dan progress-nya."""
+
+    def __init__(self, directory, input_file, input_format, output_format, seed=None,
+                 product_column=PRODUCT_NAME_COLUMN_NAME, barcode_column=BARCODE_COLUMN_NAME, csv_delimiter=None):
+        self.id = os.path.basename(directory)
+        self.directory = directory
+        self.input_file = input_file
+        self.input_format = input_format
+        self.csv_delimiter = csv_delimiter
+        self.output_format = output_format
+        self.seed = seed
+        self.product_column = product_column
+        self.barcode_column = barcode_column
+        self.output_file = os.path.join(directory, output_file_name(OUTPUT_FILE_NAME, output_format))
+        self.status = 'queued'
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.progress = (0, None)
+        self.summary = None
+        self.error = None
+
+    def report_progress(self, done, total):
+        self.progress = (done, total)
+
+    def to_dict(self):
+        done, total = self.progress
+        return {
+            'id': self.id,
+            'status': self.status,
+            'output_format': self.output_format,
+            'progress': {'done': done, 'total': total},
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'error': self.error,
+            'summary': self.summary,
+            'result_url': f'/jobs/{self.id}/result' if self.status == 'done' else None,
+        }
+
+
+def _warm_up_worker(renderer=DEFAULT_RENDERER):
+    # Dijalankan sekali per proses worker: import engine dan tile raster.
+    render_ean13_png('0000000000000', renderer)
+    return os.getpid()
+
+
+class JobServer:
+    """
+    Inti server tanpa HTTP: antrean job, thread pemroses, pool render dan
+    registry bersama. `options` (GenerateOptions) adalah template opsi
+    untuk semua job; format output, seed dan nama kolom bisa diatur per job.
+    """
+
+    def __init__(self, options=None, job_root=None, max_queued_jobs=DEFAULT_MAX_QUEUED_JOBS,
+                 max_running_jobs=DEFAULT_MAX_RUNNING_JOBS, max_finished_jobs=DEFAULT_MAX_FINISHED_JOBS,
+                 max_uploads=DEFAULT_MAX_UPLOADS, max_upload_bytes=DEFAULT_MAX_UPLOAD_BYTES, log_callback=None):
+        self.options = copy.copy(options or GenerateOptions())
+        self.options.workers = resolve_worker_count(self.options.workers)
+        self.max_finished_jobs = max_finished_jobs
+        self.max_upload_bytes = max_upload_bytes
+        self.log = log_callback or (lambda message: None)
+        self._owns_job_root = job_root is None
+        self.job_root = job_root or tempfile.mkdtemp(prefix='chocobarcode-server-')
+        os.makedirs(self.job_root, exist_ok=True)
+
+        # Registry tetap terbuka selama server hidup dan dipakai bersama oleh
+        # semua job, sehingga barcode baru tidak pernah dikeluarkan dua kali.
+        self.registry = BarcodeRegistry(self.options.registry_path or ':memory:')
+        self.executor = None
+        if self.options.workers > 1:
+            # Pool dibuat (dan semua worker dijalankan) sebelum thread lain
+            # ada, supaya fork tidak terjadi di tengah server yang multi-thread.
+            self.executor = ProcessPoolExecutor(max_workers=self.options.workers)
+            for future in [self.executor.submit(_warm_up_worker, self.options.renderer)
+                           for _ in range(self.options.workers)]:
+                future.result()
+        else:
+            _warm_up_worker(self.options.renderer)
+        self._geometry = EAN13Geometry()
+
+        self._queue = queue.Queue(maxsize=max_queued_jobs)
+        self._upload_slots = threading.BoundedSemaphore(max_uploads)
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._runners = [
+            threading.Thread(target=self._run_jobs, name=f'chocobarcode-job-{number}', daemon=True)
+            for number in range(max(1, max_running_jobs))
+        ]
+        for runner in self._runners:
+            runner.start()
+
+    # --- Job ---
+
+    def new_job_directory(self):
+        directory = os.path.join(self.job_root, uuid.uuid4().hex)
+        os.makedirs(directory)
+        return directory
+
+    def acquire_upload_slot(self):
+        """Slot upload bersamaan; JobRejected (503) jika semua terpakai atau antrean penuh."""
+        if self._queue.full() or not self._upload_slots.acquire(blocking=False):
+            raise JobRejected("Server sedang penuh, coba lagi nanti.", HTTPStatus.SERVICE_UNAVAILABLE)
+
+    def release_upload_slot(self):
+        self._upload_slots.release()
+
+    def submit(self, job):
+        """Memasukkan job ke antrean; JobRejected (503) jika antrean penuh."""
+        with self._jobs_lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                shutil.rmtree(job.directory, ignore_errors=True)
+                raise JobRejected("Antrean job penuh, coba lagi nanti.", HTTPStatus.SERVICE_UNAVAILABLE)
+            self._jobs[job.id] = job
+        self.log(f"Job {job.id} masuk antrean ({job.output_format}).")
+        return job
+
+    def get_job(self, job_id):
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        with self._jobs_lock:
+            return list(self._jobs.values())
+
+    def delete_job(self, job_id):
+        """Menghapus job yang sudah selesai; False jika job belum selesai."""
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in _FINISHED_STATUSES:
+                return False
+            del self._jobs[job_id]
+        shutil.rmtree(job.directory, ignore_errors=True)
+        return True
+
+    def stats(self):
+        with self._jobs_lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return dict({status: statuses.count(status) for status in JOB_STATUSES}, workers=self.options.workers)
+
+    def _run_jobs(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if job.status == 'queued':
+                self._run(job)
+            self._evict_finished_jobs()
+
+    def _run(self, job):
+        options = copy.copy(self.options)
+        options.output_format = job.output_format
+        options.seed = job.seed
+        options.product_column = job.product_column
+        options.barcode_column = job.barcode_column
+        options.input_format = job.input_format
+        options.csv_delimiter = job.csv_delimiter
+        job.status = 'running'
+        job.started = time.time()
+        self.log(f"Job {job.id} mulai diproses.")
+        try:
+            job.summary = generate_barcode_workbook(
+                job.input_file, job.output_file, options,
+                progress_callback=job.report_progress, registry=self.registry, executor=self.executor,
+            )
+            job.status = 'done'
+        except (ChocobarcodeError, ValueError) as e:
+            job.error = str(e)
+            job.status = 'failed'
+        except Exception as e:
+            job.error = f"Terjadi kesalahan: {e}"
+            job.status = 'failed'
+        finally:
+            job.finished = time.time()
+            # File input tidak dibutuhkan lagi setelah job selesai.
+            if os.path.exists(job.input_file):
+                os.remove(job.input_file)
+        self.log(f"Job {job.id} {job.status} dalam {job.finished - job.started:.2f}s"
+                 + (f": {job.error}" if job.error else "."))
+
+    def _evict_finished_jobs(self):
+        with self._jobs_lock:
+            finished = [job for job in self._jobs.values() if job.status in _FINISHED_STATUSES]
+            evicted = finished[:max(0, len(finished) - self.max_finished_jobs)]
+            for job in evicted:
+                del self._jobs[job.id]
+        for job in evicted:
+            shutil.rmtree(job.directory, ignore_errors=True)
+
+    # --- Satu barcode ---
+
+    def render_single(self, barcode_number_str, image_format):
+        """(content_type, bytes) untuk satu barcode (12 digit dilengkapi checksum)."""
+        barcode = generate_valid_ean13_string(barcode_number_str)
+        if not barcode:
+            raise JobRejected(f"Barcode '{barcode_number_str}' bukan EAN-13 yang valid.")
+        if image_format == 'png':
+            return 'image/png', render_ean13_png(barcode, self.options.renderer)
+        if image_format == 'svg':
+            return 'image/svg+xml', svg_document(self._geometry, barcode).encode('utf-8')
+        raise JobRejected(f"Format gambar '{image_format}' tidak dikenal. Pilihan: png, svg", HTTPStatus.NOT_FOUND)
+
+    def close(self):
+        """Membatalkan job yang masih antre, menunggu job yang berjalan, lalu menutup pool dan registry."""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.status = 'cancelled'
+        for _ in self._runners:
+            self._queue.put(None)
+        for runner in self._runners:
+            runner.join()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+        self.registry.close()
+        if self._owns_job_root:
+            shutil.rmtree(self.job_root, ignore_errors=True)
+
+
+def _rows_from_json(document):
+    """Baris (nama_produk, barcode) dari body JSON: list atau {"rows": [...]}."""
+    rows = document.get('rows') if isinstance(document, dict) else document
+    if not isinstance(rows, list) or not rows:
+        raise JobRejected("Body JSON harus berisi daftar baris di 'rows'.")
+    for row in rows:
+        if isinstance(row, dict):
+            product = row.get('product', row.get(PRODUCT_NAME_COLUMN_NAME, ''))
+            barcode = row.get('barcode', row.get(BARCODE_COLUMN_NAME, ''))
+        elif isinstance(row, (list, tuple)) and len(row) == 2:
+            product, barcode = row
+        else:
+            raise JobRejected("Setiap baris harus berupa objek {product, barcode} atau [product, barcode].")
+        yield '' if product is None else str(product), '' if barcode is None else str(barcode)
+
+
+def _job_parameters(source):
+    """Opsi per job dari query string (dict nama -> nilai) atau body JSON."""
+    output_format = source.get('format') or 'xlsx'
+    if output_format not in OUTPUT_FORMATS:
+        raise JobRejected(f"Format output '{output_format}' tidak dikenal. Pilihan: {', '.join(OUTPUT_FORMATS)}")
+    seed = source.get('seed')
+    try:
+        seed = int(seed) if seed not in (None, '') else None
+    except (TypeError, ValueError):
+        raise JobRejected(f"Seed harus bilangan bulat, diterima '{seed}'.")
+    return {
+        'output_format': output_format,
+        'seed': seed,
+        'product_column': source.get('product_column') or PRODUCT_NAME_COLUMN_NAME,
+        'barcode_column': source.get('barcode_column') or BARCODE_COLUMN_NAME,
+    }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = 'Chocobarcode'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def jobs(self):
+        return self.server.job_server
+
+    def log_message(self, format, *args):
+        self.jobs.log(f"{self.address_string()} {format % args}")
+
+    # --- Jawaban ---
+
+    def _send_json(self, status, document, headers=()):
+        body = json.dumps(document, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        headers = [('Retry-After', str(RETRY_AFTER_SECONDS))] if status == HTTPStatus.SERVICE_UNAVAILABLE else []
+        self._send_json(status, {'error': message}, headers)
+
+    def _send_bytes(self, content_type, body):
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'max-age=86400')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_file(self, path, content_type):
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(os.path.getsize(path)))
+        self.send_header('Content-Disposition', f'attachment; filename="{os.path.basename(path)}"')
+        self.end_headers()
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile, _COPY_BUFFER_SIZE)
+
+    def _handle(self, route):
+        try:
+            route()
+        except JobRejected as e:
+            # Body upload yang ditolak mungkin belum (habis) dibaca.
+            if self.command == 'POST':
+                self.close_connection = True
+            self._send_error(e.status, str(e))
+        except Exception as e:
+            self.close_connection = True
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Terjadi kesalahan: {e}")
+
+    # --- Routing ---
+
+    def _path_parts(self):
+        return [part for part in urlsplit(self.path).path.split('/') if part]
+
+    def do_GET(self):
+        self._handle(self._get)
+
+    def do_POST(self):
+        self._handle(self._post)
+
+    def do_DELETE(self):
+        self._handle(self._delete)
+
+    def _get(self):
+        parts = self._path_parts()
+        if parts == ['health']:
+            self._send_json(HTTPStatus.OK, dict(self.jobs.stats(), status='ok'))
+        elif parts == ['jobs']:
+            self._send_json(HTTPStatus.OK, {'jobs': [job.to_dict() for job in self.jobs.list_jobs()]})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            self._send_json(HTTPStatus.OK, self._job(parts[1]).to_dict())
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'result':
+            job = self._job(parts[1])
+            if job.status != 'done':
+                raise JobRejected(f"Job belum selesai (status: {job.status}).", HTTPStatus.CONFLICT)
+            self._send_file(job.output_file, _RESULT_CONTENT_TYPES[job.output_format])
+        elif len(parts) == 2 and parts[0] == 'barcode' and '.' in parts[1]:
+            code, image_format = parts[1].rsplit('.', 1)
+            self._send_bytes(*self.jobs.render_single(code, image_format))
+        else:
+            raise JobRejected("Endpoint tidak ditemukan.", HTTPStatus.NOT_FOUND)
+
+    def _delete(self):
+        parts = self._path_parts()
+        if len(parts) != 2 or parts[0] != 'jobs':
+            raise JobRejected("Endpoint tidak ditemukan.", HTTPStatus.NOT_FOUND)
+        self._job(parts[1])
+        if not self.jobs.delete_job(parts[1]):
+            raise JobRejected("Job yang masih antre atau berjalan tidak bisa dihapus.", HTTPStatus.CONFLICT)
+        self._send_json(HTTPStatus.OK, {'deleted': parts[1]})
+
+    def _job(self, job_id):
+        job = self.jobs.get_job(job_id)
+        if job is None:
+            raise JobRejected(f"Job '{job_id}' tidak ditemukan.", HTTPStatus.NOT_FOUND)
+        return job
+
+    def _post(self):
+        if self._path_parts() != ['jobs']:
+            raise JobRejected("Endpoint tidak ditemukan.", HTTPStatus.NOT_FOUND)
+        length = self.headers.get('Content-Length')
+        if length is None or not length.isdigit():
+            raise JobRejected("Header Content-Length dibutuhkan.", HTTPStatus.LENGTH_REQUIRED)
+        length = int(length)
+        if length > self.jobs.max_upload_bytes:
+            # Body tidak dibaca; koneksi ditutup setelah jawaban ini.
+            self.close_connection = True
+            raise JobRejected(f"Upload melebihi batas {self.jobs.max_upload_bytes} byte.",
+                              HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+        self.jobs.acquire_upload_slot()
+        try:
+            directory = self.jobs.new_job_directory()
+            try:
+                job = self._receive_job(directory, length)
+            except BaseException:
+                shutil.rmtree(directory, ignore_errors=True)
+                raise
+        finally:
+            self.jobs.release_upload_slot()
+        self.jobs.submit(job)
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict(), [('Location', f'/jobs/{job.id}')])
+
+    def _receive_job(self, directory, length):
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        query = {name: values[-1] for name, values in parse_qs(urlsplit(self.path).query).items()}
+
+        if content_type == 'application/json':
+            try:
+                document = json.loads(self.rfile.read(length))
+            except ValueError:
+                raise JobRejected("Body JSON tidak valid.")
+            parameters = _job_parameters(dict(query, **document) if isinstance(document, dict) else query)
+            input_file = os.path.join(directory, 'input.csv')
+            with open(input_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow([parameters['product_column'], parameters['barcode_column']])
+                writer.writerows(_rows_from_json(document))
+            # Pemisah ditetapkan, tidak ditebak dari header: nama kolom dari
+            # klien boleh berisi ';', '|' atau tab.
+            return Job(directory, input_file, 'csv', csv_delimiter=',', **parameters)
+
+        input_format = query.get('input_format') or _INPUT_FORMAT_BY_CONTENT_TYPE.get(content_type)
+        if input_format not in _INPUT_EXTENSIONS:
+            raise JobRejected(
+                "Content-Type harus application/json, text/csv, spreadsheet .xlsx atau Parquet "
+                "(atau isi ?input_format=excel|csv|parquet).", HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            )
+        parameters = _job_parameters(query)
+        input_file = os.path.join(directory, 'input' + _INPUT_EXTENSIONS[input_format])
+        # Upload langsung ditulis ke disk per blok, tidak ditahan di memori.
+        remaining = length
+        with open(input_file, 'wb') as f:
+            while remaining:
+                block = self.rfile.read(min(_COPY_BUFFER_SIZE, remaining))
+                if not block:
+                    raise JobRejected("Upload terputus sebelum selesai.")
+                f.write(block)
+                remaining -= len(block)
+        return Job(directory, input_file, input_format, **parameters)
+
+
+class BarcodeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, job_server):
+        self.job_server = job_server
+        super().__init__(address, _RequestHandler)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='chocobarcode-server',
+        description='Job server HTTP lokal Chocobarcode dengan pool render yang tetap hangat.',
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Alamat yang didengarkan (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port (default: %(default)s)')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='Jumlah proses render di pool (default: 1, 0 = semua core CPU)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_RENDER_CHUNK_SIZE,
+                        help=f'Jumlah barcode per tugas render paralel (default: {DEFAULT_RENDER_CHUNK_SIZE})')
+    parser.add_argument('--renderer', choices=RENDERERS, default=DEFAULT_RENDERER,
+                        help='Cara render gambar (default: %(default)s)')
+    parser.add_argument('--prefix', dest='prefixes', action='append', default=[],
+                        help='Prefix barcode baru (mis. GS1 company prefix); bisa diulang')
+    parser.add_argument('--allocation', choices=ALLOCATION_MODES, default='sequential',
+                        help='Urutan barcode baru di dalam rentang prefix (default: sequential)')
+    parser.add_argument('--registry',
+                        help='File SQLite registry barcode (default: registry di memori selama server hidup)')
+    parser.add_argument('--cache', nargs='?', const=default_cache_path(), default=None, metavar='FILE',
+                        help='Cache render SQLite (tanpa FILE: cache bawaan per user)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024), metavar='MB',
+                        help='Batas ukuran cache render dalam MB (default: %(default)s)')
+    parser.add_argument('--max-queued', type=int, default=DEFAULT_MAX_QUEUED_JOBS,
+                        help='Jumlah job maksimum di antrean sebelum permintaan ditolak (default: %(default)s)')
+    parser.add_argument('--max-running', type=int, default=DEFAULT_MAX_RUNNING_JOBS,
+                        help='Jumlah job yang diproses bersamaan (default: %(default)s)')
+    parser.add_argument('--max-upload', type=int, default=DEFAULT_MAX_UPLOAD_BYTES // (1024 * 1024), metavar='MB',
+                        help='Ukuran upload maksimum dalam MB (default: %(default)s)')
+    parser.add_argument('--job-dir', help='Folder file input/hasil job (default: folder temporer)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Tampilkan log job dan request ke stderr')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    options = GenerateOptions(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        renderer=args.renderer,
+        prefixes=args.prefixes,
+        allocation=args.allocation,
+        registry_path=args.registry,
+        cache_path=args.cache,
+        cache_max_bytes=args.cache_size * 1024 * 1024,
+    )
+
+    def log(message):
+        if args.verbose:
+            print(message, file=sys.stderr)
+
+    job_server = JobServer(
+        options, job_root=args.job_dir, max_queued_jobs=args.max_queued, max_running_jobs=args.max_running,
+        max_upload_bytes=args.max_upload * 1024 * 1024, log_callback=log,
+    )
+    try:
+        http_server = BarcodeHTTPServer((args.host, args.port), job_server)
+    except OSError as e:
+        job_server.close()
+        print(f"Gagal membuka {args.host}:{args.port}: {e}", file=sys.stderr)
+        return 4
+    # SIGTERM (service manager) dihentikan dengan rapi seperti Ctrl+C: job yang
+    # berjalan diselesaikan dan folder job temporer dihapus.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    host, port = http_server.server_address[:2]
+    print(f"Server Chocobarcode berjalan di http://{host}:{port} ({job_server.options.workers} proses render)",
+          file=sys.stderr)
+    try:
+        http_server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        http_server.server_close()
+        job_server.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Output workbook yang dipecah menjadi beberapa shard.
+
+Alokasi barcode tetap berjalan di proses utama (keunikan harus global),
+lalu setiap baris diarahkan ke shard-nya: per `shard_rows` baris berurutan,
+atau per nilai kolom grup. Baris satu shard ditampung di file temporer dan
+begitu shard lengkap, render gambar + penulisan workbook-nya dikerjakan
+oleh proses worker tersendiri, jadi beberapa shard disimpan bersamaan.
+File output utama menjadi workbook indeks berisi daftar file shard dan
+rentang barisnya.
+"""
+import os
+import pickle
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from openpyxl import Workbook
+
+from .config import SHARD_INDEX_SHEET_TITLE
+
+_UNSAFE_NAME_RE = re.compile(r'[^\w\-]+')
+_MAX_GROUP_NAME_LENGTH = 40
+# Mode grup: paling banyak sekian file baris terbuka sekaligus (LRU), supaya
+# ribuan grup tidak menghabiskan batas file descriptor proses.
+_MAX_OPEN_ROW_FILES = 64
+
+SHARD_INDEX_HEADERS = ('File', 'Grup', 'Baris Pertama', 'Baris Terakhir', 'Jumlah Baris', 'Berhasil', 'Gagal')
+
+
+def shard_file_name(output_file, number, group=None):
+    """`produk.xlsx` -> `produk_003.xlsx` (atau `produk_003_<grup>.xlsx` per grup)."""
+    base, extension = os.path.splitext(output_file)
+    if group is None:
+        return f'{base}_{number:03d}{extension}'
+    safe_group = _UNSAFE_NAME_RE.sub('_', group).strip('_')[:_MAX_GROUP_NAME_LENGTH] or 'kosong'
+    return f'{base}_{number:03d}_{safe_group}{extension}'
+
+
+def read_shard_rows(rows_file):
+    """Membaca baris satu shard: (indeks, nama_produk, barcode_asli, barcode, error)."""
+    with open(rows_file, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+class _Shard:
+    __slots__ = ('number', 'group', 'path', 'rows_file', 'row_count', 'first_row', 'last_row', 'result',
+                 'submitted')
+
+    def __init__(self, number, group, path, rows_file):
+        self.number = number
+        self.group = group
+        self.path = path
+        self.rows_file = rows_file
+        self.row_count = 0
+        self.first_row = None
+        self.last_row = None
+        self.result = None
+        self.submitted = False
+
+
+class ShardSet:
+    """
+    Mengarahkan baris ke shard dan menjalankan `build_shard(path, rows_file)`
+    untuk setiap shard (di process pool jika workers > 1). Hasil build_shard
+    adalah dict dengan kunci 'successful', 'failed' dan 'messages'.
+    """
+
+    def __init__(self, output_file, build_shard, workers=1, shard_rows=None, by_group=False):
+        if not shard_rows and not by_group:
+            raise ValueError("Shard membutuhkan jumlah baris per shard atau kolom grup.")
+        self.output_file = output_file
+        self.build_shard = build_shard
+        self.shard_rows = shard_rows
+        self.by_group = by_group
+        self.workers = workers
+        # Shard yang dikirim ke pool sekaligus dibatasi, seperti chunk render di BarcodeRenderer.
+        self.max_in_flight = workers * 2
+        self._spool_dir = tempfile.mkdtemp(prefix='chocobarcode-shards-')
+        self._shards = []
+        self._by_group = {}
+        self._open_files = OrderedDict()
+        self._executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._pending = {}
+        self._finished = []
+
+    def _new_shard(self, group):
+        number = len(self._shards) + 1
+        shard = _Shard(number, group, shard_file_name(self.output_file, number, group),
+                       os.path.join(self._spool_dir, f'{number}.rows'))
+        self._shards.append(shard)
+        return shard
+
+    def _rows_file(self, shard):
+        """Handle file baris shard; yang paling lama tidak dipakai ditutup dulu jika sudah terlalu banyak."""
+        rows_file = self._open_files.get(shard.number)
+        if rows_file is not None:
+            self._open_files.move_to_end(shard.number)
+            return rows_file
+        if len(self._open_files) >= _MAX_OPEN_ROW_FILES:
+            self._open_files.popitem(last=False)[1].close()
+        rows_file = self._open_files[shard.number] = open(shard.rows_file, 'ab')
+        return rows_file
+
+    def _current_shard(self, group):
+        if self.by_group:
+            shard = self._by_group.get(group)
+            if shard is None:
+                shard = self._by_group[group] = self._new_shard(group)
+            return shard
+        if not self._shards or self._shards[-1].submitted:
+            return self._new_shard(None)
+        return self._shards[-1]
+
+    def add(self, index, product_name, original_barcode, barcode, error, group=None):
+        """Menambahkan satu baris (indeks baris input mulai dari 0)."""
+        shard = self._current_shard(group)
+        pickle.dump((index, product_name, original_barcode, barcode, error), self._rows_file(shard),
+                    protocol=pickle.HIGHEST_PROTOCOL)
+        shard.row_count += 1
+        if shard.first_row is None:
+            shard.first_row = index + 1
+        shard.last_row = index + 1
+        if not self.by_group and shard.row_count >= self.shard_rows:
+            self._submit(shard)
+
+    def _submit(self, shard):
+        rows_file = self._open_files.pop(shard.number, None)
+        if rows_file is not None:
+            rows_file.close()
+        shard.submitted = True
+        if self._executor is None:
+            shard.result = self.build_shard(shard.path, shard.rows_file)
+            self._finished.append(shard)
+        else:
+            if len(self._pending) >= self.max_in_flight:
+                self._move_done(wait(self._pending, return_when=FIRST_COMPLETED)[0])
+            self._pending[self._executor.submit(self.build_shard, shard.path, shard.rows_file)] = shard
+
+    def _move_done(self, done):
+        for future in done:
+            shard = self._pending.pop(future)
+            shard.result = future.result()
+            self._finished.append(shard)
+
+    def _collect(self, block):
+        if self._pending:
+            if block and not self._finished:
+                self._move_done(wait(self._pending, return_when=FIRST_COMPLETED)[0])
+            else:
+                self._move_done([future for future in self._pending if future.done()])
+        finished, self._finished = self._finished, []
+        return finished
+
+    def completed(self):
+        """Shard yang sudah selesai dibuat sejak panggilan sebelumnya (tanpa menunggu)."""
+        return self._collect(block=False)
+
+    def finish(self):
+        """Mengirim shard yang belum lengkap lalu menghasilkan setiap shard begitu selesai dibuat."""
+        for shard in self._shards:
+            if not shard.submitted:
+                self._submit(shard)
+                yield from self._collect(block=False)
+        while self._finished or self._pending:
+            yield from self._collect(block=True)
+
+    def summary(self):
+        """Daftar shard (file, grup, rentang baris input 1-based, jumlah berhasil/gagal)."""
+        return [
+            {
+                'file': shard.path,
+                'group': shard.group,
+                'first_row': shard.first_row,
+                'last_row': shard.last_row,
+                'rows': shard.row_count,
+                'successful': shard.result['successful'] if shard.result else None,
+                'failed': shard.result['failed'] if shard.result else None,
+            }
+            for shard in self._shards
+        ]
+
+    def write_index(self):
+        """Menulis workbook indeks (daftar shard) ke file output utama."""
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(SHARD_INDEX_SHEET_TITLE)
+        ws.append(SHARD_INDEX_HEADERS)
+        for shard in self.summary():
+            ws.append((
+                os.path.basename(shard['file']), shard['group'], shard['first_row'], shard['last_row'], shard['rows'],
+                shard['successful'], shard['failed'],
+            ))
+        wb.save(self.output_file + '.part')
+        os.replace(self.output_file + '.part', self.output_file)
+
+    def output_bytes(self):
+        """Ukuran total workbook indeks dan semua shard."""
+        return sum(os.path.getsize(path) for path in [self.output_file] + [shard.path for shard in self._shards])
+
+    def close(self):
+        for rows_file in self._open_files.values():
+            rows_file.close()
+        self._open_files.clear()
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+    def abort(self):
+        """Membatalkan shard yang belum jalan dan menghapus shard yang sudah ditulis run ini."""
+        pending = dict(self._pending)
+        self.close()  # menunggu shard yang sedang berjalan
+        written = [shard for shard in self._shards if shard.result is not None]
+        written.extend(shard for future, shard in pending.items()
+                       if not future.cancelled() and future.exception() is None)
+        for shard in written:
+            if os.path.exists(shard.path):
+                os.remove(shard.path)
@@ -0,0 +1,136 @@
+"""
+Validasi EAN-13 satu kolom sekaligus dengan matriks digit NumPy.
+
+Versi per baris (generate_valid_ean13_string) tetap ada untuk pemakaian
+satuan; fungsi di sini memberi hasil yang sama untuk seluruh kolom dalam
+satu kali jalan, ditambah status dan penanda duplikat.
+"""
+import numpy as np
+
+STATUS_KEPT = 0
+STATUS_CHECKSUM_CORRECTED = 1
+STATUS_PADDED_FROM_12 = 2
+STATUS_INVALID = 3
+STATUS_NAMES = ('kept', 'checksum-corrected', 'padded-from-12', 'invalid')
+
+_CHECKSUM_WEIGHTS = np.array([1, 3] * 6, dtype=np.int32)
+_DIGIT_POWERS = 10 ** np.arange(12, -1, -1, dtype=np.int64)
+
+
+class ColumnValidation:
+    """
+    Hasil validasi satu kolom barcode.
+
+    - barcodes: list string 13 digit yang sudah dinormalisasi, '' jika tidak valid
+    - status: array int8 berisi salah satu konstanta STATUS_*
+    - duplicate: array bool, True untuk kemunculan kedua dst. dari barcode valid
+      yang sama (kemunculan pertama di file tetap dipakai)
+    """
+
+    __slots__ = ('barcodes', 'status', 'duplicate')
+
+    def __init__(self, barcodes, status, duplicate):
+        self.barcodes = barcodes
+        self.status = status
+        self.duplicate = duplicate
+
+    def __len__(self):
+        return len(self.barcodes)
+
+    def status_name(self, index):
+        return STATUS_NAMES[self.status[index]]
+
+    def reserved_barcodes(self):
+        """
+        Semua barcode valid dari input (tanpa duplikat). Barcode baru harus
+        menghindari set ini supaya tidak bentrok dengan barcode valid yang
+        baru muncul di baris-baris berikutnya.
+        """
+        keep = (self.status != STATUS_INVALID) & ~self.duplicate
+        return {barcode for barcode, keep_row in zip(self.barcodes, keep.tolist()) if keep_row}
+
+    def counts(self):
+        counts = np.bincount(self.status, minlength=len(STATUS_NAMES))
+        result = {name: int(count) for name, count in zip(STATUS_NAMES, counts)}
+        result['duplicate'] = int(self.duplicate.sum())
+        return result
+
+
+def validate_ean13_column(values):
+    """
+    Memvalidasi dan menormalisasi seluruh kolom barcode sekaligus.
+
+    Aturannya sama dengan generate_valid_ean13_string: 13 digit dengan checksum
+    benar dipertahankan, checksum salah dikoreksi, 12 digit ditambah checksum,
+    selain itu tidak valid. Hanya digit ASCII 0-9 yang dianggap angka.
+    """
+    strings = np.array([str(value).strip() for value in values], dtype=np.str_)
+    count = len(strings)
+    status = np.full(count, STATUS_INVALID, dtype=np.int8)
+    duplicate = np.zeros(count, dtype=bool)
+    if count == 0:
+        return ColumnValidation([], status, duplicate)
+
+    lengths = np.char.str_len(strings)
+    candidates = np.flatnonzero((lengths == 12) | (lengths == 13))
+    # Matriks codepoint (n, 13); string 12 digit berakhir dengan 0 (padding).
+    # Dengan uint32, codepoint di bawah '0' ikut menjadi besar sehingga satu
+    # perbandingan <= 9 sudah cukup untuk memeriksa digit ASCII.
+    codepoints = strings[candidates].astype('<U13').view(np.uint32).reshape(-1, 13)
+    digits = codepoints - 48
+    candidate_lengths = lengths[candidates]
+    is_digit = digits <= 9
+    is_digit[candidate_lengths == 12, 12] = True
+    numeric = is_digit.all(axis=1)
+
+    candidates = candidates[numeric]
+    digits = digits[numeric].astype(np.uint8)
+    candidate_lengths = candidate_lengths[numeric]
+
+    checksum = ((10 - (digits[:, :12] @ _CHECKSUM_WEIGHTS) % 10) % 10).astype(np.uint8)
+    is_thirteen = candidate_lengths == 13
+    status[candidates] = np.where(
+        is_thirteen,
+        np.where(digits[:, 12] == checksum, STATUS_KEPT, STATUS_CHECKSUM_CORRECTED),
+        STATUS_PADDED_FROM_12,
+    )
+    digits[:, 12] = checksum
+
+    normalized = np.full(count, '', dtype='<U13')
+    # Chunk tanpa satu pun kandidat numerik (mis. kolom kosong semua):
+    # semuanya tidak valid dan tidak ada yang perlu dicek duplikatnya.
+    if candidates.size == 0:
+        return ColumnValidation(normalized.tolist(), status, duplicate)
+
+    # Duplikat dicari lewat nilai int64 barcode. Untuk setiap kelompok nilai
+    # yang sama, indeks terkecil (kemunculan pertama di file) dipertahankan.
+    numbers = digits @ _DIGIT_POWERS
+    order = np.argsort(numbers)
+    sorted_numbers = numbers[order]
+    group_starts = np.flatnonzero(np.r_[True, sorted_numbers[1:] != sorted_numbers[:-1]])
+    duplicate[candidates] = True
+    duplicate[candidates[np.minimum.reduceat(order, group_starts)]] = False
+
+    normalized[candidates] = (digits + ord('0')).astype(np.uint32).view('<U13').ravel()
+    return ColumnValidation(normalized.tolist(), status, duplicate)
+
+
+def scan_ean13_chunks(barcode_chunks):
+    """
+    Lintasan pertama untuk input streaming: memvalidasi kolom barcode per
+    chunk dan hanya menyimpan set barcode valid (untuk dicadangkan) plus
+    jumlah per status. Mengembalikan (jumlah_baris, set_barcode_valid, counts).
+    """
+    reserved = set()
+    counts = dict.fromkeys(STATUS_NAMES, 0)
+    total_rows = 0
+    for barcodes in barcode_chunks:
+        validation = validate_ean13_column(barcodes)
+        total_rows += len(validation)
+        for name, count in validation.counts().items():
+            if name in counts:
+                counts[name] += count
+        reserved.update(validation.reserved_barcodes())
+    valid_rows = total_rows - counts['invalid']
+    counts['duplicate'] = valid_rows - len(reserved)
+    return total_rows, reserved, counts
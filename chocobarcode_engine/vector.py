@@ -0,0 +1,118 @@
+"""
+Geometri EAN-13 tanpa raster (tanpa PIL) untuk output vektor SVG dan PDF.
+
+Ukuran mengikuti BARCODE_WRITER_OPTIONS dan rumus BaseWriter python-barcode
+(quiet zone, lebar modul, tinggi batang, jarak teks, margin 1 mm), jadi
+barcode vektor berukuran sama dengan gambar PNG di workbook. Satuan: mm.
+"""
+import re
+
+from barcode.charsets import ean as _ean
+
+from .config import BARCODE_WRITER_OPTIONS
+from .ean13 import calculate_ean13_checksum
+
+EAN13_MODULES = 95
+MM_PER_PT = 25.4 / 72
+
+# Default BaseWriter python-barcode untuk opsi yang tidak diisi.
+_DEFAULTS = {
+    'module_width': 0.2,
+    'module_height': 15.0,
+    'quiet_zone': 6.5,
+    'text_distance': 5.0,
+    'font_size': 10,
+    'write_text': True,
+}
+_MARGIN_MM = 1.0
+_BAR_RUN_RE = re.compile('1+')
+
+
+def normalize_ean13(barcode_number_str):
+    """
+    Barcode 13 digit dengan check digit dihitung ulang. Seperti EAN13
+    python-barcode, kode inilah yang digambar, baik batang maupun teksnya.
+    """
+    if len(barcode_number_str) != 13 or not barcode_number_str.isdigit():
+        raise ValueError(f"EAN-13 harus 13 digit angka, diterima '{barcode_number_str}'.")
+    first12 = barcode_number_str[:12]
+    return first12 + str(calculate_ean13_checksum(first12))
+
+
+def ean13_modules(barcode_number_str):
+    """String 95 modul ('1' = batang) untuk barcode 13 digit, seperti EAN13 python-barcode."""
+    encoded = normalize_ean13(barcode_number_str)
+    parity = _ean.LEFT_PATTERN[int(encoded[0])]
+    parts = [_ean.EDGE]
+    parts.extend(_ean.CODES[parity[slot]][int(encoded[slot + 1])] for slot in range(6))
+    parts.append(_ean.MIDDLE)
+    parts.extend(_ean.CODES['C'][int(encoded[slot + 1])] for slot in range(6, 12))
+    parts.append(_ean.EDGE)
+    return ''.join(parts)
+
+
+def _num(value):
+    return f'{value:.3f}'.rstrip('0').rstrip('.')
+
+
+class EAN13Geometry:
+    """Posisi batang dan teks EAN-13 (mm, origin kiri atas) untuk satu set opsi writer."""
+
+    def __init__(self, writer_options=BARCODE_WRITER_OPTIONS):
+        options = dict(_DEFAULTS, **writer_options)
+        self.module_width = float(options['module_width'])
+        self.module_height = float(options['module_height'])
+        self.quiet_zone = float(options['quiet_zone'])
+        self.write_text = bool(options['write_text']) and bool(options['font_size'])
+        self.font_size_mm = options['font_size'] * MM_PER_PT if self.write_text else 0.0
+
+        self.width = 2 * self.quiet_zone + EAN13_MODULES * self.module_width
+        self.height = 2 * _MARGIN_MM + self.module_height
+        if self.write_text:
+            self.height += self.font_size_mm / 2 + float(options['text_distance'])
+        self.bar_top = _MARGIN_MM
+        # Teks di tengah batang; y = garis bawah teks (anchor 'md' ImageWriter).
+        self.text_x = self.quiet_zone + EAN13_MODULES * self.module_width / 2
+        self.text_y = _MARGIN_MM + self.module_height + float(options['text_distance'])
+        # Potongan path SVG per (modul awal, jumlah modul); jumlah kombinasinya kecil.
+        self._svg_runs = {}
+
+    def bar_runs(self, barcode_number_str):
+        """List (modul awal, jumlah modul) setiap batang; modul hitam yang berdampingan digabung."""
+        return [(match.start(), match.end() - match.start())
+                for match in _BAR_RUN_RE.finditer(ean13_modules(barcode_number_str))]
+
+    def bar_rect(self, start, length):
+        """(x, lebar) dalam mm untuk batang dari bar_runs()."""
+        return self.quiet_zone + start * self.module_width, length * self.module_width
+
+    def svg_path(self, barcode_number_str):
+        parts = []
+        for run in self.bar_runs(barcode_number_str):
+            part = self._svg_runs.get(run)
+            if part is None:
+                x, width = self.bar_rect(*run)
+                part = self._svg_runs[run] = (
+                    f'M{_num(x)} {_num(self.bar_top)}h{_num(width)}v{_num(self.module_height)}h-{_num(width)}z'
+                )
+            parts.append(part)
+        return ''.join(parts)
+
+
+def svg_document(geometry, barcode_number_str):
+    """Dokumen SVG (str) satu barcode, ukuran fisik dalam mm."""
+    path = geometry.svg_path(barcode_number_str)
+    text = ''
+    if geometry.write_text:
+        text = (
+            f'<text x="{_num(geometry.text_x)}" y="{_num(geometry.text_y)}" font-family="monospace" '
+            f'font-size="{_num(geometry.font_size_mm)}" text-anchor="middle" fill="black">'
+            f'{normalize_ean13(barcode_number_str)}</text>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(geometry.width)}mm" height="{_num(geometry.height)}mm" '
+        f'viewBox="0 0 {_num(geometry.width)} {_num(geometry.height)}">'
+        '<rect width="100%" height="100%" fill="white"/>'
+        f'<path d="{path}" fill="black"/>{text}</svg>\n'
+    )
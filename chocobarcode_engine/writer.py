@@ -0,0 +1,361 @@
+"""
+Penulis workbook output.
+
+- ExcelBarcodeWriter: openpyxl biasa. Semua baris dan gambar ditahan di
+  memori sampai save().
+- StreamingExcelBarcodeWriter (default): menulis .xlsx langsung ke file zip
+  sambil jalan. Setiap PNG masuk ke arsip begitu diterima, XML sheet dan
+  drawing ditampung di file temporer, lalu semuanya dirangkai saat save().
+  Memori tetap datar berapa pun jumlah gambarnya.
+
+Keduanya menghasilkan tata letak yang sama: lebar kolom A-C, tinggi baris
+IMAGE_HEIGHT_PIXELS * 0.7, gambar dijangkarkan di kolom C dan baris gagal
+ditandai FAILED_BARCODE_MARKER.
+
+Format output lain (lembar label PDF, ZIP berisi SVG atau PNG) ada di
+labels.py; create_writer memilih penulis sesuai format.
+"""
+import os
+import tempfile
+from io import BytesIO
+from xml.sax.saxutils import escape, quoteattr
+
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.drawing.image import Image as OpenpyxlImage
+
+from .config import (
+    BARCODE_COLUMN_NAME,
+    DEFAULT_OUTPUT_FORMAT,
+    FAILED_BARCODE_MARKER,
+    IMAGE_HEIGHT_PIXELS,
+    IMAGE_WIDTH_PIXELS,
+    OUTPUT_BARCODE_IMAGE_COLUMN_HEADER,
+    OUTPUT_FORMAT_EXTENSIONS,
+    OUTPUT_FORMATS,
+    OUTPUT_SHEET_TITLE,
+    PRODUCT_NAME_COLUMN_NAME,
+)
+from .checkpoint import open_spool, remove_spool, sync_spool
+from .labels import DEFAULT_LABEL_GRID, DEFAULT_PAGE_SIZE, PdfLabelSheetWriter, PngZipWriter, SvgZipWriter
+from .zipstream import ZipStreamWriter
+
+OUTPUT_WRITERS = ('streaming', 'openpyxl')
+DEFAULT_OUTPUT_WRITER = 'streaming'
+
+COLUMN_WIDTHS = (25, 20, IMAGE_WIDTH_PIXELS / 7)
+IMAGE_ROW_HEIGHT = IMAGE_HEIGHT_PIXELS * 0.7
+
+
+class ExcelBarcodeWriter:
+    """
+    Menulis hasil ke workbook Excel: nama produk (A), barcode (B) dan
+    gambar barcode yang dijangkarkan di kolom C.
+    """
+
+    needs_png = True
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.wb = Workbook()
+        self.ws = self.wb.active
+        self.ws.title = OUTPUT_SHEET_TITLE
+
+        self.ws.append([PRODUCT_NAME_COLUMN_NAME, BARCODE_COLUMN_NAME, OUTPUT_BARCODE_IMAGE_COLUMN_HEADER])
+
+        for column, width in zip('ABC', COLUMN_WIDTHS):
+            self.ws.column_dimensions[column].width = width
+
+    def write_barcode_row(self, product_name, barcode, png_bytes):
+        """Menambahkan satu baris berisi gambar barcode. Mengembalikan nomor baris Excel."""
+        current_row_in_excel = self.ws.max_row + 1
+        self.ws.append([product_name, barcode, ''])
+
+        img = OpenpyxlImage(BytesIO(png_bytes))
+        img.width = IMAGE_WIDTH_PIXELS
+        img.height = IMAGE_HEIGHT_PIXELS
+        self.ws.add_image(img, f'C{current_row_in_excel}')
+
+        self.ws.row_dimensions[current_row_in_excel].height = IMAGE_ROW_HEIGHT
+        return current_row_in_excel
+
+    def write_failed_row(self, product_name, original_barcode):
+        """Menandai baris yang barcode-nya gagal dibuat."""
+        self.ws.append([product_name, original_barcode, FAILED_BARCODE_MARKER])
+        return self.ws.max_row
+
+    def save(self):
+        self.wb.save(self.output_file)
+
+    def abort(self):
+        pass
+
+
+# --- Penulis .xlsx streaming ---
+
+_EMU_PER_PIXEL = 9525
+_SPOOL_READ_SIZE = 1024 * 1024
+# Akhiran file spool bernama (`<output>.part.<nama>`) untuk writer resumable.
+_SPOOL_NAMES = ('sheet', 'anchors', 'rels')
+# PNG sudah terkompresi; deflate level 1 masih memangkas ~10% dengan biaya
+# yang hampir nol.
+_IMAGE_COMPRESS_LEVEL = 1
+
+_NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_CONTENT_TYPES_XML = (
+    _XML_DECLARATION
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Default Extension="png" ContentType="image/png"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/drawings/drawing1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.drawing+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS_XML = (
+    _XML_DECLARATION
+    + f'<Relationships xmlns="{_NS_PKG_REL}">'
+    f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_XML = (
+    _XML_DECLARATION
+    + f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}">'
+    f'<sheets><sheet name={quoteattr(OUTPUT_SHEET_TITLE)} sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS_XML = (
+    _XML_DECLARATION
+    + f'<Relationships xmlns="{_NS_PKG_REL}">'
+    f'<Relationship Id="rId1" Type="{_NS_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_NS_REL}/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_STYLES_XML = (
+    _XML_DECLARATION
+    + f'<styleSheet xmlns="{_NS_MAIN}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/><family val="2"/><scheme val="minor"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_RELS_XML = (
+    _XML_DECLARATION
+    + f'<Relationships xmlns="{_NS_PKG_REL}">'
+    f'<Relationship Id="rId1" Type="{_NS_REL}/drawing" Target="../drawings/drawing1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _framed(head, chunks, tail):
+    yield head.encode('utf-8')
+    yield from chunks
+    yield tail.encode('utf-8')
+
+
+def _inline_string_cell(reference, value):
+    value = ILLEGAL_CHARACTERS_RE.sub('', str(value))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+
+
+class StreamingExcelBarcodeWriter:
+    """
+    Versi streaming ExcelBarcodeWriter dengan antarmuka yang sama.
+
+    File ditulis ke `<output>.part` lalu diganti namanya saat save(), jadi
+    file output lama tidak tersentuh jika proses gagal di tengah jalan.
+
+    Dengan resumable=True semua file kerja diberi nama di samping `.part`
+    (lihat checkpoint.py) dan tidak dihapus oleh abort(); checkpoint()
+    mengembalikan keadaan yang bisa diberikan lagi sebagai `state` untuk
+    melanjutkan workbook yang sama.
+    """
+
+    needs_png = True
+
+    def __init__(self, output_file, resumable=False, state=None):
+        self.output_file = output_file
+        self.resumable = resumable or state is not None
+        self._part_file = output_file + '.part'
+        if self.resumable:
+            self._zip = ZipStreamWriter(self._part_file, central_directory_path=self._part_file + '.dir',
+                                        state=state and state['zip'])
+            # Isi <sheetData>, anchor gambar dan relasi gambar; dirangkai saat save().
+            self._sheet_rows, self._anchors, self._image_rels = (
+                open_spool(f'{self._part_file}.{name}', state and state[name]) for name in _SPOOL_NAMES
+            )
+        else:
+            self._zip = ZipStreamWriter(self._part_file)
+            self._sheet_rows = tempfile.TemporaryFile()
+            self._anchors = tempfile.TemporaryFile()
+            self._image_rels = tempfile.TemporaryFile()
+        if state is not None:
+            self._row_count = state['rows']
+            self._image_count = state['images']
+            return
+        self._row_count = 0
+        self._image_count = 0
+        self._write_row((PRODUCT_NAME_COLUMN_NAME, BARCODE_COLUMN_NAME, OUTPUT_BARCODE_IMAGE_COLUMN_HEADER))
+
+    def checkpoint(self):
+        """Mem-flush semua file kerja ke disk dan mengembalikan keadaan writer (hanya jika resumable)."""
+        state = {'zip': self._zip.checkpoint(), 'rows': self._row_count, 'images': self._image_count}
+        for name, spool in zip(_SPOOL_NAMES, (self._sheet_rows, self._anchors, self._image_rels)):
+            state[name] = sync_spool(spool)
+        return state
+
+    def _write_row(self, values, height=None):
+        self._row_count += 1
+        row = self._row_count
+        attributes = f' ht="{height:g}" customHeight="1"' if height else ''
+        cells = ''.join(
+            _inline_string_cell(f'{column}{row}', value)
+            for column, value in zip('ABC', values) if value != ''
+        )
+        self._sheet_rows.write(f'<row r="{row}"{attributes}>{cells}</row>'.encode('utf-8'))
+        return row
+
+    def _add_image(self, png_bytes, row):
+        self._image_count += 1
+        number = self._image_count
+        name = f'xl/media/image{number}.png'
+        zip_entry = getattr(png_bytes, 'zip_entry', None)
+        if zip_entry is not None:
+            self._zip.write_compressed(name, *zip_entry, len(png_bytes))
+        else:
+            self._zip.write(name, png_bytes, _IMAGE_COMPRESS_LEVEL)
+        self._image_rels.write(
+            f'<Relationship Id="rId{number}" Type="{_NS_REL}/image" '
+            f'Target="../media/image{number}.png"/>'.encode('utf-8')
+        )
+        self._anchors.write((
+            f'<xdr:oneCellAnchor><xdr:from><xdr:col>2</xdr:col><xdr:colOff>0</xdr:colOff>'
+            f'<xdr:row>{row - 1}</xdr:row><xdr:rowOff>0</xdr:rowOff></xdr:from>'
+            f'<xdr:ext cx="{IMAGE_WIDTH_PIXELS * _EMU_PER_PIXEL}" cy="{IMAGE_HEIGHT_PIXELS * _EMU_PER_PIXEL}"/>'
+            f'<xdr:pic><xdr:nvPicPr><xdr:cNvPr id="{number}" name="Image {number}" descr="Picture"/>'
+            f'<xdr:cNvPicPr/></xdr:nvPicPr>'
+            f'<xdr:blipFill><a:blip r:embed="rId{number}"/><a:stretch><a:fillRect/></a:stretch></xdr:blipFill>'
+            f'<xdr:spPr><a:prstGeom prst="rect"><a:avLst/></a:prstGeom></xdr:spPr></xdr:pic>'
+            f'<xdr:clientData/></xdr:oneCellAnchor>'
+        ).encode('utf-8'))
+
+    def write_barcode_row(self, product_name, barcode, png_bytes):
+        """Menambahkan satu baris berisi gambar barcode. Mengembalikan nomor baris Excel."""
+        row = self._write_row((product_name, barcode, ''), IMAGE_ROW_HEIGHT)
+        self._add_image(png_bytes, row)
+        return row
+
+    def write_failed_row(self, product_name, original_barcode):
+        """Menandai baris yang barcode-nya gagal dibuat."""
+        return self._write_row((product_name, original_barcode, FAILED_BARCODE_MARKER))
+
+    def _add_spooled_entry(self, name, head, spool, tail):
+        spool.seek(0)
+        chunks = iter(lambda: spool.read(_SPOOL_READ_SIZE), b'')
+        self._zip.write_stream(name, _framed(head, chunks, tail))
+
+    def save(self):
+        columns = ''.join(
+            f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+            for index, width in enumerate(COLUMN_WIDTHS, start=1)
+        )
+        drawing = '<drawing r:id="rId1"/>' if self._image_count else ''
+        self._add_spooled_entry(
+            'xl/worksheets/sheet1.xml',
+            _XML_DECLARATION + f'<worksheet xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}">'
+            f'<dimension ref="A1:C{self._row_count}"/><cols>{columns}</cols><sheetData>',
+            self._sheet_rows,
+            '</sheetData><pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>'
+            f'{drawing}</worksheet>',
+        )
+        if self._image_count:
+            self._zip.write('xl/worksheets/_rels/sheet1.xml.rels', _SHEET_RELS_XML)
+            self._add_spooled_entry(
+                'xl/drawings/drawing1.xml',
+                _XML_DECLARATION + '<xdr:wsDr '
+                'xmlns:xdr="http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing" '
+                f'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" xmlns:r="{_NS_REL}">',
+                self._anchors,
+                '</xdr:wsDr>',
+            )
+            self._add_spooled_entry(
+                'xl/drawings/_rels/drawing1.xml.rels',
+                _XML_DECLARATION + f'<Relationships xmlns="{_NS_PKG_REL}">',
+                self._image_rels,
+                '</Relationships>',
+            )
+            content_types = _CONTENT_TYPES_XML
+        else:
+            content_types = _CONTENT_TYPES_XML.replace(
+                '<Override PartName="/xl/drawings/drawing1.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.drawing+xml"/>', '')
+        self._zip.write('xl/workbook.xml', _WORKBOOK_XML)
+        self._zip.write('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS_XML)
+        self._zip.write('xl/styles.xml', _STYLES_XML)
+        self._zip.write('_rels/.rels', _ROOT_RELS_XML)
+        self._zip.write('[Content_Types].xml', content_types)
+        self._zip.close()
+        self._close_spools(remove=self.resumable)
+        os.replace(self._part_file, self.output_file)
+
+    def _close_spools(self, remove=False):
+        for spool in (self._sheet_rows, self._anchors, self._image_rels):
+            if remove:
+                remove_spool(spool)
+            else:
+                spool.close()
+
+    def abort(self):
+        """
+        Membuang file setengah jadi setelah proses gagal. File kerja writer
+        resumable dibiarkan supaya run bisa dilanjutkan dari checkpoint.
+        """
+        if self.resumable:
+            self._zip.detach()
+            self._close_spools()
+            return
+        self._zip.close()
+        self._close_spools()
+        if os.path.exists(self._part_file):
+            os.remove(self._part_file)
+
+
+_WRITER_CLASSES = {'streaming': StreamingExcelBarcodeWriter, 'openpyxl': ExcelBarcodeWriter}
+
+
+def output_file_name(base_name, output_format):
+    """Mengganti ekstensi `base_name` dengan ekstensi bawaan format output."""
+    return os.path.splitext(base_name)[0] + OUTPUT_FORMAT_EXTENSIONS[output_format]
+
+
+def create_writer(output_file, kind=DEFAULT_OUTPUT_WRITER, output_format=DEFAULT_OUTPUT_FORMAT,
+                  label_grid=DEFAULT_LABEL_GRID, page_size=DEFAULT_PAGE_SIZE):
+    if output_format == 'pdf':
+        return PdfLabelSheetWriter(output_file, label_grid, page_size)
+    if output_format == 'svg':
+        return SvgZipWriter(output_file)
+    if output_format == 'png':
+        return PngZipWriter(output_file)
+    if output_format != 'xlsx':
+        raise ValueError(f"Format output '{output_format}' tidak dikenal. Pilihan: {', '.join(OUTPUT_FORMATS)}")
+    if kind not in _WRITER_CLASSES:
+        raise ValueError(f"Penulis output '{kind}' tidak dikenal. Pilihan: {', '.join(OUTPUT_WRITERS)}")
+    return _WRITER_CLASSES[kind](output_file)
@@ -0,0 +1,212 @@
+"""
+Penulis arsip zip streaming untuk workbook output.
+
+zipfile.ZipFile menyimpan satu ZipInfo per entri di memori sampai arsip
+ditutup (sekitar 350 byte per gambar). Di sini catatan central directory
+langsung ditulis ke file temporer, sehingga memori tetap datar berapa pun
+jumlah entrinya. Zip64 dipakai otomatis untuk lebih dari 65535 entri atau
+offset di atas 4 GB. Tanggal setiap entri tetap (1 Jan 1980), jadi isi yang
+sama selalu menghasilkan file yang sama persis.
+
+Untuk run dengan checkpoint, central directory ditulis ke file bernama dan
+checkpoint() mengembalikan ukuran kedua file; ZipStreamWriter baru dengan
+`state` tersebut melanjutkan arsip persis dari titik itu.
+"""
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+
+from .checkpoint import open_spool, sync_spool
+
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_ZIP64_OFFSET_EXTRA = struct.Struct('<2HQ')
+_ZIP64_END_RECORD = struct.Struct('<4sQ2H2L4Q')
+_ZIP64_END_LOCATOR = struct.Struct('<4sLQL')
+_END_RECORD = struct.Struct('<4s4H2LH')
+
+_DOS_DATE = (1 << 5) | 1  # 1980-01-01
+_DOS_TIME = 0
+_VERSION_DEFAULT = 20
+_VERSION_ZIP64 = 45
+_METHOD_STORED = 0
+_METHOD_DEFLATED = 8
+_MAX_32 = 0xFFFFFFFF
+_MAX_16 = 0xFFFF
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class ZippedBytes(bytes):
+    """
+    bytes biasa yang juga membawa bentuk terkompresinya dari arsip zip lain
+    (`zip_entry` = (method, crc, payload)), supaya bisa disalin ke arsip baru
+    tanpa dikompresi ulang.
+    """
+
+    zip_entry = None
+
+
+def read_raw_member(fileobj, header_offset, compress_size):
+    """Payload terkompresi satu entri zip apa adanya (tanpa dekompresi), dari offset header lokalnya."""
+    fileobj.seek(header_offset)
+    name_length, extra_length = _LOCAL_HEADER.unpack(fileobj.read(_LOCAL_HEADER.size))[-2:]
+    fileobj.seek(header_offset + _LOCAL_HEADER.size + name_length + extra_length)
+    return fileobj.read(compress_size)
+
+
+def decompress_member(method, payload):
+    if method == _METHOD_STORED:
+        return payload
+    if method != _METHOD_DEFLATED:
+        raise ValueError(f"Metode kompresi zip {method} tidak didukung.")
+    return zlib.decompress(payload, -15)
+
+
+class ZipStreamWriter:
+    """
+    Arsip zip yang ditulis entri demi entri ke `path` (harus file biasa,
+    karena header entri streaming diperbaiki dengan seek setelah datanya
+    selesai ditulis).
+    """
+
+    def __init__(self, path, compress_level=6, central_directory_path=None, state=None):
+        self.path = path
+        self.compress_level = compress_level
+        self._file = open_spool(path, state and state['size'])
+        if central_directory_path is None:
+            self._central_directory = tempfile.TemporaryFile()
+        else:
+            self._central_directory = open_spool(central_directory_path, state and state['directory_size'])
+        self.central_directory_path = central_directory_path
+        self._entry_count = state['entries'] if state else 0
+
+    def checkpoint(self):
+        """Mem-flush arsip dan central directory ke disk; hasilnya bisa dipakai sebagai `state`."""
+        return {
+            'size': sync_spool(self._file),
+            'directory_size': sync_spool(self._central_directory),
+            'entries': self._entry_count,
+        }
+
+    def _write_local_header(self, name, method, crc, compressed_size, size):
+        if compressed_size >= _MAX_32 or size >= _MAX_32:
+            raise ValueError(f"Entri zip '{name}' terlalu besar (lebih dari 4 GB).")
+        self._file.write(_LOCAL_HEADER.pack(
+            b'PK\x03\x04', _VERSION_DEFAULT, 0, method, _DOS_TIME, _DOS_DATE,
+            crc, compressed_size, size, len(name), 0,
+        ))
+        self._file.write(name)
+
+    def _add_central_record(self, name, method, crc, compressed_size, size, offset):
+        extra = b''
+        version = _VERSION_DEFAULT
+        if offset >= _MAX_32:
+            extra = _ZIP64_OFFSET_EXTRA.pack(1, 8, offset)
+            version = _VERSION_ZIP64
+            offset = _MAX_32
+        self._central_directory.write(_CENTRAL_HEADER.pack(
+            b'PK\x01\x02', version, version, 0, method, _DOS_TIME, _DOS_DATE,
+            crc, compressed_size, size, len(name), len(extra), 0, 0, 0, 0, offset,
+        ))
+        self._central_directory.write(name)
+        self._central_directory.write(extra)
+        self._entry_count += 1
+
+    def write(self, name, data, compress_level=None):
+        """
+        Menambahkan satu entri dari bytes (atau str, disimpan sebagai UTF-8)
+        yang sudah lengkap di memori. compress_level=0 berarti tanpa kompresi;
+        entri yang tidak mengecil setelah dikompresi juga disimpan tanpa kompresi.
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        name = name.encode('utf-8')
+        compress_level = self.compress_level if compress_level is None else compress_level
+        crc = zlib.crc32(data)
+        payload = None
+        if compress_level:
+            compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -15)
+            payload = compressor.compress(data) + compressor.flush()
+            method = _METHOD_DEFLATED
+        # Data yang tidak mengecil (mis. PNG 1-bit yang sudah rapat) disimpan apa adanya.
+        if payload is None or len(payload) >= len(data):
+            payload = data
+            method = _METHOD_STORED
+        offset = self._file.tell()
+        self._write_local_header(name, method, crc, len(payload), len(data))
+        self._file.write(payload)
+        self._add_central_record(name, method, crc, len(payload), len(data), offset)
+
+    def write_compressed(self, name, method, crc, payload, size):
+        """Menambahkan entri yang isinya sudah terkompresi (mis. disalin dari arsip lain)."""
+        name = name.encode('utf-8')
+        offset = self._file.tell()
+        self._write_local_header(name, method, crc, len(payload), size)
+        self._file.write(payload)
+        self._add_central_record(name, method, crc, len(payload), size, offset)
+
+    def write_stream(self, name, chunks):
+        """
+        Menambahkan satu entri terkompresi dari iterable bytes tanpa
+        menampung seluruh isinya; CRC dan ukuran diisi setelah selesai.
+        """
+        name = name.encode('utf-8')
+        offset = self._file.tell()
+        self._write_local_header(name, _METHOD_DEFLATED, 0, 0, 0)
+        compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, -15)
+        crc = 0
+        size = 0
+        compressed_size = 0
+        for chunk in chunks:
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            payload = compressor.compress(chunk)
+            compressed_size += len(payload)
+            self._file.write(payload)
+        payload = compressor.flush()
+        compressed_size += len(payload)
+        self._file.write(payload)
+
+        end = self._file.tell()
+        self._file.seek(offset)
+        self._write_local_header(name, _METHOD_DEFLATED, crc, compressed_size, size)
+        self._file.seek(end)
+        self._add_central_record(name, _METHOD_DEFLATED, crc, compressed_size, size, offset)
+
+    def close(self):
+        if self._file.closed:
+            return
+        directory_offset = self._file.tell()
+        self._central_directory.seek(0)
+        shutil.copyfileobj(self._central_directory, self._file, _COPY_BUFFER_SIZE)
+        directory_size = self._file.tell() - directory_offset
+        self._central_directory.close()
+        if self.central_directory_path is not None:
+            os.remove(self.central_directory_path)
+
+        count = self._entry_count
+        if count >= _MAX_16 or directory_offset >= _MAX_32 or directory_size >= _MAX_32:
+            zip64_end_offset = self._file.tell()
+            self._file.write(_ZIP64_END_RECORD.pack(
+                b'PK\x06\x06', _ZIP64_END_RECORD.size - 12, _VERSION_ZIP64, _VERSION_ZIP64, 0, 0,
+                count, count, directory_size, directory_offset,
+            ))
+            self._file.write(_ZIP64_END_LOCATOR.pack(b'PK\x06\x07', 0, zip64_end_offset, 1))
+        self._file.write(_END_RECORD.pack(
+            b'PK\x05\x06', 0, 0, min(count, _MAX_16), min(count, _MAX_16),
+            min(directory_size, _MAX_32), min(directory_offset, _MAX_32), 0,
+        ))
+        self._file.close()
+
+    def detach(self):
+        """Menutup file tanpa menyelesaikan arsip, supaya bisa dilanjutkan dari checkpoint terakhir."""
+        self._file.close()
+        self._central_directory.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,36 @@
+import os
+import sys
+import zipfile
+
+import pytest
+from openpyxl import load_workbook
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.benchmark import make_catalog  # noqa: E402
+
+CATALOG_ROWS = 300
+
+
+@pytest.fixture(scope='session')
+def catalog(tmp_path_factory):
+    """Katalog input sintetis kecil dengan campuran barcode seperti benchmark."""
+    path = str(tmp_path_factory.mktemp('catalog') / 'catalog.xlsx')
+    make_catalog(path, CATALOG_ROWS)
+    return path
+
+
+def read_output(path):
+    """(baris (nama_produk, barcode), bytes setiap gambar berurutan) dari workbook output."""
+    wb = load_workbook(path, read_only=True)
+    try:
+        rows = [tuple(row[:2]) for row in wb.worksheets[0].iter_rows(min_row=2, values_only=True)]
+    finally:
+        wb.close()
+    with zipfile.ZipFile(path) as archive:
+        names = [name for name in archive.namelist() if name.startswith('xl/media/')]
+        names.sort(key=lambda name: int(name[len('xl/media/image'):-len('.png')]))
+        images = [archive.read(name) for name in names]
+    return rows, images
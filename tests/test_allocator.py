@@ -0,0 +1,31 @@
+import random
+
+from chocobarcode_engine.allocator import create_allocator
+from chocobarcode_engine.registry import BarcodeRegistry
+
+
+def test_shared_registry_never_issues_same_random_barcode_twice():
+    # Dua job dengan RNG identik: tanpa klaim per barcode keduanya akan
+    # mengeluarkan barcode yang sama sebelum salah satunya close().
+    registry = BarcodeRegistry()
+    first = create_allocator(registry=registry, rng=random.Random(7), shared_registry=True)
+    second = create_allocator(registry=registry, rng=random.Random(7), shared_registry=True)
+
+    issued_first = [first.allocate(set()) for _ in range(50)]
+    issued_second = [second.allocate(set()) for _ in range(50)]
+
+    assert not set(issued_first) & set(issued_second)
+    assert len(registry) == 100
+    assert second.retries >= 50
+    first.close()
+    second.close()
+    assert len(registry) == 100
+
+
+def test_private_registry_registers_random_barcodes_on_close():
+    registry = BarcodeRegistry()
+    allocator = create_allocator(registry=registry, rng=random.Random(7))
+    issued = [allocator.allocate(set()) for _ in range(10)]
+    assert len(registry) == 0
+    allocator.close()
+    assert registry.existing(issued) == set(issued)
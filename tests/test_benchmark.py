@@ -0,0 +1,41 @@
+from collections import Counter
+
+from benchmarks.benchmark import compare_with_baseline, synthetic_barcodes
+from conftest import CATALOG_ROWS
+
+from chocobarcode_engine.validate import scan_ean13_chunks
+
+
+def test_synthetic_catalog_is_reproducible_and_mixed():
+    values = synthetic_barcodes(2000, seed=5)
+    assert values == synthetic_barcodes(2000, seed=5)
+    total, reserved, counts = scan_ean13_chunks([[value or '' for value in values]])
+    assert total == 2000
+    # Campuran CATALOG_MIX: ada barcode valid, tidak valid dan duplikat.
+    assert reserved and counts['invalid'] > 0 and counts['duplicate'] > 0
+    assert Counter(value is None for value in values)[True] > 0
+
+
+def test_compare_with_baseline_respects_threshold_and_memory_noise():
+    baseline = {
+        'render': {'seconds': 1.0, 'peak_bytes': 100 * 1024 * 1024},
+        'validate': {'seconds': 1.0, 'peak_bytes': 10 * 1024 * 1024},
+    }
+    results = {
+        'render': {'seconds': 1.2, 'peak_bytes': 200 * 1024 * 1024},
+        'validate': {'seconds': 1.3, 'peak_bytes': 10 * 1024 * 1024 + 1024},
+        'new': {'seconds': 9.0, 'peak_bytes': 1},
+    }
+    regressions = compare_with_baseline(results, baseline, 0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith('render: peak_bytes')
+    assert regressions[1].startswith('validate: seconds')
+
+
+def test_end_to_end_on_synthetic_catalog(catalog, tmp_path):
+    from chocobarcode_engine.pipeline import GenerateOptions, generate_barcode_workbook
+
+    summary = generate_barcode_workbook(catalog, str(tmp_path / 'hasil.xlsx'), GenerateOptions(seed=1))
+    assert summary['successful'] == CATALOG_ROWS
+    assert summary['failed'] == 0
+    assert summary['performance']['images_rendered'] == CATALOG_ROWS
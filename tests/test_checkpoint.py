@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from chocobarcode_engine.checkpoint import CheckpointError, journal_path
+from chocobarcode_engine.incremental import manifest_path
+from chocobarcode_engine.pipeline import GenerateOptions, generate_barcode_workbook
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def _interrupt_after(rows):
+    def progress(done, total):
+        if done >= rows:
+            raise _Interrupted()
+    return progress
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('options', [
+    {'seed': 3},
+    {'prefixes': ('8991234',), 'allocation': 'permuted'},
+    {'seed': 3, 'renderer': 'compact'},
+])
+def test_resume_matches_uninterrupted_run(catalog, tmp_path, options):
+    fresh_dir, resumed_dir = tmp_path / 'fresh', tmp_path / 'resumed'
+    fresh_dir.mkdir()
+    resumed_dir.mkdir()
+    fresh_file, resumed_file = str(fresh_dir / 'hasil.xlsx'), str(resumed_dir / 'hasil.xlsx')
+
+    fresh = generate_barcode_workbook(catalog, fresh_file, GenerateOptions(checkpoint_rows=50, **options))
+
+    with pytest.raises(_Interrupted):
+        generate_barcode_workbook(catalog, resumed_file, GenerateOptions(checkpoint_rows=50, **options),
+                                  progress_callback=_interrupt_after(175))
+    assert os.path.exists(journal_path(resumed_file))
+    assert not os.path.exists(resumed_file)
+
+    messages = []
+    resumed = generate_barcode_workbook(
+        catalog, resumed_file, GenerateOptions(checkpoint_rows=50, resume=True, **options),
+        log_callback=lambda message, level=None: messages.append(message),
+    )
+    assert any('dari checkpoint: 150 dari' in message for message in messages)
+    # Baris sebelum checkpoint tidak dirender ulang.
+    assert resumed['performance']['images_rendered'] < fresh['performance']['images_rendered']
+    for key in ('successful', 'generated_new', 'failed'):
+        assert resumed[key] == fresh[key]
+    assert _read(resumed_file) == _read(fresh_file)
+    # Header manifest berisi mtime output; baris-barisnya harus sama.
+    assert _read(manifest_path(resumed_file)).split(b'\n')[1:] == _read(manifest_path(fresh_file)).split(b'\n')[1:]
+    assert not os.path.exists(journal_path(resumed_file))
+    assert [name for name in os.listdir(resumed_dir) if '.part' in name] == []
+
+
+def test_resume_rejects_changed_options(catalog, tmp_path):
+    output_file = str(tmp_path / 'hasil.xlsx')
+    with pytest.raises(_Interrupted):
+        generate_barcode_workbook(catalog, output_file, GenerateOptions(seed=3, checkpoint_rows=50),
+                                  progress_callback=_interrupt_after(120))
+    with pytest.raises(CheckpointError):
+        generate_barcode_workbook(catalog, output_file, GenerateOptions(seed=4, checkpoint_rows=50, resume=True))
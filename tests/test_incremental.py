@@ -0,0 +1,78 @@
+from conftest import read_output
+from openpyxl import Workbook, load_workbook
+
+from chocobarcode_engine.pipeline import GenerateOptions, generate_barcode_workbook
+from chocobarcode_engine.render import render_ean13_png
+
+CHANGED_NAMES = range(10, 20)
+CHANGED_BARCODES = range(30, 35)
+APPENDED_ROWS = 20
+
+
+def _edited_catalog(catalog, path):
+    """Salinan katalog: 10 nama produk diubah, 5 barcode diganti, 20 baris ditambahkan."""
+    source = load_workbook(catalog, read_only=True)
+    rows = [list(row) for row in source.worksheets[0].iter_rows(values_only=True)]
+    source.close()
+    for index in CHANGED_NAMES:
+        rows[index + 1][0] += ' (baru)'
+    for index in CHANGED_BARCODES:
+        rows[index + 1][1] = f'77700000{index:04d}'
+    rows.extend([f'Produk Tambahan {index}', None] for index in range(APPENDED_ROWS))
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def test_unchanged_input_matches_fresh_run(catalog, tmp_path):
+    (tmp_path / 'fresh').mkdir()
+    (tmp_path / 'incremental').mkdir()
+    fresh_file = str(tmp_path / 'fresh' / 'hasil.xlsx')
+    incremental_file = str(tmp_path / 'incremental' / 'hasil.xlsx')
+    generate_barcode_workbook(catalog, fresh_file, GenerateOptions(seed=1))
+    generate_barcode_workbook(catalog, incremental_file, GenerateOptions(seed=1))
+
+    # Seed lain: barcode acak hanya sama jika benar-benar dipakai ulang.
+    summary = generate_barcode_workbook(catalog, incremental_file, GenerateOptions(seed=9, incremental=True))
+
+    assert summary['incremental']['source'] == 'manifest'
+    assert summary['incremental']['reused_barcodes'] == summary['total_rows']
+    assert summary['performance']['images_rendered'] == 0
+    assert summary['generated_new'] == 0
+    with open(incremental_file, 'rb') as incremental, open(fresh_file, 'rb') as fresh:
+        assert incremental.read() == fresh.read()
+
+
+def test_changed_rows_are_regenerated_and_the_rest_reused(catalog, tmp_path):
+    output_file = str(tmp_path / 'hasil.xlsx')
+    generate_barcode_workbook(catalog, output_file, GenerateOptions(seed=1))
+    previous_rows, _ = read_output(output_file)
+
+    edited = _edited_catalog(catalog, str(tmp_path / 'edited.xlsx'))
+    summary = generate_barcode_workbook(edited, output_file, GenerateOptions(seed=2, incremental=True))
+    fresh_file = str(tmp_path / 'fresh.xlsx')
+    generate_barcode_workbook(edited, fresh_file, GenerateOptions(seed=2))
+
+    rows, images = read_output(output_file)
+    fresh_rows, fresh_images = read_output(fresh_file)
+    changed = set(CHANGED_NAMES) | set(CHANGED_BARCODES)
+    unchanged = [index for index in range(len(previous_rows)) if index not in changed]
+
+    assert [name for name, _ in rows] == [name for name, _ in fresh_rows]
+    assert summary['failed'] == 0 and len(images) == len(rows)
+    # Baris yang tidak berubah memakai barcode lamanya, termasuk barcode acak.
+    assert all(rows[index] == previous_rows[index] for index in unchanged)
+    assert summary['incremental']['reused_barcodes'] >= len(unchanged)
+    assert summary['performance']['images_rendered'] <= len(rows) - len(unchanged)
+    assert len({barcode for _, barcode in rows}) == len(rows)
+    # Barcode input yang valid sama dengan run penuh, dan setiap gambar
+    # (disalin atau dirender baru) identik dengan hasil render barcode-nya.
+    for index in CHANGED_BARCODES:
+        assert rows[index][1] == fresh_rows[index][1]
+    for (_, barcode), image in zip(rows, images):
+        assert image == render_ean13_png(barcode)
+    for (_, barcode), image in zip(fresh_rows, fresh_images):
+        assert image == render_ean13_png(barcode)
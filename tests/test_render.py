@@ -0,0 +1,27 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from chocobarcode_engine.render import render_ean13_png
+from chocobarcode_engine.vector import EAN13Geometry, svg_document
+
+
+def _pixels(png_bytes):
+    return np.asarray(Image.open(io.BytesIO(png_bytes)).convert('L'))
+
+
+@pytest.mark.parametrize('barcode', ['8991234567891', '8991234567890'])
+def test_fast_renderer_matches_image_writer(barcode):
+    # Check digit salah: ImageWriter menggambar kode yang sudah dikoreksi, termasuk teksnya.
+    assert np.array_equal(_pixels(render_ean13_png(barcode, 'fast')), _pixels(render_ean13_png(barcode, 'pil')))
+
+
+def test_compact_renderer_draws_corrected_code():
+    assert render_ean13_png('8991234567890', 'compact') == render_ean13_png('8991234567891', 'compact')
+
+
+def test_svg_text_uses_corrected_code():
+    document = svg_document(EAN13Geometry(), '8991234567890')
+    assert '>8991234567891</text>' in document
@@ -0,0 +1,11 @@
+from chocobarcode_engine.runstats import RunStats
+
+
+def test_report_omits_worker_peak_while_workers_are_alive():
+    stats = RunStats()
+    with stats.stage('read'):
+        pass
+    assert 'peak_rss_workers_bytes' in stats.report(10)
+    report = stats.report(10, workers_exited=False)
+    assert 'peak_rss_workers_bytes' not in report
+    assert set(report['stages']) >= {'read', 'other'}
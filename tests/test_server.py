@@ -0,0 +1,146 @@
+import io
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+from conftest import read_output
+
+from chocobarcode_engine.pipeline import GenerateOptions, generate_barcode_workbook
+from chocobarcode_engine.render import render_ean13_png
+from chocobarcode_engine.server import BarcodeHTTPServer, JobServer
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+@pytest.fixture
+def start_server(tmp_path):
+    started = []
+
+    def start(**kwargs):
+        job_server = JobServer(GenerateOptions(), job_root=str(tmp_path / 'jobs'), **kwargs)
+        http_server = BarcodeHTTPServer(('127.0.0.1', 0), job_server)
+        threading.Thread(target=http_server.serve_forever, daemon=True).start()
+        started.append((http_server, job_server))
+        return 'http://127.0.0.1:%d' % http_server.server_address[1]
+
+    yield start
+    for http_server, job_server in started:
+        http_server.shutdown()
+        http_server.server_close()
+        job_server.close()
+
+
+@pytest.fixture
+def server_url(start_server):
+    return start_server()
+
+
+def _request(url, body=None, content_type='application/json', method=None):
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': content_type} if body else {},
+                                     method=method)
+    with urllib.request.urlopen(request) as response:
+        return response.status, response.read()
+
+
+def _submit(server_url, document):
+    status, body = _request(f'{server_url}/jobs', json.dumps(document).encode('utf-8'))
+    assert status == 202
+    return json.loads(body)['id']
+
+
+def _wait_for_job(server_url, job_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while True:
+        _, body = _request(f'{server_url}/jobs/{job_id}')
+        job = json.loads(body)
+        if job['status'] not in ('queued', 'running') or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+def _result_rows(server_url, job, tmp_path):
+    _, workbook = _request(server_url + job['result_url'])
+    path = tmp_path / f"{job['id']}.xlsx"
+    path.write_bytes(workbook)
+    return read_output(str(path))
+
+
+def test_json_job_with_delimiters_in_column_names(server_url):
+    # Nama kolom dengan banyak ';' dulu membuat pemisah CSV salah ditebak.
+    document = {
+        'format': 'svg',
+        'product_column': 'Nama;Produk;Toko',
+        'barcode_column': 'Kode|EAN|13',
+        'rows': [
+            {'product': 'Coklat A', 'barcode': '8991234567891'},
+            {'product': 'Coklat B', 'barcode': ''},
+            ['Coklat C', '899123456789'],
+        ],
+    }
+    job = _wait_for_job(server_url, _submit(server_url, document))
+
+    assert job['status'] == 'done', job['error']
+    assert job['summary']['successful'] == 3
+    assert job['summary']['failed'] == 0
+    status, archive = _request(server_url + job['result_url'])
+    assert status == 200
+    assert archive.startswith(b'PK')
+
+
+def test_uploaded_workbook_matches_direct_run(server_url, catalog, tmp_path):
+    with open(catalog, 'rb') as f:
+        status, body = _request(f'{server_url}/jobs?seed=4', f.read(), XLSX_CONTENT_TYPE)
+    assert status == 202
+    job = _wait_for_job(server_url, json.loads(body)['id'])
+    assert job['status'] == 'done', job['error']
+
+    direct_file = str(tmp_path / 'langsung.xlsx')
+    generate_barcode_workbook(catalog, direct_file, GenerateOptions(seed=4))
+    assert _result_rows(server_url, job, tmp_path) == read_output(direct_file)
+
+
+def test_concurrent_jobs_never_share_barcodes(start_server, tmp_path):
+    server_url = start_server(max_running_jobs=2)
+    rows = [[f'Produk {index}', ''] for index in range(80)]
+    # Seed sama: tanpa registry bersama kedua job akan mengeluarkan barcode yang sama.
+    job_ids = [_submit(server_url, {'seed': 1, 'rows': rows}) for _ in range(2)]
+    jobs = [_wait_for_job(server_url, job_id) for job_id in job_ids]
+    assert [job['status'] for job in jobs] == ['done', 'done']
+
+    issued = [{barcode for _, barcode in _result_rows(server_url, job, tmp_path)[0]} for job in jobs]
+    assert len(issued[0]) == len(issued[1]) == 80
+    assert not issued[0] & issued[1]
+
+
+def test_single_barcode_endpoint(server_url):
+    from PIL import Image
+
+    status, png = _request(f'{server_url}/barcode/899123456789.png')
+    assert status == 200
+    assert png == render_ean13_png('8991234567891')
+    assert Image.open(io.BytesIO(png)).format == 'PNG'
+    status, svg = _request(f'{server_url}/barcode/8991234567891.svg')
+    assert b'>8991234567891</text>' in svg
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _request(f'{server_url}/barcode/12345.png')
+    assert error.value.code == 400
+
+
+def test_job_lifecycle_errors(server_url):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _request(f'{server_url}/jobs/tidak-ada')
+    assert error.value.code == 404
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _request(f'{server_url}/jobs', b'bukan json')
+    assert error.value.code == 400
+
+    job = _wait_for_job(server_url, _submit(server_url, {'rows': [['Coklat', '']]}))
+    assert job['status'] == 'done'
+    status, body = _request(f"{server_url}/jobs/{job['id']}", method='DELETE')
+    assert status == 200 and json.loads(body) == {'deleted': job['id']}
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _request(f"{server_url}/jobs/{job['id']}/result")
+    assert error.value.code == 404
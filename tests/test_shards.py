@@ -0,0 +1,55 @@
+from chocobarcode_engine import shards
+from chocobarcode_engine.shards import ShardSet, read_shard_rows
+
+
+def test_group_shards_keep_rows_with_bounded_open_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(shards, '_MAX_OPEN_ROW_FILES', 3)
+    built = {}
+
+    def build_shard(path, rows_file):
+        rows = list(read_shard_rows(rows_file))
+        built[path] = [row[0] for row in rows]
+        return {'successful': len(rows), 'failed': 0, 'messages': []}
+
+    shard_set = ShardSet(str(tmp_path / 'hasil.xlsx'), build_shard, by_group=True)
+    try:
+        # Baris 10 grup berselang-seling: handle terus ditutup dan dibuka lagi.
+        for index in range(100):
+            shard_set.add(index, f'Produk {index}', '', '8991234567891', None, group=f'g{index % 10}')
+            assert len(shard_set._open_files) <= 3
+        finished = list(shard_set.finish())
+    finally:
+        shard_set.close()
+
+    assert len(finished) == 10
+    for shard in finished:
+        group = int(shard.group[1:])
+        assert built[shard.path] == list(range(group, 100, 10))
+        assert shard.result['successful'] == 10
+
+
+def _count_rows(path, rows_file):
+    rows = list(read_shard_rows(rows_file))
+    return {'successful': len(rows), 'failed': 0, 'messages': [], 'rows': [row[0] for row in rows]}
+
+
+def test_pool_submissions_are_bounded(tmp_path):
+    shard_set = ShardSet(str(tmp_path / 'hasil.xlsx'), _count_rows, workers=2, by_group=True)
+    submit = shard_set._executor.submit
+    in_flight = []
+
+    def bounded_submit(*args):
+        in_flight.append(len(shard_set._pending))
+        return submit(*args)
+
+    shard_set._executor.submit = bounded_submit
+    try:
+        for index in range(60):
+            shard_set.add(index, f'Produk {index}', '', '8991234567891', None, group=f'g{index % 20}')
+        finished = list(shard_set.finish())
+    finally:
+        shard_set.close()
+
+    assert len(in_flight) == 20
+    assert max(in_flight) < shard_set.max_in_flight
+    assert sorted(row for shard in finished for row in shard.result['rows']) == list(range(60))
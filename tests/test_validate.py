@@ -0,0 +1,44 @@
+import csv
+
+from chocobarcode_engine.pipeline import GenerateOptions, generate_barcode_workbook
+from chocobarcode_engine.validate import STATUS_INVALID, scan_ean13_chunks, validate_ean13_column
+
+
+def test_column_without_numeric_candidates_is_all_invalid():
+    for values in (['', '', '', '', ''], ['abc', None, '12345', 'x' * 13]):
+        validation = validate_ean13_column(values)
+        assert validation.barcodes == [''] * len(values)
+        assert list(validation.status) == [STATUS_INVALID] * len(values)
+        assert not validation.duplicate.any()
+
+
+def test_scan_with_all_invalid_chunk_between_valid_chunks():
+    total_rows, reserved, counts = scan_ean13_chunks([
+        ['8991234567891', '8991234567891'],
+        ['', 'abc', None],
+        ['899123456789'],
+    ])
+    assert total_rows == 6
+    assert reserved == {'8991234567891'}
+    assert counts['invalid'] == 3
+    assert counts['duplicate'] == 2
+    total_rows, reserved, counts = scan_ean13_chunks([['', 'abc', None]])
+    assert (total_rows, reserved, counts['invalid'], counts['duplicate']) == (3, set(), 3, 0)
+
+def test_generate_when_read_chunk_has_only_empty_barcodes(tmp_path):
+    input_file = tmp_path / 'produk.csv'
+    with open(input_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Nama Produk', 'Barcode (EAN-13)'])
+        writer.writerow(['Produk 1', '8991234567890'])
+        writer.writerow(['Produk 2', '8991234567890'])
+        for number in range(3, 6):
+            writer.writerow([f'Produk {number}', ''])
+    output_file = tmp_path / 'hasil.xlsx'
+
+    # read_chunk_size=2: chunk kedua berisi barcode kosong saja.
+    summary = generate_barcode_workbook(str(input_file), str(output_file),
+                                        GenerateOptions(seed=1, read_chunk_size=2))
+    assert summary['successful'] == 5
+    assert summary['generated_new'] == 4
+    assert summary['failed'] == 0
@@ -0,0 +1,98 @@
+import os
+import zipfile
+import zlib
+
+import pytest
+from openpyxl import load_workbook
+
+from chocobarcode_engine.config import FAILED_BARCODE_MARKER
+from chocobarcode_engine.incremental import _image_anchors
+from chocobarcode_engine.render import render_ean13_png
+from chocobarcode_engine.writer import create_writer
+from chocobarcode_engine.zipstream import ZipStreamWriter
+
+ROWS = [
+    ('Coklat A', '8991234567891'),
+    ('Coklat B', None),
+    ('Coklat C', '4006381333931'),
+    ('Coklat D', '5901234123457'),
+]
+
+
+def test_zip_stream_writer_round_trip(tmp_path):
+    path = str(tmp_path / 'arsip.zip')
+    text = 'baris\n' * 1000
+    noise = os.urandom(4096)
+    with ZipStreamWriter(path) as archive:
+        archive.write('teks.txt', text)
+        archive.write('acak.bin', noise)
+        archive.write_stream('stream.txt', (f'{index}\n'.encode() for index in range(5000)))
+        payload = zlib.compress(b'isi salinan', 6)[2:-4]
+        archive.write_compressed('salinan.txt', zipfile.ZIP_DEFLATED, zlib.crc32(b'isi salinan'), payload, 11)
+
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        assert archive.read('teks.txt') == text.encode()
+        assert archive.read('acak.bin') == noise
+        assert archive.read('stream.txt') == ''.join(f'{index}\n' for index in range(5000)).encode()
+        assert archive.read('salinan.txt') == b'isi salinan'
+        assert archive.getinfo('teks.txt').compress_type == zipfile.ZIP_DEFLATED
+        # Data yang tidak mengecil disimpan tanpa kompresi.
+        assert archive.getinfo('acak.bin').compress_type == zipfile.ZIP_STORED
+
+
+def test_zip_stream_writer_resumes_from_checkpoint(tmp_path):
+    path, directory = str(tmp_path / 'arsip.zip.part'), str(tmp_path / 'arsip.zip.dir')
+    archive = ZipStreamWriter(path, central_directory_path=directory)
+    archive.write('a.txt', 'sebelum checkpoint')
+    state = archive.checkpoint()
+    archive.write('b.txt', 'hilang saat proses mati')
+    archive.detach()
+
+    with ZipStreamWriter(path, central_directory_path=directory, state=state) as archive:
+        archive.write('c.txt', 'setelah resume')
+    with zipfile.ZipFile(path) as archive:
+        assert archive.namelist() == ['a.txt', 'c.txt']
+        assert archive.testzip() is None
+    assert not os.path.exists(directory)
+
+
+def _write_rows(output_file, kind):
+    writer = create_writer(output_file, kind)
+    for product_name, barcode in ROWS:
+        if barcode is None:
+            writer.write_failed_row(product_name, 'abc')
+        else:
+            writer.write_barcode_row(product_name, barcode, render_ean13_png(barcode))
+    writer.save()
+
+
+def _read_cells_and_images(path):
+    wb = load_workbook(path, read_only=True)
+    try:
+        cells = [tuple(row) for row in wb.worksheets[0].iter_rows(values_only=True)]
+    finally:
+        wb.close()
+    with zipfile.ZipFile(path) as archive:
+        images = {row: archive.read(name) for row, name in _image_anchors(archive).items()}
+    return cells, images
+
+
+@pytest.mark.parametrize('kind', ['streaming', 'openpyxl'])
+def test_xlsx_writers_place_images_on_their_rows(tmp_path, kind):
+    output_file = str(tmp_path / f'{kind}.xlsx')
+    _write_rows(output_file, kind)
+    cells, images = _read_cells_and_images(output_file)
+
+    assert [cells[row][:2] for row in (1, 3, 4)] == [ROWS[0], ROWS[2], ROWS[3]]
+    assert cells[2][:3] == ('Coklat B', 'abc', FAILED_BARCODE_MARKER)
+    assert sorted(images) == [2, 4, 5]
+    for row, (_, barcode) in zip((2, 4, 5), [ROWS[0], ROWS[2], ROWS[3]]):
+        assert images[row] == render_ean13_png(barcode)
+
+
+def test_streaming_and_openpyxl_writers_agree(tmp_path):
+    _write_rows(str(tmp_path / 'streaming.xlsx'), 'streaming')
+    _write_rows(str(tmp_path / 'openpyxl.xlsx'), 'openpyxl')
+    assert _read_cells_and_images(str(tmp_path / 'streaming.xlsx')) == \
+        _read_cells_and_images(str(tmp_path / 'openpyxl.xlsx'))